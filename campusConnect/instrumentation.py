@@ -0,0 +1,180 @@
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+from .metrics import REQUEST_DURATION, REQUEST_QUERIES, REQUESTS
+
+logger = logging.getLogger('campusconnect.requests')
+
+_current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Database and template timings collected while one request is handled"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = ''
+        self.statements = Counter()        # sql text -> executions
+        self.statement_ms = defaultdict(float)
+
+    def record_query(self, sql, elapsed_ms):
+        self.queries += 1
+        self.db_ms += elapsed_ms
+        self.statements[sql] += 1
+        self.statement_ms[sql] += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = sql
+
+    @property
+    def duplicate_queries(self):
+        """Executions beyond the first of each statement text (the N+1 signal)"""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def top_repeated(self, limit):
+        return [
+            (sql, count, self.statement_ms[sql])
+            for sql, count in self.statements.most_common(limit) if count > 1
+        ]
+
+
+def current_stats():
+    return _current_stats.get()
+
+
+@contextmanager
+def quiet_request_log():
+    """Drop per-request lines below ERROR, e.g. while a benchmark replays hundreds of requests"""
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+class QueryRecorder:
+    """connection.execute_wrapper hook timing every statement into ``stats``.
+
+    The SQL still has its placeholders, so one ORM query issued in a loop
+    shows up as a single statement executed many times.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.record_query(sql, (time.perf_counter() - started) * 1000)
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats = current_stats()
+            if stats is not None:
+                stats.template_ms += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The standard Django template backend, with render time added to RequestStats.
+
+    Only top-level renders are timed ({% include %} happens inside them),
+    and queries run lazily by templates count towards both template and
+    database time.
+    """
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+class RequestMetricsMiddleware:
+    """Log one structured line per request with query, DB and template totals.
+
+    Requests slower than REQUEST_METRICS_SLOW_MS are logged as warnings
+    (so sampling never drops them) together with their most repeated SQL.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'REQUEST_METRICS_SLOW_MS', 500)
+        self.top_sql = getattr(settings, 'REQUEST_METRICS_TOP_SQL', 3)
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryRecorder(stats)))
+                response = self.get_response(request)
+        finally:
+            _current_stats.reset(token)
+        duration_ms = (time.perf_counter() - started) * 1000
+        request.request_stats = stats
+        self.log(request, response, stats, duration_ms)
+        self.observe(request, response, stats, duration_ms)
+        return response
+
+    def observe(self, request, response, stats, duration_ms):
+        match = getattr(request, 'resolver_match', None)
+        # URL names, not paths, keep the label set bounded
+        view = match.view_name if match else 'unmatched'
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        REQUEST_DURATION.observe(duration_ms / 1000, view=view)
+        REQUEST_QUERIES.observe(stats.queries, view=view)
+
+    def log(self, request, response, stats, duration_ms):
+        match = getattr(request, 'resolver_match', None)
+        slow = duration_ms >= self.slow_ms
+        fields = {
+            'view': match.view_name if match else '-',
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 1),
+            'db_queries': stats.queries,
+            'db_ms': round(stats.db_ms, 1),
+            'template_ms': round(stats.template_ms, 1),
+            'slowest_query_ms': round(stats.slowest_ms, 1),
+            'duplicate_queries': stats.duplicate_queries,
+        }
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            'request method=%s path=%s %s',
+            request.method, request.path,
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra=fields,
+        )
+        if not slow:
+            return
+        if stats.slowest_sql:
+            logger.warning('slow_request_slowest path=%s ms=%.1f sql=%s',
+                           request.path, stats.slowest_ms, stats.slowest_sql)
+        for rank, (sql, count, total_ms) in enumerate(stats.top_repeated(self.top_sql), 1):
+            logger.warning('slow_request_repeated path=%s rank=%d count=%d total_ms=%.1f sql=%s',
+                           request.path, rank, count, total_ms, sql)
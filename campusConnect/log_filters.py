@@ -0,0 +1,16 @@
+import logging
+import random
+
+
+class SamplingFilter(logging.Filter):
+    """Let through only a fraction of records below WARNING.
+
+    Warnings and errors always pass, so sampling never hides failures.
+    """
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
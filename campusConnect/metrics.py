@@ -0,0 +1,256 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+# Seconds between snapshots a process writes to METRICS_MULTIPROCESS_DIR
+FLUSH_INTERVAL = 1.0
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}  # label values tuple -> kind-specific value
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {sorted(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        self.registry.maybe_flush()
+
+    def get(self, **labels):
+        return self.values.get(self._key(labels), 0)
+
+    @staticmethod
+    def merge(into, value):
+        return (into or 0) + value
+
+    def expose(self, values):
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {_format_number(value)}'
+
+
+class Histogram(Metric):
+    """Per-label bucket counts (not cumulative) followed by sum and count"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(registry, name, documentation, labelnames)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = position
+                break
+        with self.registry.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+        self.registry.maybe_flush()
+
+    def get_count(self, **labels):
+        state = self.values.get(self._key(labels))
+        return state[-1] if state else 0
+
+    @staticmethod
+    def merge(into, value):
+        if into is None:
+            return list(value)
+        return [a + b for a, b in zip(into, value)]
+
+    def expose(self, values):
+        bounds = self.buckets + (float('inf'),)
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                le = (('le', _format_number(float(bound))),)
+                yield f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_number(state[-2])}'
+            yield f'{self.name}_count{labels} {state[-1]}'
+
+
+class Registry:
+    """Thread-safe in-process metrics with optional aggregation across workers.
+
+    With METRICS_MULTIPROCESS_DIR set, every process writes a JSON snapshot
+    of its own values there (at most once per FLUSH_INTERVAL and at exit),
+    and exposition sums the snapshots of all processes, so a scrape through
+    any worker sees the whole deployment. Snapshots are per process start,
+    never overwritten by a restarted worker; clear the directory on deploy.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self._snapshot_name = f'{os.getpid()}-{uuid.uuid4().hex[:8]}.json'
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+
+    def register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return Counter(self, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        return Histogram(self, name, documentation, labelnames, buckets)
+
+    def directory(self):
+        path = getattr(settings, 'METRICS_MULTIPROCESS_DIR', None)
+        return Path(path) if path else None
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                name: [
+                    [list(key), list(value) if isinstance(value, list) else value]
+                    for key, value in metric.values.items()
+                ]
+                for name, metric in self.metrics.items()
+            }
+
+    def flush(self):
+        directory = self.directory()
+        if directory is None:
+            return
+        if os.getpid() != self._pid:
+            # Forked worker: start its own snapshot instead of the parent's
+            self._pid = os.getpid()
+            self._snapshot_name = f'{self._pid}-{uuid.uuid4().hex[:8]}.json'
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / self._snapshot_name
+        temporary = target.with_suffix(f'.{threading.get_ident()}.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, target)
+        self._last_flush = time.monotonic()
+
+    def maybe_flush(self):
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL and self.directory() is not None:
+            self.flush()
+
+    def collect(self):
+        """{metric name: {label values: merged value}} across all processes"""
+        directory = self.directory()
+        if directory is None:
+            return {
+                name: {tuple(key): value for key, value in entries}
+                for name, entries in self.snapshot().items()
+            }
+
+        self.flush()
+        merged = {name: {} for name in self.metrics}
+        for path in directory.glob('*.json'):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # being replaced right now; the next scrape will see it
+            for name, entries in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in entries:
+                    key = tuple(key)
+                    merged[name][key] = metric.merge(merged[name].get(key), value)
+        return merged
+
+    def exposition(self):
+        """Prometheus text format (version 0.0.4)"""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.expose(values))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Zero every metric in this process (tests)"""
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.values.clear()
+
+
+registry = Registry()
+atexit.register(registry.flush)
+
+REQUESTS = registry.counter(
+    'campusconnect_http_requests_total', 'HTTP requests by URL name, method and status.',
+    ['view', 'method', 'status'],
+)
+REQUEST_DURATION = registry.histogram(
+    'campusconnect_http_request_duration_seconds', 'Request latency by URL name.', ['view'],
+)
+REQUEST_QUERIES = registry.histogram(
+    'campusconnect_db_queries_per_request', 'Database queries per request by URL name.',
+    ['view'], buckets=QUERY_BUCKETS,
+)
+CACHE_REQUESTS = registry.counter(
+    'campusconnect_cache_requests_total', 'Cache lookups by namespace and result (hit/miss).',
+    ['namespace', 'result'],
+)
+OUTBOX_EMAILS = registry.counter(
+    'campusconnect_outbox_emails_total', 'Outbox emails by event (queued/sent/retry/failed).',
+    ['event'],
+)
+BOOKINGS = registry.counter(
+    'campusconnect_bookings_total', 'Classroom booking requests by result (created/conflict/approved/rejected).',
+    ['result'],
+)
+LOGINS = registry.counter(
+    'campusconnect_logins_total', 'Login attempts by result (success/failure).', ['result'],
+)
+RATE_LIMITS = registry.counter(
+    'campusconnect_rate_limit_total', 'Rate-limited requests by limit name and result (allowed/denied).',
+    ['limit', 'result'],
+)
@@ -0,0 +1,156 @@
+import cProfile
+import itertools
+import logging
+import marshal
+import os
+import pstats
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+
+from users.models import RequestProfile
+
+logger = logging.getLogger('campusconnect.profiling')
+
+# ?_profile=1 or "X-Profile: 1" on a superuser's request profiles that request
+PROFILE_QUERY_PARAM = '_profile'
+PROFILE_HEADER = 'X-Profile'
+
+
+class _LoadedStats:
+    """Stand-in for a cProfile.Profile so pstats.Stats can read stored bytes"""
+
+    def __init__(self, data):
+        self.stats = marshal.loads(bytes(data))
+
+    def create_stats(self):
+        pass
+
+
+def load_stats(data):
+    return pstats.Stats(_LoadedStats(data))
+
+
+def _short_path(filename, prefixes):
+    for prefix in prefixes:
+        if filename.startswith(prefix + os.sep):
+            return filename[len(prefix) + 1:]
+    return filename
+
+
+def top_functions(data, limit=None, sort='cumulative'):
+    """The ``limit`` most expensive functions of stored stats as dicts, for display"""
+    stats = load_stats(data)
+    stats.sort_stats(sort)
+    # Longest first, so site-packages wins over the lib directory containing it
+    prefixes = sorted({str(settings.BASE_DIR), *filter(None, sys.path)}, key=len, reverse=True)
+    rows = []
+    for function in stats.fcn_list[:limit or getattr(settings, 'PROFILING_TOP_N', 40)]:
+        primitive_calls, calls, own_time, cumulative_time, _callers = stats.stats[function]
+        filename, line, name = function
+        rows.append({
+            'calls': calls if calls == primitive_calls else f'{calls}/{primitive_calls}',
+            'tottime_ms': round(own_time * 1000, 2),
+            'cumtime_ms': round(cumulative_time * 1000, 2),
+            'function': name if filename == '~' else f'{_short_path(filename, prefixes)}:{line}({name})',
+        })
+    return rows
+
+
+class ProfilingMiddleware:
+    """Run selected requests under cProfile and store a users.RequestProfile.
+
+    A request is profiled when a superuser adds ?_profile=1 (or the
+    X-Profile header), or as 1 in N requests to a URL name listed in
+    PROFILING_SAMPLE_RATES. Everything else costs two dict lookups.
+
+    The profile covers get_response, i.e. the middleware below this one
+    and the view, which Django still dispatches itself. Place it after
+    AuthenticationMiddleware so the superuser check can read request.user.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rates = dict(getattr(settings, 'PROFILING_SAMPLE_RATES', {}))
+        self.counters = {name: itertools.count() for name in self.sample_rates}
+
+    def __call__(self, request):
+        trigger = self.trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+
+        sql_log = []
+
+        def record_sql(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sql_log.append({
+                    'sql': sql,
+                    'ms': round((time.perf_counter() - started) * 1000, 3),
+                })
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (a debugger, coverage run) owns this thread
+            return self.get_response(request)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record_sql))
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        profile = self.save(request, response, trigger, profiler, sql_log, duration_ms)
+        response['X-Profile-Id'] = str(profile.pk)
+        return response
+
+    def trigger(self, request):
+        if self.sample_rates:
+            # The URL is not resolved yet at this point of the middleware chain
+            try:
+                view_name = resolve(request.path_info, getattr(request, 'urlconf', None)).view_name
+            except Resolver404:
+                view_name = None
+            rate = self.sample_rates.get(view_name)
+            if rate and next(self.counters[view_name]) % rate == 0:
+                return 'sample'
+        if PROFILE_QUERY_PARAM in request.GET or PROFILE_HEADER in request.headers:
+            # Only now touch request.user, which may cost a session query
+            if request.user.is_superuser:
+                return 'flag'
+        return None
+
+    def save(self, request, response, trigger, profiler, sql_log, duration_ms):
+        profiler.create_stats()
+        user = getattr(request, 'user', None)
+        profile = RequestProfile.objects.create(
+            user=user if user is not None and user.is_authenticated else None,
+            trigger=trigger,
+            method=request.method,
+            path=request.get_full_path()[:500],
+            view_name=request.resolver_match.view_name if request.resolver_match else '',
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            query_count=len(sql_log),
+            db_ms=sum(entry['ms'] for entry in sql_log),
+            stats=marshal.dumps(profiler.stats),
+            sql_log=sql_log,
+        )
+        keep = getattr(settings, 'PROFILING_KEEP', 200)
+        RequestProfile.objects.filter(pk__lte=profile.pk - keep).delete()
+        logger.info(
+            'request_profiled id=%s trigger=%s view=%s duration_ms=%.1f queries=%d',
+            profile.pk, trigger, profile.view_name, duration_ms, len(sql_log),
+        )
+        return profile
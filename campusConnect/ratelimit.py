@@ -0,0 +1,124 @@
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .metrics import RATE_LIMITS
+
+# Sliding-window counters approximated from two fixed windows: the count
+# from the previous window is weighted by how much of it still overlaps
+# the sliding window. Two cache keys per (limit, client), no DB writes.
+KEY_PREFIX = 'ratelimit'
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'5/m' -> (5, 60), '10/15m' -> (10, 900)"""
+    count, period = rate.split('/')
+    multiplier = int(period[:-1] or 1)
+    return int(count), multiplier * _PERIODS[period[-1]]
+
+
+def client_ip(request):
+    """The client address as seen by the outermost trusted proxy.
+
+    X-Forwarded-For style headers are appended to by every proxy, so only
+    the last RATELIMIT_TRUSTED_PROXIES entries are trustworthy; anything to
+    their left was sent by the client and may be forged. A header with
+    fewer entries did not pass through the proxies, so REMOTE_ADDR is used.
+    """
+    remote_addr = request.META.get('REMOTE_ADDR', '')
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', 'REMOTE_ADDR')
+    if header == 'REMOTE_ADDR':
+        return remote_addr
+    entries = [entry.strip() for entry in request.META.get(header, '').split(',') if entry.strip()]
+    proxies = getattr(settings, 'RATELIMIT_TRUSTED_PROXIES', 1)
+    if proxies < 1 or len(entries) < proxies:
+        return remote_addr
+    return entries[-proxies]
+
+
+def _key_value(request, key):
+    """Resolve 'ip', 'post:<field>' or 'session:<name>' (or a callable) for ``request``.
+
+    Parts joined with '+' (e.g. 'ip+post:email') count their combination;
+    the value is empty if any part is.
+    """
+    if callable(key):
+        return key(request)
+    if '+' in key:
+        parts = [_key_value(request, part) for part in key.split('+')]
+        return '|'.join(parts) if all(parts) else ''
+    if key == 'ip':
+        return client_ip(request)
+    source, _, name = key.partition(':')
+    if source == 'post':
+        return request.POST.get(name, '').strip().lower()
+    if source == 'session':
+        return str(request.session.get(name, '')).strip().lower()
+    raise ValueError(f"Unknown rate limit key {key!r}")
+
+
+def hit(name, value, limit, window, now=None):
+    """Count one request for ``value`` against ``limit`` per ``window`` seconds.
+
+    Returns (allowed, retry_after_seconds). Denied requests are not
+    counted, so a client that backs off regains access at the normal rate.
+    """
+    now = now if now is not None else time.time()
+    current = int(now // window)
+    elapsed = now - current * window
+    current_key = f'{KEY_PREFIX}:{name}:{value}:{current}'
+    previous_key = f'{KEY_PREFIX}:{name}:{value}:{current - 1}'
+
+    counts = cache.get_many([current_key, previous_key])
+    in_current = counts.get(current_key, 0)
+    weighted = counts.get(previous_key, 0) * (window - elapsed) / window + in_current
+    if weighted >= limit:
+        RATE_LIMITS.inc(limit=name, result='denied')
+        return False, max(1, math.ceil(window - elapsed))
+
+    if not cache.add(current_key, 1, window * 2):
+        try:
+            cache.incr(current_key)
+        except ValueError:  # expired between add and incr
+            cache.set(current_key, 1, window * 2)
+    RATE_LIMITS.inc(limit=name, result='allowed')
+    return True, 0
+
+
+def is_post(request):
+    return request.method == 'POST'
+
+
+def rate_limit(name, rate, key='ip', when=is_post):
+    """Throttle a view per client: ``rate`` like '5/m', ``key`` see _key_value.
+
+    Requests for which ``when(request)`` is false, or whose key resolves
+    to an empty value, are not counted. Stack the decorator to combine
+    limits (e.g. per IP and per email).
+    """
+    limit, window = parse_rate(rate)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if getattr(settings, 'RATELIMIT_ENABLED', True) and when(request):
+                value = _key_value(request, key)
+                if value:
+                    allowed, retry_after = hit(name, value, limit, window)
+                    if not allowed:
+                        response = HttpResponse(
+                            f"Too many requests. Please try again in {retry_after} seconds.",
+                            status=429,
+                            content_type='text/plain',
+                        )
+                        response['Retry-After'] = str(retry_after)
+                        return response
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
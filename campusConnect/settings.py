@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'campusConnect.instrumentation.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -28,13 +30,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Profiles everything below it; needs request.user from AuthenticationMiddleware
+    'campusConnect.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'campusConnect.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates plus render timing for RequestMetricsMiddleware
+        'BACKEND': 'campusConnect.instrumentation.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -48,15 +53,53 @@ TEMPLATES = [
     },
 ]
 
+# Applied to every new SQLite connection. WAL lets readers run while a write
+# is in progress, busy_timeout makes writers queue instead of failing with
+# "database is locked". Transactions stay deferred so reads never wait for
+# writers; the booking write paths open theirs with BEGIN IMMEDIATE
+# (timetable.booking.write_transaction).
+# SQLITE_JOURNAL_MODE=DELETE restores the old behaviour (for benchmarking).
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': 'NORMAL',  # durable in WAL mode except for the last commits on power loss
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(128 * 1024 * 1024))),
+    'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KB', '20000')),  # negative = KiB
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+        },
+        # Keep connections between requests; health checks replace broken ones
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        # File-backed so concurrency tests see real SQLite locking
+        # (the shared-cache in-memory default fails fast with "table is locked").
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+# Timetable pages are cached per batch/professor and invalidated through
+# version counters in this cache, so production workers must share it.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'campusconnect'),
     }
 }
+TIMETABLE_CACHE_TIMEOUT = 60 * 60 * 24
 
 AUTH_USER_MODEL = 'users.User'
+
 AUTHENTICATION_BACKENDS = [
+    'users.backends.EmailBackend',
     'django.contrib.auth.backends.ModelBackend',
 ]
 
@@ -79,6 +122,69 @@ LOGOUT_REDIRECT_URL = 'login'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Application logs are key=value lines; debug/info records are sampled so
+# per-request diagnostics stay cheap under load.
+TESTING = sys.argv[1:2] == ['test']
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sampled': {
+            '()': 'campusConnect.log_filters.SamplingFilter',
+            'rate': float(os.getenv('LOG_SAMPLE_RATE', '0.1')),
+        },
+    },
+    'formatters': {
+        'structured': {
+            'format': 'ts=%(asctime)s level=%(levelname)s logger=%(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'structured',
+            'filters': ['sampled'],
+        },
+    },
+    'loggers': {
+        'campusconnect': {
+            'handlers': ['console'],
+            'level': os.getenv('LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+        # One line per request; kept off the console while the test suite runs
+        # (assertLogs still sees them, it sets its own level on the logger)
+        'campusconnect.requests': {
+            'level': os.getenv('REQUEST_LOG_LEVEL', 'ERROR' if TESTING else 'INFO'),
+        },
+    },
+}
+
+# Per-request query/template metrics (campusConnect.instrumentation); slower
+# requests are logged as warnings with their most repeated SQL statements
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', '500'))
+REQUEST_METRICS_TOP_SQL = 3
+
+# Prometheus /metrics (campusConnect.metrics). Scraped with a staff session or
+# "Authorization: Bearer $METRICS_TOKEN". With several worker processes, point
+# METRICS_MULTIPROCESS_DIR at a shared local directory (emptied on deploy) so
+# any worker can serve the totals of all of them.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_MULTIPROCESS_DIR = os.getenv('METRICS_MULTIPROCESS_DIR') or None
+
+# On-demand profiling (campusConnect.profiling): superusers add ?_profile=1 or an
+# X-Profile header; PROFILING_SAMPLE="free_slots:100,my_bookings:50" profiles
+# 1 in N requests of those URL names. Results are in the admin (Request profiles).
+PROFILING_SAMPLE_RATES = {
+    name: int(rate)
+    for name, rate in (
+        item.split(':') for item in os.getenv('PROFILING_SAMPLE', '').split(',') if item
+    )
+}
+PROFILING_KEEP = 200  # newest profiles kept
+PROFILING_TOP_N = 40
+
 # Email Configuration (for OTP sending)
 # EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'  # For development
 # For production, use:
@@ -87,12 +193,33 @@ from dotenv import load_dotenv
 
 load_dotenv()  # load .env variables
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+# Point these at a local stand-in (e.g. aiosmtpd on localhost:8025 with
+# EMAIL_USE_TLS=0) to exercise the outbox without a real mail account
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', '587'))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', '1') == '1'
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '10'))
 
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 
+# Outbox (users.outbox): background workers per process, emails per SMTP
+# connection, and attempts before a message is marked failed
+EMAIL_OUTBOX_WORKERS = int(os.getenv('EMAIL_OUTBOX_WORKERS', '2'))
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+# 'database' stores one OTPVerification row per email; 'hmac' derives codes
+# from SECRET_KEY and keeps only consumed codes in the cache (users.otp).
+# With several processes, 'hmac' needs a shared CACHE_BACKEND to stop replays.
+OTP_MODE = os.getenv('OTP_MODE', 'database')
+
+# Per-IP/per-email throttling of login and OTP endpoints (campusConnect.ratelimit).
+# Behind a reverse proxy set RATELIMIT_IP_HEADER=HTTP_X_FORWARDED_FOR and
+# RATELIMIT_TRUSTED_PROXIES to the number of proxies that append to it; the
+# client address is the entry the outermost of them added.
+RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', '1') == '1'
+RATELIMIT_IP_HEADER = os.getenv('RATELIMIT_IP_HEADER', 'REMOTE_ADDR')
+RATELIMIT_TRUSTED_PROXIES = int(os.getenv('RATELIMIT_TRUSTED_PROXIES', '1'))
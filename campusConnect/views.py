@@ -0,0 +1,25 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _may_scrape(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    supplied = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(supplied, f'Bearer {token}')
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint for staff sessions or the METRICS_TOKEN bearer token"""
+    if not _may_scrape(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.exposition(), content_type=PROMETHEUS_CONTENT_TYPE)
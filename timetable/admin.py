@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Course, Classroom, TimeSlot, Batch, ClassSchedule
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from .approval import ApprovalQueue, approve_bookings, date_range_from
+from .models import Course, Classroom, TimeSlot, Batch, ClassSchedule, ClassroomBooking
+from .reference import get_reference_data
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
@@ -16,6 +23,7 @@ class ClassroomAdmin(admin.ModelAdmin):
 class TimeSlotAdmin(admin.ModelAdmin):
     list_display = ('day', 'start_time', 'end_time')
     list_filter = ('day',)
+    search_fields = ('day',)
     ordering = ('day', 'start_time')
 
 @admin.register(Batch)
@@ -28,4 +36,87 @@ class BatchAdmin(admin.ModelAdmin):
 class ClassScheduleAdmin(admin.ModelAdmin):
     list_display = ('course', 'professor', 'batch', 'classroom', 'time_slot')
     list_filter = ('batch__batch_year', 'batch__branch', 'batch__section', 'time_slot__day')
-    search_fields = ('course__code', 'course__name', 'professor__first_name')
\ No newline at end of file
+    search_fields = ('course__code', 'course__name', 'professor__first_name')
+    # One joined query for the whole page instead of five lookups per row
+    list_select_related = ('course', 'professor', 'batch', 'classroom', 'time_slot')
+    autocomplete_fields = ('course', 'professor', 'batch', 'classroom', 'time_slot')
+    show_full_result_count = False
+
+
+@admin.register(ClassroomBooking)
+class ClassroomBookingAdmin(admin.ModelAdmin):
+    list_display = ('course_code', 'course_name', 'classroom', 'date', 'start_time', 'end_time', 'professor', 'status')
+    list_filter = ('status', 'date')
+    search_fields = ('course_code', 'course_name', 'classroom__room_number', 'professor__first_name')
+    list_select_related = ('classroom', 'professor')
+    autocomplete_fields = ('professor', 'classroom', 'batch')
+    # Approval goes through the actions and the approval queue, which
+    # check for overlaps; the form cannot set the status directly
+    readonly_fields = ('status', 'created_at', 'updated_at')
+    show_full_result_count = False
+    actions = ['approve_selected', 'reject_selected']
+
+    def report_decision(self, request, decision):
+        self.message_user(
+            request,
+            f"Approved {len(decision.approved)} bookings, rejected {len(decision.rejected)} "
+            f"conflicting requests, left {len(decision.skipped)} pending.",
+        )
+
+    def approve_selected(self, request, queryset):
+        # Pending requests can overlap each other, so go through the approval
+        # queue: first come wins, overlapping requests are rejected and
+        # requests blocked by a class or approved booking stay pending.
+        booking_ids = queryset.filter(status='pending').order_by('created_at', 'pk').values_list('pk', flat=True)
+        self.report_decision(request, approve_bookings(list(booking_ids)))
+    approve_selected.short_description = "Approve selected pending bookings"
+
+    def reject_selected(self, request, queryset):
+        updated = queryset.filter(status__in=('pending', 'approved')).update(
+            status='rejected', updated_at=timezone.now()
+        )
+        self.message_user(request, f"Rejected {updated} bookings.")
+    reject_selected.short_description = "Reject selected bookings"
+
+    def get_urls(self):
+        return [
+            path(
+                'approval-queue/',
+                self.admin_site.admin_view(self.approval_queue_view),
+                name='timetable_classroombooking_approval_queue',
+            ),
+        ] + super().get_urls()
+
+    def approval_queue_view(self, request):
+        """Pending bookings grouped into conflicts, with a first-come proposal preselected"""
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        try:
+            start, end = date_range_from(request.GET)
+        except ValueError:
+            self.message_user(request, "Dates must look like 2025-01-31.", level='error')
+            start, end = date_range_from({})
+
+        if request.method == 'POST':
+            booking_ids = [int(pk) for pk in request.POST.getlist('approve') if pk.isdigit()]
+            self.report_decision(request, approve_bookings(booking_ids))
+            return HttpResponseRedirect(request.get_full_path())
+
+        queue = ApprovalQueue.load(start, end, pending=ClassroomBooking.objects.select_related('professor'))
+        get_reference_data().attach(queue.pending, 'classroom')
+        proposal = set(queue.proposal())
+        groups = [
+            (group, [(booking, booking.pk in proposal, queue.is_blocked(booking)) for booking in group.bookings])
+            for group in queue.groups()
+        ]
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': "Booking approval queue",
+            'start': start,
+            'end': end,
+            'groups': groups,
+            'pending_count': len(queue.pending),
+            'contested_count': sum(group.contested for group, _ in groups),
+        }
+        return TemplateResponse(request, 'admin/timetable/classroombooking/approval_queue.html', context)
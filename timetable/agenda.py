@@ -0,0 +1,68 @@
+import logging
+from datetime import time, timedelta
+
+from django.utils import timezone
+
+from .cache import get_batch_schedules
+from .reference import get_reference_data
+
+logger = logging.getLogger('campusconnect.dashboard')
+
+# Before this hour the dashboard previews the day as if it were 9 AM
+EARLY_MORNING = time(7, 0)
+PREVIEW_TIME = time(9, 0)
+
+
+def get_student_agenda(student_profile, now=None, upcoming_limit=5, tomorrow_limit=3):
+    """Return the ongoing class, today's next classes and tomorrow's preview.
+
+    The student's batches come from the reference snapshot and their weekly
+    schedule from the per-batch cache (one query on a miss); everything
+    else is split in Python.
+    """
+    now = timezone.localtime(now or timezone.now())
+    current_day = now.strftime('%A').lower()
+    tomorrow_day = (now + timedelta(days=1)).strftime('%A').lower()
+    current_time = now.time()
+    if current_time < EARLY_MORNING:
+        current_time = PREVIEW_TIME
+
+    batch_ids = get_reference_data().batch_ids(student_profile.batch, student_profile.branch)
+    schedules = get_batch_schedules(batch_ids)
+
+    ongoing_class = None
+    today_classes = []
+    upcoming_classes = []
+    tomorrow_classes = []
+    for schedule in schedules:
+        slot = schedule.time_slot
+        if slot.day == current_day:
+            today_classes.append(schedule)
+            if slot.start_time <= current_time <= slot.end_time:
+                if ongoing_class is None:
+                    ongoing_class = schedule
+            elif slot.start_time > current_time:
+                upcoming_classes.append(schedule)
+        elif slot.day == tomorrow_day:
+            tomorrow_classes.append(schedule)
+
+    # Fall back to the whole day when nothing is left to come
+    next_classes = (upcoming_classes or today_classes)[:upcoming_limit]
+
+    logger.debug(
+        'dashboard_agenda user=%s batch=%s branch=%s day=%s time=%s batches=%d classes=%d',
+        student_profile.user_id, student_profile.batch, student_profile.branch,
+        current_day, current_time.strftime('%H:%M'), len(batch_ids), len(next_classes),
+        extra={
+            'user_id': student_profile.user_id,
+            'day': current_day,
+            'batch_count': len(batch_ids),
+            'class_count': len(next_classes),
+        },
+    )
+
+    return {
+        'ongoing_class': ongoing_class,
+        'next_classes': next_classes,
+        'tomorrow_classes': tomorrow_classes[:tomorrow_limit],
+    }
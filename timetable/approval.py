@@ -0,0 +1,226 @@
+from bisect import bisect_right, insort
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from campusConnect.metrics import BOOKINGS
+
+from .booking import lock_classrooms, write_transaction
+from .models import MINUTES_PER_DAY, ClassroomBooking, ClassSchedule
+
+UPDATE_BATCH_SIZE = 500  # ids per UPDATE ... WHERE id IN (...), below SQLite's variable limit
+DEFAULT_RANGE_DAYS = 7
+
+
+def date_range_from(params):
+    """(start, end) from ISO ``start``/``end`` query parameters, defaulting to the coming week.
+
+    Raises ValueError for malformed dates.
+    """
+    start = date.fromisoformat(params['start']) if params.get('start') else timezone.localdate()
+    end = date.fromisoformat(params['end']) if params.get('end') else start + timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    return start, end
+
+
+def _minute_of_day(value):
+    return value.hour * 60 + value.minute
+
+
+def _merge(intervals):
+    """Sorted, non-overlapping union of (start, end) minute intervals"""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _overlaps(intervals, start, end):
+    """Does [start, end) overlap any of the sorted, non-overlapping ``intervals``?"""
+    index = bisect_right(intervals, (start, MINUTES_PER_DAY + 1))
+    if index and intervals[index - 1][1] > start:
+        return True
+    return index < len(intervals) and intervals[index][0] < end
+
+
+class ConflictGroup:
+    """Pending bookings of one room and date whose intervals chain into each other"""
+
+    def __init__(self, classroom_id, on_date, bookings):
+        self.classroom_id = classroom_id
+        self.date = on_date
+        self.bookings = bookings  # by start time
+
+    @property
+    def contested(self):
+        return len(self.bookings) > 1
+
+
+class ApprovalDecision:
+    """What approve_bookings() did: ids approved, auto-rejected and left pending"""
+
+    def __init__(self, approved=(), rejected=(), skipped=()):
+        self.approved = list(approved)
+        self.rejected = list(rejected)
+        self.skipped = list(skipped)
+
+    def as_dict(self):
+        return {'approved': self.approved, 'rejected': self.rejected, 'skipped': self.skipped}
+
+
+class ApprovalQueue:
+    """Pending bookings of a date range, grouped by room and date for approval.
+
+    Loaded in three queries whatever the number of bookings: the pending
+    rows, the approved bookings and the regular classes of their rooms.
+    Everything after that is a sort and a sweep per (room, date), so
+    thousands of requests resolve in milliseconds.
+    """
+
+    def __init__(self, pending, approved, schedules):
+        self.pending = sorted(pending, key=lambda b: (b.classroom_id, b.date, b.start_time, b.end_time))
+        # (classroom_id, date) -> merged minute intervals that no booking may overlap
+        blocked = defaultdict(list)
+        for classroom_id, on_date, start_time, end_time in approved:
+            blocked[classroom_id, on_date].append((_minute_of_day(start_time), _minute_of_day(end_time)))
+        classes = defaultdict(list)
+        for classroom_id, start, end in schedules:
+            weekday, start = divmod(start, MINUTES_PER_DAY)
+            classes[classroom_id, weekday].append((start, end - weekday * MINUTES_PER_DAY))
+        for booking in self.pending:
+            blocked.setdefault((booking.classroom_id, booking.date), [])
+        self.blocked = {
+            key: _merge(intervals + classes.get((key[0], key[1].weekday()), []))
+            for key, intervals in blocked.items()
+        }
+
+    @classmethod
+    def load(cls, start_date=None, end_date=None, pending=None):
+        """Queue for the pending bookings dated within [start_date, end_date].
+
+        ``pending`` overrides the queryset of pending bookings, e.g. to add
+        select_related for display.
+        """
+        if pending is None:
+            pending = ClassroomBooking.objects.all()
+        pending = pending.filter(status='pending')
+        if start_date is not None:
+            pending = pending.filter(date__gte=start_date)
+        if end_date is not None:
+            pending = pending.filter(date__lte=end_date)
+        pending = list(pending)
+        if not pending:
+            return cls([], [], [])
+
+        rooms = {booking.classroom_id for booking in pending}
+        dates = {booking.date for booking in pending}
+        approved = ClassroomBooking.objects.filter(
+            status='approved', classroom_id__in=rooms, date__gte=min(dates), date__lte=max(dates),
+        ).values_list('classroom_id', 'date', 'start_time', 'end_time')
+        schedules = ClassSchedule.objects.filter(classroom_id__in=rooms).values_list(
+            'classroom_id', 'start_minute_of_week', 'end_minute_of_week'
+        )
+        return cls(pending, approved, schedules)
+
+    def is_blocked(self, booking):
+        """Does ``booking`` overlap a regular class or an approved booking?"""
+        return _overlaps(
+            self.blocked[booking.classroom_id, booking.date],
+            _minute_of_day(booking.start_time), _minute_of_day(booking.end_time),
+        )
+
+    def groups(self):
+        """ConflictGroups in (room, date, start) order, from one sweep over the sorted queue"""
+        groups = []
+        current, reach = None, None
+        for booking in self.pending:
+            key = (booking.classroom_id, booking.date)
+            start, end = _minute_of_day(booking.start_time), _minute_of_day(booking.end_time)
+            if current is not None and (current.classroom_id, current.date) == key and start < reach:
+                current.bookings.append(booking)
+                reach = max(reach, end)
+            else:
+                current = ConflictGroup(booking.classroom_id, booking.date, [booking])
+                groups.append(current)
+                reach = end
+        return groups
+
+    def proposal(self):
+        """Ids to approve by default: first come, first served, skipping blocked requests"""
+        first_come = sorted(self.pending, key=lambda booking: (booking.created_at, booking.pk))
+        return self.resolve([booking.pk for booking in first_come]).approved
+
+    def resolve(self, booking_ids):
+        """Decide which of ``booking_ids`` can be approved together, and who loses.
+
+        Requests are granted in the given order; one that overlaps a class,
+        an approved booking or an earlier grant is skipped (left pending).
+        Every other pending booking that overlaps a grant is rejected.
+        """
+        by_id = {booking.pk: booking for booking in self.pending}
+        granted = defaultdict(list)  # (classroom_id, date) -> sorted intervals
+        approved, skipped = [], []
+        for booking_id in dict.fromkeys(booking_ids):
+            booking = by_id.get(booking_id)
+            if booking is None:
+                skipped.append(booking_id)  # no longer pending
+                continue
+            key = (booking.classroom_id, booking.date)
+            interval = (_minute_of_day(booking.start_time), _minute_of_day(booking.end_time))
+            if self.is_blocked(booking) or _overlaps(granted[key], *interval):
+                skipped.append(booking_id)
+            else:
+                insort(granted[key], interval)
+                approved.append(booking_id)
+
+        chosen = set(approved) | set(skipped)
+        rejected = [
+            booking.pk for booking in self.pending
+            if booking.pk not in chosen and _overlaps(
+                granted.get((booking.classroom_id, booking.date), ()),
+                _minute_of_day(booking.start_time), _minute_of_day(booking.end_time),
+            )
+        ]
+        return ApprovalDecision(approved, rejected, skipped)
+
+
+def _set_status(booking_ids, status):
+    now = timezone.now()
+    for offset in range(0, len(booking_ids), UPDATE_BATCH_SIZE):
+        ClassroomBooking.objects.filter(
+            pk__in=booking_ids[offset:offset + UPDATE_BATCH_SIZE], status='pending',
+        ).update(status=status, updated_at=now)
+
+
+def approve_bookings(booking_ids):
+    """Approve ``booking_ids`` and reject the pending bookings they beat, atomically.
+
+    The rooms involved are locked (see booking.write_transaction and
+    lock_classrooms) before the queue is re-read, so a booking allocated
+    meanwhile is seen here and the result never contains two overlapping
+    approved bookings.
+    """
+    booking_ids = list(booking_ids)
+    with write_transaction():
+        chosen = set(ClassroomBooking.objects.filter(pk__in=booking_ids).values_list('classroom_id', 'date'))
+        if not chosen:
+            return ApprovalDecision(skipped=booking_ids)
+        rooms = {classroom_id for classroom_id, _ in chosen}
+        dates = {on_date for _, on_date in chosen}
+        lock_classrooms(rooms)
+        queue = ApprovalQueue.load(
+            min(dates), max(dates),
+            pending=ClassroomBooking.objects.filter(classroom_id__in=rooms).only(
+                'classroom_id', 'date', 'start_time', 'end_time', 'created_at',
+            ),
+        )
+        decision = queue.resolve(booking_ids)
+        _set_status(decision.approved, 'approved')
+        _set_status(decision.rejected, 'rejected')
+    BOOKINGS.inc(len(decision.approved), result='approved')
+    BOOKINGS.inc(len(decision.rejected), result='rejected')
+    return decision
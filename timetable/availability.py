@@ -0,0 +1,108 @@
+from collections import defaultdict
+from datetime import time
+
+from .models import ClassroomBooking, ClassSchedule, day_minute_range
+
+# The day is split into fixed buckets and every classroom gets one integer
+# whose set bits mark occupied buckets. Checking a room for a time range is
+# then a single AND against the mask of that range. Masks round outward to
+# whole buckets, so they only prefilter: a hit is confirmed against the
+# room's exact intervals before the room counts as busy.
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+BLOCKING_BOOKING_STATUSES = ('pending', 'approved')
+
+
+def _minute_of_day(value):
+    return value.hour * 60 + value.minute
+
+
+def minute_range_mask(start, end):
+    """Bitmask of every bucket touched by the half-open minute range [start, end)"""
+    if end <= start:
+        return 0
+    first = start // BUCKET_MINUTES
+    last = min(-(-end // BUCKET_MINUTES), BUCKETS_PER_DAY)  # ceil division
+    return ((1 << (last - first)) - 1) << first
+
+
+def interval_mask(start_time, end_time):
+    return minute_range_mask(_minute_of_day(start_time), _minute_of_day(end_time))
+
+
+class AvailabilityIndex:
+    """Per-classroom occupancy bitmasks for a single date.
+
+    Built from ClassSchedule (by weekday) and blocking ClassroomBooking rows
+    in two queries, after which every free/busy check is a bit operation
+    (plus an exact interval comparison when the buckets overlap).
+    """
+
+    def __init__(self, on_date, masks, intervals):
+        self.date = on_date
+        self.masks = masks
+        self.intervals = intervals  # classroom_id -> [(start_minute, end_minute)]
+
+    @classmethod
+    def build(cls, on_date, classroom_ids=None, exclude_booking_id=None,
+              booking_statuses=BLOCKING_BOOKING_STATUSES):
+        day_name = on_date.strftime('%A').lower()
+        masks = defaultdict(int)
+        intervals = defaultdict(list)
+
+        day_start, day_end = day_minute_range(day_name)
+        schedules = ClassSchedule.objects.filter(
+            start_minute_of_week__gte=day_start, start_minute_of_week__lt=day_end
+        )
+        bookings = ClassroomBooking.objects.filter(date=on_date, status__in=booking_statuses)
+        if classroom_ids is not None:
+            schedules = schedules.filter(classroom_id__in=classroom_ids)
+            bookings = bookings.filter(classroom_id__in=classroom_ids)
+        if exclude_booking_id is not None:
+            bookings = bookings.exclude(pk=exclude_booking_id)
+
+        rows = schedules.values_list('classroom_id', 'start_minute_of_week', 'end_minute_of_week')
+        for classroom_id, start, end in rows:
+            masks[classroom_id] |= minute_range_mask(start - day_start, end - day_start)
+            intervals[classroom_id].append((start - day_start, end - day_start))
+
+        rows = bookings.values_list('classroom_id', 'start_time', 'end_time')
+        for classroom_id, start_time, end_time in rows:
+            masks[classroom_id] |= interval_mask(start_time, end_time)
+            intervals[classroom_id].append((_minute_of_day(start_time), _minute_of_day(end_time)))
+
+        return cls(on_date, dict(masks), dict(intervals))
+
+    def _is_free(self, classroom_id, start, end, mask):
+        if not self.masks.get(classroom_id, 0) & mask:
+            return True
+        return not any(
+            busy_start < end and start < busy_end
+            for busy_start, busy_end in self.intervals.get(classroom_id, ())
+        )
+
+    def is_free(self, classroom_id, start_time, end_time):
+        start, end = _minute_of_day(start_time), _minute_of_day(end_time)
+        return self._is_free(classroom_id, start, end, minute_range_mask(start, end))
+
+    def is_busy(self, classroom_id, start_time, end_time):
+        return not self.is_free(classroom_id, start_time, end_time)
+
+    def free_classrooms(self, classroom_ids, start_time, end_time):
+        """Return the ids from ``classroom_ids`` that are free for the whole range"""
+        start, end = _minute_of_day(start_time), _minute_of_day(end_time)
+        wanted = minute_range_mask(start, end)
+        return [cid for cid in classroom_ids if self._is_free(cid, start, end, wanted)]
+
+    def hourly_grid(self, classroom_ids, first_hour=8, last_hour=20):
+        """Return [(slot_time, [free?, ...]), ...] with one column per classroom id"""
+        grid = []
+        for hour in range(first_hour, last_hour):
+            start, end = hour * 60, (hour + 1) * 60
+            slot_mask = minute_range_mask(start, end)
+            grid.append((
+                time(hour, 0),
+                [self._is_free(cid, start, end, slot_mask) for cid in classroom_ids],
+            ))
+        return grid
@@ -0,0 +1,313 @@
+import functools
+import json
+import math
+import platform
+import random
+import subprocess
+import threading
+import time as _time
+from collections import namedtuple
+from datetime import time, timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from campusConnect.instrumentation import quiet_request_log
+from users.models import StudentProfile, User
+from .availability import AvailabilityIndex
+from .booking import allocate_booking
+from .models import Classroom, ClassroomBooking, ClassSchedule
+from .seeding import SEED_EMAIL_DOMAIN, SEED_PASSWORD, CampusSeeder
+
+BUDGETS_PATH = Path(__file__).with_name('benchmark_budgets.json')
+
+# ``actor`` is the seeded user the client is logged in as; None means anonymous
+Scenario = namedtuple('Scenario', ['name', 'actor', 'method', 'url_name', 'data'])
+
+SCENARIOS = [
+    Scenario('classroom_status', 'student', 'get', 'classroom_status', None),
+    Scenario('free_slots', 'professor', 'get', 'free_slots', None),
+    Scenario('weekly_timetable_student', 'student', 'get', 'weekly_timetable', None),
+    Scenario('weekly_timetable_professor', 'professor', 'get', 'weekly_timetable', None),
+    Scenario('professor_dashboard', 'professor', 'get', 'professor_dashboard', None),
+    Scenario('my_bookings', 'professor', 'get', 'my_bookings', None),
+    Scenario('dashboard', 'student', 'get', 'dashboard', None),
+    Scenario('login_view', None, 'post', 'login', 'login'),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def pick_actors():
+    """A seeded professor who teaches and a seeded student whose batch has classes"""
+    professor = User.objects.filter(
+        email__endswith='@' + SEED_EMAIL_DOMAIN, role='professor',
+        classschedule__isnull=False,
+    ).order_by('id').first()
+    batch = ClassSchedule.objects.filter(
+        batch__batch_year__startswith='S'
+    ).values_list('batch__batch_year', 'batch__branch').order_by('batch_id').first()
+    profile = StudentProfile.objects.filter(
+        batch=batch[0], branch=batch[1], user__email__endswith='@' + SEED_EMAIL_DOMAIN,
+    ).select_related('user').order_by('id').first() if batch else None
+    return {'professor': professor, 'student': profile.user if profile else None}
+
+
+def _request(client, scenario, actor):
+    url = reverse(scenario.url_name)
+    if scenario.data == 'login':
+        return client.post(url, {'email': actor.email, 'password': SEED_PASSWORD})
+    return getattr(client, scenario.method)(url, scenario.data or {})
+
+
+def measure(scenario, actors, iterations=20, warmup=2):
+    """Run one scenario and return its timing percentiles (ms) and query counts.
+
+    Warmup runs fill the timetable cache first, so numbers are steady
+    state. Login gets a fresh client per run so every request really
+    authenticates.
+    """
+    actor = actors[scenario.actor] if scenario.actor else actors['professor']
+    client = Client()
+    if scenario.actor:
+        client.force_login(actor)
+
+    timings, queries = [], []
+    for run in range(warmup + iterations):
+        if scenario.data == 'login':
+            client = Client()
+        with CaptureQueriesContext(connection) as captured:
+            started = _time.perf_counter()
+            response = _request(client, scenario, actor)
+            elapsed = (_time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f"{scenario.name} returned HTTP {response.status_code}")
+        if run >= warmup:
+            timings.append(elapsed)
+            queries.append(len(captured))
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'max_ms': round(max(timings), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'queries': max(queries),
+        'queries_min': min(queries),
+    }
+
+
+def run_benchmarks(scale, seed=0, iterations=20, warmup=2, scenarios=SCENARIOS):
+    """Seed a campus of ``scale`` into the current database and measure every scenario.
+
+    Meant to run against a throwaway database (see the benchmark_views
+    command). Rate limiting is off so repeated logins are not throttled.
+    """
+    seed_report = CampusSeeder(seed=seed, **scale).run()
+    cache.clear()
+    actors = pick_actors()
+    if actors['professor'] is None or actors['student'] is None:
+        raise RuntimeError('The seeded campus has no timetable; increase the scale')
+
+    results = {}
+    with override_settings(RATELIMIT_ENABLED=False, DEBUG=False), quiet_request_log():
+        for scenario in scenarios:
+            results[scenario.name] = measure(scenario, actors, iterations, warmup)
+    return {'seed': seed_report, 'results': results}
+
+
+def sqlite_pragmas():
+    """The pragmas in effect on this thread's connection (empty for other backends)"""
+    if connection.vendor != 'sqlite':
+        return {}
+    values = {}
+    with connection.cursor() as cursor:
+        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size'):
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
+
+
+def _is_locked(error):
+    return 'locked' in str(error).lower()
+
+
+def _summarize(latencies, locked, seconds):
+    return {
+        'operations': len(latencies),
+        'per_second': round(len(latencies) / seconds, 1),
+        'p50_ms': round(percentile(latencies, 50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95), 2) if latencies else None,
+        'max_ms': round(max(latencies), 2) if latencies else None,
+        'locked_errors': locked,
+    }
+
+
+def _run_threads(operations, duration):
+    """Run each (role, operation) in its own thread for ``duration`` seconds.
+
+    Returns {role: summary} over all threads of a role. Every thread has
+    its own database connection, closed when it finishes; "database is
+    locked" errors are counted, any other error is re-raised here.
+    """
+    stop = threading.Event()
+    barrier = threading.Barrier(len(operations) + 1)
+    outcomes = [(role, [], [0]) for role, _ in operations]  # role, latencies, [locked]
+    failures = []
+
+    def work(operation, latencies, locked):
+        try:
+            barrier.wait()
+            while not stop.is_set():
+                started = _time.perf_counter()
+                try:
+                    operation()
+                except OperationalError as error:
+                    if not _is_locked(error):
+                        raise
+                    locked[0] += 1
+                    continue
+                latencies.append((_time.perf_counter() - started) * 1000)
+        except Exception as error:
+            failures.append(error)
+            stop.set()
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=work, args=(operation, latencies, locked))
+        for (_, operation), (_, latencies, locked) in zip(operations, outcomes)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = _time.perf_counter()
+    stop.wait(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = _time.perf_counter() - started
+    if failures:
+        raise failures[0]
+
+    summaries = {}
+    for role in dict.fromkeys(role for role, _, _ in outcomes):
+        latencies = [value for name, values, _ in outcomes if name == role for value in values]
+        locked = sum(count[0] for name, _, count in outcomes if name == role)
+        summaries[role] = dict(
+            threads=sum(1 for name, _, _ in outcomes if name == role),
+            **_summarize(latencies, locked, elapsed),
+        )
+    return summaries
+
+
+def run_concurrency_benchmark(readers=4, writers=2, duration=5.0, seed=0):
+    """Read throughput of the current (seeded) database alone and while writers run.
+
+    Readers build the day's AvailabilityIndex (the free_slots queries) for a
+    random upcoming date; writers allocate random one-hour bookings through
+    allocate_booking. Both phases use the same readers, so the read numbers
+    show how much the writes slow them down. Run it on a throwaway database.
+    """
+    room_ids = list(Classroom.objects.values_list('id', flat=True))
+    professor = ClassSchedule.objects.values_list('professor_id', flat=True).first()
+    if not room_ids or professor is None:
+        raise RuntimeError('Seed a campus with a timetable before running this benchmark')
+    today = timezone.localdate()
+    days = [today + timedelta(days=offset) for offset in range(14)]
+
+    def read(rng):
+        AvailabilityIndex.build(rng.choice(days)).free_classrooms(room_ids, time(9), time(10))
+
+    def write(rng):
+        start = rng.randrange(8 * 60, 19 * 60, 15)
+        allocate_booking(ClassroomBooking(
+            professor_id=professor, classroom_id=rng.choice(room_ids), date=rng.choice(days),
+            start_time=time(start // 60, start % 60), end_time=time(start // 60 + 1, start % 60),
+            course_name='Benchmark', purpose='Concurrency benchmark',
+        ))
+
+    def threads(role, function, count, offset=0):
+        # One seeded RNG per thread keeps runs comparable
+        return [
+            (role, functools.partial(function, random.Random(seed + offset + number)))
+            for number in range(count)
+        ]
+
+    return {
+        'pragmas': sqlite_pragmas(),
+        'readers': readers,
+        'writers': writers,
+        'duration_s': duration,
+        'phases': {
+            'reads_only': _run_threads(threads('reads', read, readers), duration),
+            'reads_with_writes': _run_threads(
+                threads('reads', read, readers) + threads('writes', write, writers, offset=1000),
+                duration,
+            ),
+        },
+    }
+
+
+def check_budgets(results, budgets, check_latency=True, latency_tolerance=1.0):
+    """Return one message per view that exceeds its query or p95 latency budget"""
+    violations = []
+    for name, budget in budgets.get('views', {}).items():
+        result = results.get(name)
+        if result is None:
+            continue
+        if result['queries'] > budget['max_queries']:
+            violations.append(
+                f"{name}: {result['queries']} queries (budget {budget['max_queries']})"
+            )
+        limit = budget['p95_ms'] * latency_tolerance
+        if check_latency and result['p95_ms'] > limit:
+            violations.append(f"{name}: p95 {result['p95_ms']:.1f}ms (budget {limit:.1f}ms)")
+    return violations
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=settings.BASE_DIR, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(scale, seed, iterations, run, violations):
+    """The JSON document written for trend tracking across releases"""
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'git_commit': _git_commit(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'machine': platform.machine(),
+        },
+        'scale': scale,
+        'seed': seed,
+        'iterations': iterations,
+        'dataset': run['seed']['counts'],
+        'results': run['results'],
+        'violations': violations,
+    }
@@ -0,0 +1,183 @@
+import time as _time
+from contextlib import contextmanager
+
+from django.db import IntegrityError, OperationalError, connection, transaction
+
+from campusConnect.metrics import BOOKINGS
+
+from .availability import BLOCKING_BOOKING_STATUSES
+from .models import (
+    Classroom, ClassroomBooking, ClassSchedule, day_minute_range, minute_of_week,
+    time_from_minute_of_week,
+)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 0.05  # seconds, doubled after every locked attempt
+
+
+class BookingConflict:
+    """One existing class or booking that overlaps a requested interval"""
+
+    def __init__(self, kind, obj_id, start_time, end_time, label):
+        self.kind = kind  # 'class' or 'booking'
+        self.id = obj_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.label = label
+
+    def __str__(self):
+        return f"{self.label} ({self.start_time:%H:%M}-{self.end_time:%H:%M})"
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'id': self.id,
+            'start_time': self.start_time.strftime('%H:%M'),
+            'end_time': self.end_time.strftime('%H:%M'),
+            'label': self.label,
+        }
+
+
+class BookingResult:
+    """Outcome of allocate_booking: the saved booking, or the conflicts that blocked it"""
+
+    def __init__(self, booking=None, conflicts=(), attempts=1):
+        self.booking = booking
+        self.conflicts = list(conflicts)
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.booking is not None and not self.conflicts
+
+    def message(self):
+        if self.ok:
+            return ''
+        return "Conflicts with " + ", ".join(str(conflict) for conflict in self.conflicts)
+
+
+def find_conflicts(classroom_id, on_date, start_time, end_time, exclude_booking_id=None):
+    """Return every regular class and blocking booking overlapping [start_time, end_time)"""
+    day_name = on_date.strftime('%A').lower()
+    conflicts = []
+
+    day_start, _ = day_minute_range(day_name)
+    schedules = ClassSchedule.objects.filter(
+        classroom_id=classroom_id,
+        start_minute_of_week__gte=day_start,
+        start_minute_of_week__lt=minute_of_week(day_name, end_time),
+        end_minute_of_week__gt=minute_of_week(day_name, start_time),
+    ).values_list('id', 'course__code', 'start_minute_of_week', 'end_minute_of_week')
+    for schedule_id, course_code, slot_start, slot_end in schedules:
+        conflicts.append(BookingConflict(
+            'class', schedule_id, time_from_minute_of_week(slot_start),
+            time_from_minute_of_week(slot_end), course_code,
+        ))
+
+    bookings = ClassroomBooking.objects.filter(
+        classroom_id=classroom_id,
+        date=on_date,
+        status__in=BLOCKING_BOOKING_STATUSES,
+        start_time__lt=end_time,
+        end_time__gt=start_time,
+    )
+    if exclude_booking_id is not None:
+        bookings = bookings.exclude(pk=exclude_booking_id)
+    for booking_id, course_code, course_name, booked_start, booked_end in bookings.values_list(
+        'id', 'course_code', 'course_name', 'start_time', 'end_time'
+    ):
+        label = f"booking {course_code or course_name}"
+        conflicts.append(BookingConflict('booking', booking_id, booked_start, booked_end, label))
+
+    conflicts.sort(key=lambda conflict: conflict.start_time)
+    return conflicts
+
+
+@contextmanager
+def write_transaction():
+    """transaction.atomic() for the booking write paths.
+
+    On SQLite the outermost block starts with BEGIN IMMEDIATE, which takes
+    the database write lock up front: the overlap check and the write that
+    follows cannot interleave with another writer, and a busy database
+    fails at BEGIN (retried by allocate_booking) rather than mid-way.
+    Other transactions keep the default deferred BEGIN, so reads never
+    queue behind writers.
+    """
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic():
+            yield
+        return
+    connection.ensure_connection()  # transaction_mode is read from the settings on connect
+    previous = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic():
+            connection.transaction_mode = previous  # BEGIN IMMEDIATE has been issued
+            yield
+    finally:
+        connection.transaction_mode = previous
+
+
+def lock_classrooms(classroom_ids):
+    """Serialize writers for these classrooms until the surrounding transaction ends.
+
+    Call inside write_transaction(). SQLite has no row locks, and the
+    transaction already holds the database write lock; other backends lock
+    the classroom rows (in primary key order) with SELECT ... FOR UPDATE.
+    """
+    if connection.vendor != 'sqlite':
+        list(Classroom.objects.filter(pk__in=classroom_ids).select_for_update().order_by('pk').values_list('pk'))
+
+
+def _is_locked_error(error):
+    return 'locked' in str(error).lower()
+
+
+def allocate_booking(booking):
+    """Check ``booking`` for overlaps and save it in one serialized transaction.
+
+    ``booking`` is an unsaved (or edited) ClassroomBooking. Returns a
+    BookingResult; on conflict nothing is written. "database is locked"
+    errors are retried with exponential backoff.
+    """
+    delay = RETRY_DELAY
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with write_transaction():
+                lock_classrooms([booking.classroom_id])
+                conflicts = find_conflicts(
+                    booking.classroom_id,
+                    booking.date,
+                    booking.start_time,
+                    booking.end_time,
+                    exclude_booking_id=booking.pk,
+                )
+                if conflicts:
+                    BOOKINGS.inc(result='conflict')
+                    return BookingResult(conflicts=conflicts, attempts=attempt)
+                booking.save()
+            BOOKINGS.inc(result='created')
+            return BookingResult(booking=booking, attempts=attempt)
+        except IntegrityError:
+            # unique_together on the exact interval; it also covers cancelled/rejected rows
+            duplicates = ClassroomBooking.objects.filter(
+                classroom_id=booking.classroom_id,
+                date=booking.date,
+                start_time=booking.start_time,
+                end_time=booking.end_time,
+            ).exclude(pk=booking.pk).values_list('id', 'status')
+            conflicts = [
+                BookingConflict(
+                    'booking', booking_id, booking.start_time, booking.end_time,
+                    f"{status} booking for the same time",
+                )
+                for booking_id, status in duplicates
+            ]
+            BOOKINGS.inc(result='conflict')
+            return BookingResult(conflicts=conflicts, attempts=attempt)
+        except OperationalError as error:
+            if not _is_locked_error(error) or attempt == MAX_ATTEMPTS:
+                raise
+            _time.sleep(delay)
+            delay *= 2
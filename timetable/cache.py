@@ -0,0 +1,186 @@
+import time as _time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+
+from campusConnect.metrics import CACHE_REQUESTS
+from .models import ClassSchedule
+
+# Every cached timetable key embeds a global generation plus a version for
+# its owner (a Batch or a professor). Bumping a version makes the old key
+# unreachable, so invalidation never has to find or delete stale entries.
+KEY_PREFIX = 'timetable'
+GLOBAL_VERSION_KEY = f'{KEY_PREFIX}:version:all'
+# Bump when serialize_schedule changes shape so old entries are never read back
+FORMAT_VERSION = 2
+
+
+def _timeout():
+    return getattr(settings, 'TIMETABLE_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def _fresh_version():
+    # Time based so an evicted counter never restarts at a value that
+    # could match an entry written before the eviction.
+    return int(_time.time() * 1000)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = _fresh_version()
+        cache.add(key, version, None)
+        version = cache.get(key, version)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def _owner_version_key(owner, owner_id):
+    return f'{KEY_PREFIX}:version:{owner}:{owner_id}'
+
+
+def _owner_data_key(owner, owner_id, global_version, owner_version):
+    return f'{KEY_PREFIX}:{owner}:{owner_id}:f{FORMAT_VERSION}:g{global_version}:v{owner_version}'
+
+
+def invalidate_batches(batch_ids):
+    for batch_id in set(batch_ids):
+        _bump_version(_owner_version_key('batch', batch_id))
+
+
+def invalidate_professors(professor_ids):
+    for professor_id in set(professor_ids):
+        _bump_version(_owner_version_key('professor', professor_id))
+
+
+def invalidate_all_timetables():
+    """Drop every cached timetable, e.g. after bulk writes that skip signals"""
+    _bump_version(GLOBAL_VERSION_KEY)
+
+
+def serialize_schedule(schedule):
+    """Flatten a ClassSchedule (with select_related rows) into plain data"""
+    professor = schedule.professor
+    return {
+        'id': schedule.id,
+        'start_minute_of_week': schedule.start_minute_of_week,
+        'course': {
+            'id': schedule.course_id,
+            'code': schedule.course.code,
+            'name': schedule.course.name,
+        },
+        'professor': {
+            'id': professor.id,
+            'short_name': professor.short_name,
+            'first_name': professor.first_name,
+            'last_name': professor.last_name,
+            'get_full_name': professor.get_full_name(),
+        },
+        'batch': {
+            'id': schedule.batch_id,
+            'name': schedule.batch.name,
+            'batch_year': schedule.batch.batch_year,
+            'branch': schedule.batch.branch,
+            'section': schedule.batch.section,
+        },
+        'classroom': {
+            'id': schedule.classroom_id,
+            'room_number': schedule.classroom.room_number,
+            'building': schedule.classroom.building,
+        },
+        'time_slot': {
+            'id': schedule.time_slot_id,
+            'day': schedule.time_slot.day,
+            'start_time': schedule.time_slot.start_time,
+            'end_time': schedule.time_slot.end_time,
+        },
+    }
+
+
+def deserialize_schedule(data):
+    """Rebuild an object with the same attribute paths templates use on ClassSchedule"""
+    return SimpleNamespace(**{
+        key: SimpleNamespace(**value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    })
+
+
+def _schedule_queryset():
+    # Only the professor is joined; the small reference tables come from the snapshot
+    return ClassSchedule.objects.select_related('professor').order_by('start_minute_of_week')
+
+
+def _with_references(schedules):
+    from .reference import get_reference_data
+    return get_reference_data().attach(list(schedules), 'course', 'classroom', 'time_slot', 'batch')
+
+
+def _get_cached_schedules(owner, owner_ids, fetch):
+    """Return {owner_id: [serialized schedules]} using one get_many and at most one query"""
+    global_version = _get_version(GLOBAL_VERSION_KEY)
+    version_keys = {owner_id: _owner_version_key(owner, owner_id) for owner_id in owner_ids}
+    versions = cache.get_many(version_keys.values())
+
+    data_keys = {}
+    for owner_id, version_key in version_keys.items():
+        version = versions.get(version_key)
+        if version is None:
+            version = _get_version(version_key)
+        data_keys[owner_id] = _owner_data_key(owner, owner_id, global_version, version)
+
+    cached = cache.get_many(data_keys.values())
+    result = {
+        owner_id: cached[key] for owner_id, key in data_keys.items() if key in cached
+    }
+
+    missing = [owner_id for owner_id in owner_ids if owner_id not in result]
+    namespace = f'{KEY_PREFIX}.{owner}'
+    CACHE_REQUESTS.inc(len(result), namespace=namespace, result='hit')
+    CACHE_REQUESTS.inc(len(missing), namespace=namespace, result='miss')
+    if missing:
+        fresh = {owner_id: [] for owner_id in missing}
+        for owner_id, schedule in fetch(missing):
+            fresh[owner_id].append(serialize_schedule(schedule))
+        cache.set_many(
+            {data_keys[owner_id]: rows for owner_id, rows in fresh.items()},
+            _timeout(),
+        )
+        result.update(fresh)
+    return result
+
+
+def _sorted_schedules(rows):
+    schedules = [deserialize_schedule(row) for row in rows]
+    schedules.sort(key=lambda s: s.start_minute_of_week)
+    return schedules
+
+
+def get_batch_schedules(batch_ids):
+    """Weekly schedule for the given batches, served from the per-batch cache"""
+    batch_ids = list(batch_ids)
+    if not batch_ids:
+        return []
+
+    def fetch(missing):
+        for schedule in _with_references(_schedule_queryset().filter(batch_id__in=missing)):
+            yield schedule.batch_id, schedule
+
+    cached = _get_cached_schedules('batch', batch_ids, fetch)
+    return _sorted_schedules(row for batch_id in batch_ids for row in cached[batch_id])
+
+
+def get_professor_schedules(professor_id):
+    """Weekly schedule taught by one professor, served from the per-professor cache"""
+    def fetch(missing):
+        for schedule in _with_references(_schedule_queryset().filter(professor_id__in=missing)):
+            yield schedule.professor_id, schedule
+
+    cached = _get_cached_schedules('professor', [professor_id], fetch)
+    return _sorted_schedules(cached[professor_id])
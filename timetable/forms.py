@@ -1,7 +1,7 @@
 from django import forms
-from .models import ClassroomBooking, Classroom, Batch
+from .models import ClassroomBooking
+from .availability import AvailabilityIndex
 from django.utils import timezone
-from datetime import datetime, time, date
 
 class ClassroomBookingForm(forms.ModelForm):
     class Meta:
@@ -35,20 +35,14 @@ class ClassroomBookingForm(forms.ModelForm):
             if start_time >= end_time:
                 raise forms.ValidationError("End time must be after start time.")
             
-            # Check if classroom is already booked for this time
+            # Check the room against regular classes and other bookings
             if classroom:
-                conflicting_bookings = ClassroomBooking.objects.filter(
-                    classroom=classroom,
-                    date=date,
-                    status__in=['pending', 'approved'],
-                    start_time__lt=end_time,
-                    end_time__gt=start_time
+                index = AvailabilityIndex.build(
+                    date,
+                    classroom_ids=[classroom.id],
+                    exclude_booking_id=self.instance.pk,
                 )
-                
-                if self.instance.pk:
-                    conflicting_bookings = conflicting_bookings.exclude(pk=self.instance.pk)
-                
-                if conflicting_bookings.exists():
+                if index.is_busy(classroom.id, start_time, end_time):
                     raise forms.ValidationError(
                         f"Classroom {classroom.room_number} is already booked for the selected time."
                     )
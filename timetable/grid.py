@@ -0,0 +1,50 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+
+DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+
+# ``is_start`` is False for the rows a multi-hour session continues into.
+GridEntry = namedtuple('GridEntry', ['schedule', 'is_start', 'span'])
+
+
+class WeeklyGrid:
+    """Day x time-band grid of ClassSchedule rows built in a single pass.
+
+    Row boundaries are the distinct start/end times of the slots, so a
+    14:00-16:00 lab covers the 14:00 and 15:00 rows when hourly slots exist
+    alongside it. Cells are keyed by (day, start_time), never by TimeSlot.id,
+    so duplicate TimeSlot rows for the same period land in the same cell.
+    """
+
+    def __init__(self, classes, slot_times=(), days=DAYS):
+        self.days = list(days)
+        classes = list(classes)
+
+        boundaries = set()
+        for start_time, end_time in slot_times:
+            boundaries.update((start_time, end_time))
+        for schedule in classes:
+            boundaries.update((schedule.time_slot.start_time, schedule.time_slot.end_time))
+        self.boundaries = sorted(boundaries)
+
+        self.cells = defaultdict(list)
+        for schedule in classes:
+            slot = schedule.time_slot
+            first = bisect_left(self.boundaries, slot.start_time)
+            last = bisect_right(self.boundaries, slot.end_time) - 1
+            span = max(last - first, 1)
+            for offset, row_start in enumerate(self.boundaries[first:first + span]):
+                self.cells[(slot.day, row_start)].append(GridEntry(schedule, offset == 0, span))
+
+        # Rows ready for the template: start, end and one cell list per day
+        self.rows = [
+            {
+                'start_time': start_time,
+                'end_time': end_time,
+                'cells': [self.cell(day, start_time) for day in self.days],
+            }
+            for start_time, end_time in zip(self.boundaries, self.boundaries[1:])
+        ]
+
+    def cell(self, day, start_time):
+        return self.cells.get((day, start_time), [])
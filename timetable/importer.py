@@ -0,0 +1,372 @@
+import csv
+import json
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from pathlib import Path
+
+from django.db import transaction
+
+from users.models import User
+from .cache import invalidate_all_timetables, invalidate_batches, invalidate_professors
+from .models import ClassSchedule, TimeSlot
+from .reference import forget_reference_data, get_reference_data, invalidate_reference_data
+
+FIELDS = (
+    'day', 'course', 'batch_year', 'branch', 'section',
+    'professor', 'classroom', 'start_time', 'end_time',
+)
+WILDCARD = 'ALL'
+ROOM_SEPARATOR = '|'
+VALID_DAYS = {day for day, _ in TimeSlot.DAY_CHOICES}
+
+# One source row as read from a file (``line`` is for error messages)
+ScheduleRow = namedtuple('ScheduleRow', FIELDS + ('line',))
+
+# One fully resolved ClassSchedule to be written
+PlannedClass = namedtuple(
+    'PlannedClass',
+    ['day', 'start_time', 'end_time', 'course', 'professor', 'batch', 'classroom', 'line'],
+)
+
+
+def parse_time(value):
+    return datetime.strptime(value.strip(), '%H:%M').time()
+
+
+def row_from_mapping(data, line):
+    values = {field: str(data.get(field) or '').strip() for field in FIELDS}
+    values['day'] = values['day'].lower()
+    values['branch'] = values['branch'] if values['branch'] == WILDCARD else values['branch'].lower()
+    return ScheduleRow(line=line, **values)
+
+
+def row_from_tuple(day, values, line):
+    """Adapt the legacy (course, year, branch, section, prof, room, start, end) tuples"""
+    return row_from_mapping(dict(zip(FIELDS, (day,) + tuple(values))), line)
+
+
+def read_rows(path, fmt=None):
+    """Stream ScheduleRows from a CSV, JSON array or JSON-lines file"""
+    path = Path(path)
+    fmt = fmt or path.suffix.lstrip('.').lower()
+    with path.open(newline='', encoding='utf-8') as handle:
+        if fmt == 'csv':
+            for line, data in enumerate(csv.DictReader(handle), start=2):
+                yield row_from_mapping(data, line)
+        elif fmt in ('jsonl', 'ndjson'):
+            for line, text in enumerate(handle, start=1):
+                if text.strip():
+                    yield row_from_mapping(json.loads(text), line)
+        elif fmt == 'json':
+            for index, data in enumerate(json.load(handle), start=1):
+                yield row_from_mapping(data, index)
+        else:
+            raise ValueError(f"Unsupported schedule format: {fmt}")
+
+
+class ReferenceData:
+    """Every lookup table an import needs, as dicts (from the reference snapshot)"""
+
+    def __init__(self):
+        snapshot = get_reference_data()
+        self.courses = snapshot.courses_by_code
+        self.classrooms = snapshot.classrooms_by_number
+        self.professors = {
+            professor.short_name: professor
+            for professor in User.objects.filter(role='professor').exclude(short_name=None)
+        }
+        self.batches = snapshot.batches
+        self.batches_by_key = snapshot.batches_by_key
+
+    def expand_batches(self, batch_year, branch, section):
+        """Resolve a (year, branch, section) triple where any part may be ALL/blank"""
+        if WILDCARD not in (batch_year, branch, section) and section:
+            batch = self.batches_by_key.get((batch_year, branch, section))
+            return [batch] if batch else []
+        return [
+            batch for batch in self.batches
+            if batch_year in (WILDCARD, batch.batch_year)
+            and branch in (WILDCARD, batch.branch)
+            and section in (WILDCARD, '', batch.section)
+        ]
+
+
+class ScheduleImporter:
+    """Resolve, validate and bulk-write schedule rows.
+
+    Query count is constant: the reference tables, time slots and existing
+    schedules for the affected days are each read once, and writes are
+    bulk_create calls inside one transaction.
+    """
+
+    def __init__(self, rows, references=None):
+        self.rows = rows
+        self.references = references or ReferenceData()
+        self.errors = []
+        self.planned = []
+        self.skipped = 0
+        self.invalid_lines = set()
+
+    def error(self, row, message):
+        self.errors.append(f"line {row.line}: {message}")
+
+    def resolve(self):
+        refs = self.references
+        for row in self.rows:
+            if row.day not in VALID_DAYS:
+                self.error(row, f"unknown day '{row.day}'")
+                continue
+            try:
+                start_time, end_time = parse_time(row.start_time), parse_time(row.end_time)
+            except ValueError:
+                self.error(row, f"bad time range '{row.start_time}-{row.end_time}'")
+                continue
+            if start_time >= end_time:
+                self.error(row, "end time must be after start time")
+                continue
+
+            course = refs.courses.get(row.course)
+            professor = refs.professors.get(row.professor)
+            room_numbers = [room.strip() for room in row.classroom.split(ROOM_SEPARATOR)]
+            classrooms = [refs.classrooms.get(room) for room in room_numbers]
+            batches = refs.expand_batches(row.batch_year, row.branch, row.section)
+            missing = [
+                label for label, value in (
+                    (f"course '{row.course}'", course),
+                    (f"professor '{row.professor}'", professor),
+                    (f"classroom '{row.classroom}'", all(classrooms)),
+                    (f"batch '{row.batch_year} {row.branch} {row.section}'", batches),
+                ) if not value
+            ]
+            if missing:
+                self.error(row, "not found: " + ", ".join(missing))
+                continue
+            if len(batches) > len(classrooms):
+                # A classroom holds one ClassSchedule per slot, so wildcard rows
+                # must list a room for every batch they expand to.
+                self.error(
+                    row,
+                    f"expands to {len(batches)} batches but lists {len(classrooms)} classroom(s); "
+                    f"separate one room per batch with '{ROOM_SEPARATOR}'",
+                )
+                continue
+
+            for batch, classroom in zip(batches, classrooms):
+                self.planned.append(PlannedClass(
+                    row.day, start_time, end_time, course, professor, batch, classroom, row.line
+                ))
+        return self.planned
+
+    def existing_classes(self):
+        """Current schedules on the affected days, as PlannedClass tuples"""
+        days = {planned.day for planned in self.planned}
+        schedules = ClassSchedule.objects.filter(time_slot__day__in=days).select_related(
+            'time_slot', 'course', 'professor', 'batch', 'classroom'
+        )
+        return [
+            PlannedClass(
+                s.time_slot.day, s.time_slot.start_time, s.time_slot.end_time,
+                s.course, s.professor, s.batch, s.classroom, 'existing',
+            )
+            for s in schedules
+        ]
+
+    def _identity(self, planned):
+        return (
+            planned.day, planned.start_time, planned.end_time, planned.course.id,
+            planned.professor.id, planned.batch.id, planned.classroom.id,
+        )
+
+    def validate(self, existing=None):
+        """Drop rows already in the table and report classroom/batch clashes"""
+        existing = self.existing_classes() if existing is None else existing
+        present = {self._identity(planned) for planned in existing}
+
+        fresh, seen = [], set()
+        for planned in self.planned:
+            identity = self._identity(planned)
+            if identity in present or identity in seen:
+                continue
+            seen.add(identity)
+            fresh.append(planned)
+        self.skipped = len(self.planned) - len(fresh)
+        self.planned = fresh
+
+        for label, key in (
+            ('classroom', lambda p: (p.day, p.classroom.id)),
+            ('batch', lambda p: (p.day, p.batch.id)),
+        ):
+            groups = defaultdict(list)
+            for planned in existing + fresh:
+                groups[key(planned)].append(planned)
+            for entries in groups.values():
+                entries.sort(key=lambda p: p.start_time)
+                for index, planned in enumerate(entries):
+                    for other in entries[index + 1:]:
+                        if other.start_time >= planned.end_time:
+                            break
+                        if planned.line == other.line == 'existing':
+                            continue
+                        self._clash(label, planned, other)
+        return not self.errors
+
+    def _clash(self, label, first, second):
+        self.invalid_lines.update(
+            planned.line for planned in (first, second) if planned.line != 'existing'
+        )
+        subject = first.classroom.room_number if label == 'classroom' else first.batch.name
+        self.errors.append(
+            f"{label} clash on {first.day} for {subject}: "
+            f"{first.course.code} {first.start_time:%H:%M}-{first.end_time:%H:%M} (line {first.line}) "
+            f"vs {second.course.code} {second.start_time:%H:%M}-{second.end_time:%H:%M} (line {second.line})"
+        )
+
+    def drop_invalid(self):
+        """Leave only planned classes whose source rows had no clash"""
+        self.planned = [p for p in self.planned if p.line not in self.invalid_lines]
+
+    def write(self):
+        """Insert the validated plan; returns the number of ClassSchedule rows created"""
+        with transaction.atomic():
+            slots = ensure_time_slots(
+                {(p.day, p.start_time, p.end_time) for p in self.planned}
+            )
+            ClassSchedule.objects.bulk_create(
+                [_new_schedule(planned, slots) for planned in self.planned], batch_size=500
+            )
+            # bulk_create skips the post_save signals that invalidate cached timetables
+            transaction.on_commit(invalidate_all_timetables)
+        return len(self.planned)
+
+
+class ScheduleDiff:
+    """Changes that turn the current ClassSchedule table into the desired one.
+
+    Rows are matched on (batch, day, start_time, end_time); a match whose
+    course, professor or classroom differs becomes an update.
+    """
+
+    def __init__(self, days, inserts, updates, deletes, unchanged):
+        self.days = days
+        self.inserts = inserts      # [PlannedClass]
+        self.updates = updates      # [(ClassSchedule, PlannedClass)]
+        self.deletes = deletes      # [ClassSchedule]
+        self.unchanged = unchanged
+
+    def __bool__(self):
+        return bool(self.inserts or self.updates or self.deletes)
+
+    def affected_owners(self):
+        batch_ids, professor_ids = set(), set()
+        for planned in self.inserts:
+            batch_ids.add(planned.batch.id)
+            professor_ids.add(planned.professor.id)
+        for schedule, planned in self.updates:
+            batch_ids.add(schedule.batch_id)
+            professor_ids.update((schedule.professor_id, planned.professor.id))
+        for schedule in self.deletes:
+            batch_ids.add(schedule.batch_id)
+            professor_ids.add(schedule.professor_id)
+        return batch_ids, professor_ids
+
+
+def _slot_key(day, batch_id, start_time, end_time):
+    return (day, batch_id, start_time, end_time)
+
+
+def diff_schedule(planned, days):
+    """Compare ``planned`` with the current schedules on ``days``"""
+    current = {}
+    schedules = ClassSchedule.objects.filter(time_slot__day__in=days).select_related(
+        'time_slot', 'course', 'professor', 'batch', 'classroom'
+    )
+    for schedule in schedules:
+        slot = schedule.time_slot
+        current[_slot_key(slot.day, schedule.batch_id, slot.start_time, slot.end_time)] = schedule
+
+    inserts, updates = [], []
+    unchanged = 0
+    for entry in planned:
+        schedule = current.pop(
+            _slot_key(entry.day, entry.batch.id, entry.start_time, entry.end_time), None
+        )
+        if schedule is None:
+            inserts.append(entry)
+        elif (schedule.course_id, schedule.professor_id, schedule.classroom_id) != (
+            entry.course.id, entry.professor.id, entry.classroom.id
+        ):
+            updates.append((schedule, entry))
+        else:
+            unchanged += 1
+    return ScheduleDiff(sorted(days), inserts, updates, list(current.values()), unchanged)
+
+
+def apply_diff(diff):
+    """Apply ``diff`` in one transaction and invalidate only the timetables it touched.
+
+    Updated rows are deleted and inserted again instead of updated in
+    place: two classes that swap rooms in one slot would otherwise collide
+    on the (classroom, time_slot) unique constraint halfway through a
+    bulk_update. Nothing references ClassSchedule, so new ids are harmless.
+    """
+    with transaction.atomic():
+        replaced = [s.pk for s in diff.deletes] + [s.pk for s, _ in diff.updates]
+        if replaced:
+            ClassSchedule.objects.filter(pk__in=replaced).delete()
+
+        inserts = diff.inserts + [planned for _, planned in diff.updates]
+        slots = ensure_time_slots(
+            {(p.day, p.start_time, p.end_time) for p in inserts}
+        )
+        ClassSchedule.objects.bulk_create(
+            [_new_schedule(planned, slots) for planned in inserts], batch_size=500
+        )
+
+        batch_ids, professor_ids = diff.affected_owners()
+        transaction.on_commit(lambda: invalidate_batches(batch_ids))
+        transaction.on_commit(lambda: invalidate_professors(professor_ids))
+
+
+def _new_schedule(planned, slots):
+    schedule = ClassSchedule(
+        course=planned.course,
+        professor=planned.professor,
+        batch=planned.batch,
+        classroom=planned.classroom,
+        time_slot=slots[(planned.day, planned.start_time, planned.end_time)],
+    )
+    # bulk_create bypasses save(), which normally fills these in
+    schedule.sync_minutes_of_week()
+    return schedule
+
+
+def ensure_time_slots(keys):
+    """Return {(day, start, end): TimeSlot} for ``keys``, creating missing slots in bulk.
+
+    This is the one way importers and commands resolve slots: one query
+    when every slot exists, three when some are new. The unique constraint
+    on TimeSlot makes a concurrent import creating the same slot harmless.
+    """
+    keys = set(keys)
+    if not keys:
+        return {}
+    days = {day for day, _, _ in keys}
+
+    def load():
+        return {
+            (slot.day, slot.start_time, slot.end_time): slot
+            for slot in TimeSlot.objects.filter(day__in=days)
+        }
+
+    slots = load()
+    missing = keys - slots.keys()
+    if missing:
+        TimeSlot.objects.bulk_create([
+            TimeSlot(day=day, start_time=start_time, end_time=end_time)
+            for day, start_time, end_time in sorted(missing)
+        ], ignore_conflicts=True)
+        # bulk_create skips the signals that refresh the reference snapshot
+        forget_reference_data()
+        transaction.on_commit(invalidate_reference_data)
+        slots = load()
+    return slots
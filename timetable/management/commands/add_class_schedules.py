@@ -1,8 +1,6 @@
 from django.core.management.base import BaseCommand
-from timetable.models import ClassSchedule, Course, Batch, Classroom, TimeSlot
-from users.models import User
-from django.db import transaction
-from datetime import time
+from timetable.models import ClassSchedule
+from timetable.importer import ScheduleImporter, row_from_tuple
 
 class Command(BaseCommand):
     help = 'Populate ClassSchedule for a specific day using professor short names'
@@ -20,19 +18,19 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f"No schedule data defined for {day}"))
             return
 
-        created_count = 0
-        error_count = 0
-
         self.stdout.write(f"Populating ClassSchedule for {day.title()}...")
         self.stdout.write("=" * 50)
 
-        with transaction.atomic():
-            for schedule in schedule_data:
-                success = self.create_class_schedule(schedule, day)
-                if success:
-                    created_count += 1
-                else:
-                    error_count += 1
+        # Resolve and validate every row against preloaded tables, then bulk insert
+        rows = [row_from_tuple(day, schedule, line) for line, schedule in enumerate(schedule_data, start=1)]
+        importer = ScheduleImporter(rows)
+        importer.resolve()
+        importer.validate()
+        for message in importer.errors:
+            self.stdout.write(self.style.ERROR(f"✗ {message}"))
+        importer.drop_invalid()
+        created_count = importer.write()
+        error_count = len(importer.errors)
 
         self.generate_report(created_count, error_count, day)
 
@@ -373,77 +371,6 @@ class Command(BaseCommand):
         
         return schedules.get(day, [])
 
-    def create_class_schedule(self, schedule_data, day):
-        """Create a single class schedule using professor short name"""
-        try:
-            (course_code, batch_year, batch_branch, batch_section, 
-             professor_short_name, classroom_number, start_time_str, end_time_str) = schedule_data
-
-            # Convert time strings to time objects
-            start_time = time(*map(int, start_time_str.split(':')))
-            end_time = time(*map(int, end_time_str.split(':')))
-
-            # Get objects
-            course = Course.objects.get(code=course_code)
-            batch = Batch.objects.get(
-                batch_year=batch_year,
-                branch=batch_branch, 
-                section=batch_section
-            )
-            
-            # Get professor by short name
-            professor = User.objects.get(short_name=professor_short_name, role='professor')
-            
-            classroom = Classroom.objects.get(room_number=classroom_number)
-            
-            # Get or create time slot
-            time_slot, created_ts = TimeSlot.objects.get_or_create(
-                day=day,
-                start_time=start_time,
-                end_time=end_time,
-                defaults={
-                    'day': day,
-                    'start_time': start_time,
-                    'end_time': end_time
-                }
-            )
-
-            # Create class schedule
-            class_schedule, created = ClassSchedule.objects.get_or_create(
-                course=course,
-                professor=professor,
-                batch=batch,
-                classroom=classroom,
-                time_slot=time_slot
-            )
-
-            if created:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✓ {start_time_str}-{end_time_str}: {course.code} for {batch} "
-                        f"with Prof. {professor.short_name} in {classroom.room_number}"
-                    )
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING(f"↻ Already exists: {course.code} for {batch} at {start_time_str}")
-                )
-
-            return True
-
-        except Course.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"✗ Course not found: {course_code}"))
-        except Batch.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"✗ Batch not found: {batch_year} {batch_branch} {batch_section}"))
-        except User.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"✗ Professor not found with short name: {professor_short_name}"))
-        except Classroom.DoesNotExist:
-            self.stdout.write(self.style.ERROR(f"✗ Classroom not found: {classroom_number}"))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"✗ Error: {e}"))
-
-        return False
-
     def generate_report(self, created_count, error_count, day):
         """Generate report for the day"""
         self.stdout.write("\n" + "=" * 50)
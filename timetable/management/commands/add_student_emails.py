@@ -1,9 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.core.management import call_command
-from users.models import StudentEmail
+from users.provisioning import bulk_provision_student_emails, candidate_student_emails
 
 class Command(BaseCommand):
-    help = 'Generate all student emails and email groups for batches 22,23,24,25'
+    help = 'Generate all student emails for batches 22,23,24,25'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -11,13 +10,25 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what emails would be created without actually creating them'
         )
+        parser.add_argument(
+            '--batches',
+            nargs='+',
+            default=['22', '23', '24', '25'],
+            help='Two-digit batch years to generate (default: 22 23 24 25)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Rows per INSERT statement'
+        )
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         
         # Define the email patterns and ranges
         email_config = {
-            'batches': ['22', '23', '24', '25'],
+            'batches': options['batches'],
             'branches': {
                 'cs': 300,  # CS up to 300
                 'ec': 200,  # EC up to 200  
@@ -26,46 +37,30 @@ class Command(BaseCommand):
             }
         }
         
-        total_emails = 0
-        created_count = 0
-        existing_count = 0
-        
         self.stdout.write("Generating student emails...")
         self.stdout.write("=" * 50)
         
         for batch in email_config['batches']:
-            self.stdout.write(f"\nProcessing Batch 20{batch}:")
-            self.stdout.write("-" * 30)
-            
+            self.stdout.write(f"\nBatch 20{batch}:")
             for branch, max_roll in email_config['branches'].items():
-                branch_count = 0
-                self.stdout.write(f"  {branch.upper()} branch (rolls 1-{max_roll}):")
-                
-                for roll in range(1, max_roll + 1):
-                    # Format roll number with leading zeros (001, 002, ..., 300)
-                    roll_str = f"{roll:03d}"
-                    
-                    # Create email in format: 23bcs101@iiitdmj.ac.in
-                    email = f"{batch}b{branch}{roll_str}@iiitdmj.ac.in"
-                    
-                    total_emails += 1
-                    
-                    if dry_run:
-                        self.stdout.write(f"    [DRY RUN] Would create: {email}")
-                        branch_count += 1
-                    else:
-                        # Check if email already exists
-                        if StudentEmail.objects.filter(email=email).exists():
-                            existing_count += 1
-                            branch_count += 1
-                            continue
-                        
-                        # Create the student email (auto-extracts batch/branch info)
-                        student_email = StudentEmail.objects.create(email=email)
-                        created_count += 1
-                        branch_count += 1
-                
-                self.stdout.write(f"    → Generated {branch_count} emails for {branch.upper()}")
+                self.stdout.write(f"  {branch.upper()} branch (rolls 1-{max_roll})")
+        
+        emails = list(candidate_student_emails(email_config['batches'], email_config['branches']))
+        total_emails = len(emails)
+        
+        if dry_run:
+            for email in emails:
+                self.stdout.write(f"    [DRY RUN] Would create: {email}")
+        else:
+            # One IN query per chunk for existing rows, then bulk_create in one transaction
+            report = bulk_provision_student_emails(emails, batch_size=options['batch_size'])
+            created_count = report['created']
+            existing_count = report['existing']
+            timings = report['timings']
+            self.stdout.write(
+                f"\nTimings: lookup {timings['lookup']:.3f}s, build {timings['build']:.3f}s, "
+                f"insert {timings['insert']:.3f}s, total {timings['total']:.3f}s"
+            )
         
         self.stdout.write("\n" + "=" * 50)
         self.stdout.write("STUDENT EMAILS SUMMARY:")
@@ -81,4 +76,4 @@ class Command(BaseCommand):
             )
             self.stdout.write(
                 self.style.WARNING(f"Skipped {existing_count} existing student emails")
-            )
\ No newline at end of file
+            )
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from timetable.models import TimeSlot
+from timetable.importer import ensure_time_slots
 from datetime import time
 
 class Command(BaseCommand):
@@ -33,12 +34,18 @@ class Command(BaseCommand):
             (time(17, 0), time(18, 0)), # 5:00 PM - 6:00 PM
         ]
 
-        created_count = 0
-        updated_count = 0
+        keys = [(day_code, start_time, end_time) for day_code, _ in days for start_time, end_time in time_slots]
+        existing = set(
+            TimeSlot.objects.filter(day__in=[day_code for day_code, _ in days])
+            .values_list('day', 'start_time', 'end_time')
+        )
 
         self.stdout.write("Populating TimeSlot table...")
         self.stdout.write("=" * 50)
 
+        # One bulk insert for every missing slot instead of a query per slot
+        ensure_time_slots(keys)
+
         for day_code, day_name in days:
             self.stdout.write(f"\n{day_name}:")
             self.stdout.write("-" * 30)
@@ -47,41 +54,23 @@ class Command(BaseCommand):
                 # Create display name for the time slot
                 display_name = f"{day_name} {start_time.strftime('%H:%M')}-{end_time.strftime('%H:%M')}"
                 
-                try:
-                    # Try to get existing time slot or create new one
-                    time_slot, created = TimeSlot.objects.update_or_create(
-                        day=day_code,
-                        start_time=start_time,
-                        end_time=end_time,
-                        defaults={
-                            'day': day_code,
-                            'start_time': start_time,
-                            'end_time': end_time
-                        }
+                if (day_code, start_time, end_time) in existing:
+                    self.stdout.write(
+                        self.style.WARNING(f"  ↻ Exists: {display_name}")
                     )
-
-                    if created:
-                        created_count += 1
-                        self.stdout.write(
-                            self.style.SUCCESS(f"  ✓ Created: {display_name}")
-                        )
-                    else:
-                        updated_count += 1
-                        self.stdout.write(
-                            self.style.WARNING(f"  ↻ Updated: {display_name}")
-                        )
-
-                except Exception as e:
+                else:
                     self.stdout.write(
-                        self.style.ERROR(f"  ✗ Failed: {display_name} - Error: {e}")
+                        self.style.SUCCESS(f"  ✓ Created: {display_name}")
                     )
 
+        created_count = len(set(keys) - existing)
+
         self.stdout.write("\n" + "=" * 50)
         self.stdout.write("TIMESLOT POPULATION SUMMARY:")
         self.stdout.write("=" * 50)
         
         self.stdout.write(f"\nTime Slots Created: {created_count}")
-        self.stdout.write(f"Time Slots Updated: {updated_count}")
+        self.stdout.write(f"Time Slots Already Present: {len(keys) - created_count}")
         self.stdout.write(f"Total Time Slots: {TimeSlot.objects.count()}")
         
         # Show breakdown by day
@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from timetable.benchmarks import load_budgets, run_concurrency_benchmark
+from timetable.seeding import CampusSeeder
+
+from .benchmark_views import SCALE_OPTIONS
+
+
+class Command(BaseCommand):
+    help = 'Measure read throughput on a generated campus with and without concurrent booking writes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per phase')
+        parser.add_argument('--seed', type=int, default=0, help='Dataset and workload seed')
+        parser.add_argument('--output', help='Write the JSON report here')
+        for option in SCALE_OPTIONS:
+            parser.add_argument(
+                f"--{option.replace('_', '-')}", type=int, default=None,
+                help=f'Override the {option} of the dataset in the benchmark budgets file',
+            )
+
+    def handle(self, *args, **options):
+        scale = dict(load_budgets().get('scale', {}))
+        for option in SCALE_OPTIONS:
+            if options[option] is not None:
+                scale[option] = options[option]
+
+        # A throwaway file database configured like production (same OPTIONS)
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write(f"Seeding campus {scale} ...")
+            CampusSeeder(seed=options['seed'], **scale).run()
+            report = run_concurrency_benchmark(
+                options['readers'], options['writers'], options['duration'], options['seed'],
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write('Pragmas: ' + ', '.join(f'{k}={v}' for k, v in report['pragmas'].items()))
+        self.stdout.write(
+            f"{'phase':<20}{'role':<8}{'threads':>8}{'ops/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'locked':>8}"
+        )
+        for phase, roles in report['phases'].items():
+            for role, summary in roles.items():
+                self.stdout.write(
+                    f"{phase:<20}{role:<8}{summary['threads']:>8}{summary['per_second']:>10.1f}"
+                    f"{summary['p50_ms'] or 0:>9.2f}{summary['p95_ms'] or 0:>9.2f}"
+                    f"{summary['locked_errors']:>8}"
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
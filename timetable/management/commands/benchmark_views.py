@@ -0,0 +1,103 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from timetable.benchmarks import (
+    BUDGETS_PATH, build_report, check_budgets, load_budgets, run_benchmarks,
+)
+
+SCALE_OPTIONS = ('buildings', 'rooms', 'batches', 'professors', 'students', 'bookings_per_day', 'weeks')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the main views on a generated campus and compare them to checked-in budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budgets', default=str(BUDGETS_PATH), help='Budget JSON file')
+        parser.add_argument('--output', help='Write the JSON report here')
+        parser.add_argument('--iterations', type=int, default=20, help='Measured requests per view')
+        parser.add_argument('--warmup', type=int, default=2, help='Unmeasured requests per view first')
+        parser.add_argument('--seed', type=int, default=None, help='Dataset seed (default: from budgets)')
+        for option in SCALE_OPTIONS:
+            parser.add_argument(
+                f"--{option.replace('_', '-')}", type=int, default=None,
+                help=f'Override the {option} of the dataset in the budgets file',
+            )
+        parser.add_argument(
+            '--no-latency',
+            action='store_true',
+            help='Only enforce query budgets (for shared or slow machines)'
+        )
+        parser.add_argument(
+            '--latency-tolerance',
+            type=float,
+            default=1.0,
+            help='Multiply every p95 budget by this factor'
+        )
+        parser.add_argument(
+            '--update-budgets',
+            action='store_true',
+            help='Rewrite the budgets from this run (exact query counts, p95 x 1.5)'
+        )
+
+    def handle(self, *args, **options):
+        budgets = load_budgets(options['budgets'])
+        scale = dict(budgets.get('scale', {}))
+        overridden = {option for option in SCALE_OPTIONS if options[option] is not None}
+        for option in overridden:
+            scale[option] = options[option]
+        seed = options['seed'] if options['seed'] is not None else budgets.get('seed', 0)
+        if overridden:
+            self.stderr.write(self.style.WARNING(
+                'Dataset differs from the budgets file; latency budgets may not apply'
+            ))
+
+        # A throwaway database, created and destroyed the same way the test runner does
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            self.stdout.write(f"Seeding campus {scale} ...")
+            run = run_benchmarks(scale, seed, options['iterations'], options['warmup'])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        violations = check_budgets(
+            run['results'], budgets,
+            check_latency=not options['no_latency'],
+            latency_tolerance=options['latency_tolerance'],
+        )
+        report = build_report(scale, seed, options['iterations'], run, violations)
+
+        self.stdout.write(f"{'view':<28}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'queries':>9}")
+        for name, result in run['results'].items():
+            self.stdout.write(
+                f"{name:<28}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                f"{result['max_ms']:>10.1f}{result['queries']:>9}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        if options['update_budgets']:
+            budgets['views'] = {
+                name: {
+                    'max_queries': result['queries'],
+                    'p95_ms': round(result['p95_ms'] * 1.5, 1),
+                }
+                for name, result in run['results'].items()
+            }
+            with open(options['budgets'], 'w') as handle:
+                json.dump(budgets, handle, indent=2)
+                handle.write('\n')
+            self.stdout.write(f"Budgets updated in {options['budgets']}")
+            return
+
+        if violations:
+            raise CommandError('Performance budget exceeded:\n  ' + '\n  '.join(violations))
+        self.stdout.write(self.style.SUCCESS('All views within budget'))
@@ -0,0 +1,124 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.conf import settings
+
+from timetable.importer import ScheduleImporter, apply_diff, diff_schedule, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Import ClassSchedule rows from a CSV, JSON or JSON-lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str, help='Schedule file to import')
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json', 'jsonl'],
+            help='File format (defaults to the file extension)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without writing anything'
+        )
+        parser.add_argument(
+            '--skip-invalid',
+            action='store_true',
+            help='Import the valid rows even if some rows fail validation'
+        )
+        parser.add_argument(
+            '--sync',
+            action='store_true',
+            help='Make the days in the file match it exactly: insert, update and delete only what differs'
+        )
+        parser.add_argument(
+            '--days',
+            nargs='+',
+            default=[],
+            help='With --sync, also clear these days if the file has no rows for them'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        queries_before = len(connection.queries) if settings.DEBUG else None
+
+        self.stdout.write(f"Importing schedule from {options['path']}...")
+        self.stdout.write("=" * 50)
+
+        try:
+            rows = read_rows(options['path'], options['format'])
+            importer = ScheduleImporter(rows)
+            importer.resolve()
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read schedule: {e}")
+
+        # A sync replaces the covered days, so only the file itself can clash
+        importer.validate(existing=[] if options['sync'] else None)
+
+        for message in importer.errors:
+            self.stdout.write(self.style.ERROR(f"✗ {message}"))
+
+        if importer.errors and not options['skip_invalid']:
+            raise CommandError("Validation failed; nothing was written (use --skip-invalid to import valid rows)")
+
+        if importer.errors:
+            importer.drop_invalid()
+
+        if options['sync']:
+            self.sync(importer, options)
+            return
+
+        self.stdout.write(f"Classes to create: {len(importer.planned)}")
+        self.stdout.write(f"Already present:   {importer.skipped}")
+        self.stdout.write(f"Errors:            {len(importer.errors)}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("DRY RUN: nothing was written"))
+            return
+
+        created = importer.write()
+        elapsed = time.perf_counter() - started
+        summary = f"✅ Created {created} classes in {elapsed:.2f}s"
+        if queries_before is not None:
+            summary += f" ({len(connection.queries) - queries_before} queries)"
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def sync(self, importer, options):
+        days = {planned.day for planned in importer.planned}
+        days.update(day.lower() for day in options['days'])
+        diff = diff_schedule(importer.planned, days)
+
+        self.stdout.write(f"\nSync plan for {', '.join(diff.days)}:")
+        self.stdout.write("-" * 50)
+        for planned in diff.inserts:
+            self.stdout.write(self.style.SUCCESS(
+                f"+ {planned.day} {planned.start_time:%H:%M}-{planned.end_time:%H:%M} "
+                f"{planned.course.code} {planned.batch.name} in {planned.classroom.room_number}"
+            ))
+        for schedule, planned in diff.updates:
+            self.stdout.write(self.style.WARNING(
+                f"~ {planned.day} {planned.start_time:%H:%M}-{planned.end_time:%H:%M} {planned.batch.name}: "
+                f"{schedule.course.code}/{schedule.professor.short_name}/{schedule.classroom.room_number} -> "
+                f"{planned.course.code}/{planned.professor.short_name}/{planned.classroom.room_number}"
+            ))
+        for schedule in diff.deletes:
+            slot = schedule.time_slot
+            self.stdout.write(self.style.ERROR(
+                f"- {slot.day} {slot.start_time:%H:%M}-{slot.end_time:%H:%M} "
+                f"{schedule.course.code} {schedule.batch.name} in {schedule.classroom.room_number}"
+            ))
+        self.stdout.write(
+            f"\nInsert: {len(diff.inserts)}  Update: {len(diff.updates)}  "
+            f"Delete: {len(diff.deletes)}  Unchanged: {diff.unchanged}"
+        )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING("DRY RUN: nothing was written"))
+            return
+        if not diff:
+            self.stdout.write(self.style.SUCCESS("✅ Timetable already up to date"))
+            return
+
+        apply_diff(diff)
+        self.stdout.write(self.style.SUCCESS("✅ Sync applied"))
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from timetable.seeding import SEED_PASSWORD, CampusSeeder
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic campus (rooms, people, timetable, bookings) for load and scale testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data')
+        parser.add_argument('--buildings', type=int, default=4, help='Number of buildings')
+        parser.add_argument('--rooms', type=int, default=100, help='Total classrooms across all buildings')
+        parser.add_argument('--batches', type=int, default=48, help='Number of batches (16 per cohort)')
+        parser.add_argument('--professors', type=int, default=150, help='Number of professors')
+        parser.add_argument('--students', type=int, default=5000, help='Number of students')
+        parser.add_argument('--bookings-per-day', type=int, default=200, help='Bookings attempted per day')
+        parser.add_argument('--weeks', type=int, default=8, help='Weeks of booking history before today')
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete previously seeded data first'
+        )
+        parser.add_argument(
+            '--reset-only',
+            action='store_true',
+            help='Delete previously seeded data and stop'
+        )
+
+    def handle(self, *args, **options):
+        if options['reset'] or options['reset_only']:
+            deleted = CampusSeeder.reset()
+            self.stdout.write('Removed seeded ' + ', '.join(f'{name}: {count}' for name, count in deleted.items()))
+            if options['reset_only']:
+                return
+
+        seeder = CampusSeeder(
+            seed=options['seed'],
+            buildings=options['buildings'],
+            rooms=options['rooms'],
+            batches=options['batches'],
+            professors=options['professors'],
+            students=options['students'],
+            bookings_per_day=options['bookings_per_day'],
+            weeks=options['weeks'],
+        )
+        report = seeder.run()
+
+        for name, count in report['counts'].items():
+            self.stdout.write(f"  {name}: {count}")
+        timings = ', '.join(f'{name} {seconds:.2f}s' for name, seconds in report['timings'].items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded campus ({timings})"))
+        self.stdout.write(f"Seeded accounts share the password '{SEED_PASSWORD}'")
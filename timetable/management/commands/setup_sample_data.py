@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from users.models import User, Department, Batch, StudentProfile, ProfessorProfile
-from timetable.models import Course, Classroom, TimeSlot, ClassSchedule
+from timetable.models import Course, Classroom, ClassSchedule
+from timetable.importer import ensure_time_slots
 from datetime import time
 
 class Command(BaseCommand):
@@ -96,16 +97,14 @@ class Command(BaseCommand):
             ('10:00', '11:00', 'tuesday'),
         ]
         
-        for start, end, day in time_slots:
-            TimeSlot.objects.get_or_create(
-                start_time=start,
-                end_time=end,
-                day=day
-            )
+        slots = ensure_time_slots(
+            (day, time.fromisoformat(start), time.fromisoformat(end))
+            for start, end, day in time_slots
+        )
         
         # Create Class Schedules
-        m9_slot = TimeSlot.objects.get(day='monday', start_time='09:00')
-        m10_slot = TimeSlot.objects.get(day='monday', start_time='10:00')
+        m9_slot = slots[('monday', time(9, 0), time(10, 0))]
+        m10_slot = slots[('monday', time(10, 0), time(11, 0))]
         
         ClassSchedule.objects.get_or_create(
             course=ds_course,
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0004_classroombooking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classroombooking',
+            index=models.Index(fields=['classroom', 'date', 'status'], name='booking_room_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classroombooking',
+            index=models.Index(fields=['date', 'status'], name='booking_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classroombooking',
+            index=models.Index(fields=['professor', '-date', '-start_time'], name='booking_professor_date_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def fill_minutes_of_week(apps, schema_editor):
+    ClassSchedule = apps.get_model('timetable', 'ClassSchedule')
+
+    def minute_of_week(day, value):
+        return WEEKDAYS.index(day) * 24 * 60 + value.hour * 60 + value.minute
+
+    schedules = list(ClassSchedule.objects.select_related('time_slot'))
+    for schedule in schedules:
+        slot = schedule.time_slot
+        schedule.start_minute_of_week = minute_of_week(slot.day, slot.start_time)
+        schedule.end_minute_of_week = minute_of_week(slot.day, slot.end_time)
+    ClassSchedule.objects.bulk_update(
+        schedules, ['start_minute_of_week', 'end_minute_of_week'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0005_lookup_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='classschedule',
+            options={'ordering': ['start_minute_of_week']},
+        ),
+        migrations.AddField(
+            model_name='classschedule',
+            name='end_minute_of_week',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='classschedule',
+            name='start_minute_of_week',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_minutes_of_week, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['classroom', 'start_minute_of_week'], name='schedule_room_week_minute_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['professor', 'start_minute_of_week'], name='schedule_prof_week_minute_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['batch', 'start_minute_of_week'], name='schedule_batch_week_minute_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='classschedule',
+            index=models.Index(fields=['start_minute_of_week'], name='schedule_week_minute_idx'),
+        ),
+    ]
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:41
+
+import logging
+from collections import defaultdict
+
+from django.db import migrations, models
+
+logger = logging.getLogger('campusconnect.migrations')
+
+
+def merge_duplicate_slots(apps, schema_editor):
+    """Keep the oldest TimeSlot per (day, start, end) and move schedules onto it.
+
+    A moved schedule identical to one already in the kept slot (same
+    course, professor, batch and room) is the same class entered twice;
+    it is deleted and logged. Any other clash on the classroom or batch
+    unique_together is a real conflict: the migration stops and lists the
+    schedules involved, without changing anything, so they can be fixed.
+    """
+    TimeSlot = apps.get_model('timetable', 'TimeSlot')
+    ClassSchedule = apps.get_model('timetable', 'ClassSchedule')
+
+    keepers = {}
+    replacement = {}  # duplicate slot id -> kept slot id
+    for slot_id, day, start_time, end_time in TimeSlot.objects.order_by('id').values_list(
+        'id', 'day', 'start_time', 'end_time'
+    ):
+        key = (day, start_time, end_time)
+        if key in keepers:
+            replacement[slot_id] = keepers[key]
+        else:
+            keepers[key] = slot_id
+    if not replacement:
+        return
+
+    fields = ('id', 'course_id', 'professor_id', 'batch_id', 'classroom_id', 'time_slot_id')
+    rooms_taken = {}  # (classroom_id, slot_id) -> schedule row
+    batches_taken = {}  # (batch_id, slot_id) -> schedule row
+    for row in ClassSchedule.objects.filter(time_slot_id__in=set(replacement.values())).values_list(*fields):
+        rooms_taken[row[4], row[5]] = row
+        batches_taken[row[3], row[5]] = row
+
+    moves = defaultdict(list)
+    duplicates = []
+    clashes = []
+    for row in ClassSchedule.objects.filter(time_slot_id__in=replacement).order_by('id').values_list(*fields):
+        schedule_id, course_id, professor_id, batch_id, classroom_id, slot_id = row
+        target = replacement[slot_id]
+        existing = {rooms_taken.get((classroom_id, target)), batches_taken.get((batch_id, target))} - {None}
+        if not existing:
+            kept = (schedule_id, course_id, professor_id, batch_id, classroom_id, target)
+            rooms_taken[classroom_id, target] = kept
+            batches_taken[batch_id, target] = kept
+            moves[target].append(schedule_id)
+        elif all(other[1:5] == row[1:5] for other in existing):
+            duplicates.append((row, next(iter(existing))[0]))
+        else:
+            clashes.append((row, sorted(other[0] for other in existing)))
+
+    if clashes:
+        report = '\n'.join(
+            f'  schedule {row[0]} (course={row[1]}, professor={row[2]}, batch={row[3]}, '
+            f'classroom={row[4]}, slot={row[5]} -> {replacement[row[5]]}) clashes with schedule(s) {others}'
+            for row, others in clashes
+        )
+        raise RuntimeError(
+            "Cannot merge duplicate time slots; these classes would share a room or batch "
+            f"in the merged slot:\n{report}\nMove or delete them, then run migrate again."
+        )
+
+    for row, kept_id in duplicates:
+        logger.warning(
+            'timeslot_merge_dropped_duplicate schedule=%s course=%s professor=%s batch=%s classroom=%s '
+            'slot=%s same_as=%s', *row, kept_id,
+        )
+    ClassSchedule.objects.filter(id__in=[row[0] for row, _ in duplicates]).delete()
+    for target, schedule_ids in moves.items():
+        ClassSchedule.objects.filter(id__in=schedule_ids).update(time_slot_id=target)
+    TimeSlot.objects.filter(id__in=replacement).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0006_schedule_minute_of_week'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_slots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='timeslot',
+            constraint=models.UniqueConstraint(fields=('day', 'start_time', 'end_time'), name='timeslot_unique_day_time'),
+        ),
+    ]
@@ -18,6 +18,26 @@ class Classroom(models.Model):
     def __str__(self):
         return f"{self.building} - {self.room_number}"
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_week(day, value):
+    """Minutes since Monday 00:00 for the time ``value`` on the named weekday"""
+    return WEEKDAYS.index(day) * MINUTES_PER_DAY + value.hour * 60 + value.minute
+
+
+def day_minute_range(day):
+    """Half-open (start, end) minute-of-week range covering the whole weekday"""
+    start = WEEKDAYS.index(day) * MINUTES_PER_DAY
+    return start, start + MINUTES_PER_DAY
+
+
+def time_from_minute_of_week(minute):
+    minute %= MINUTES_PER_DAY
+    return datetime.time(minute // 60, minute % 60)
+
+
 class TimeSlot(models.Model):
     DAY_CHOICES = (
         ('monday', 'Monday'),
@@ -34,10 +54,26 @@ class TimeSlot(models.Model):
 
     class Meta:
         ordering = ['day', 'start_time']
+        # One canonical row per slot; its index also serves (day, start, end) lookups
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'start_time', 'end_time'], name='timeslot_unique_day_time'),
+        ]
 
     def __str__(self):
         return f"{self.day.title()} {self.start_time}-{self.end_time}"
 
+    @property
+    def minutes_of_week(self):
+        return minute_of_week(self.day, self.start_time), minute_of_week(self.day, self.end_time)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the copies on ClassSchedule in step when a slot is moved
+        start, end = self.minutes_of_week
+        self.classschedule_set.exclude(
+            start_minute_of_week=start, end_minute_of_week=end
+        ).update(start_minute_of_week=start, end_minute_of_week=end)
+
 class Batch(models.Model):
     BRANCH_CHOICES = (
         ('cs', 'Computer Science'),
@@ -88,16 +124,36 @@ class ClassSchedule(models.Model):
     batch = models.ForeignKey(Batch, on_delete=models.CASCADE)
     classroom = models.ForeignKey(Classroom, on_delete=models.CASCADE)
     time_slot = models.ForeignKey(TimeSlot, on_delete=models.CASCADE)
+    # Copied from time_slot (see minute_of_week) so day/time filters and
+    # weekday ordering are integer range scans on this table alone
+    start_minute_of_week = models.PositiveIntegerField(default=0, editable=False)
+    end_minute_of_week = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = [
             ['classroom', 'time_slot'],
             ['batch', 'time_slot'],
         ]
-        ordering = ['time_slot__day', 'time_slot__start_time']
+        ordering = ['start_minute_of_week']
+        # Minute of week encodes the day and time, so these serve the
+        # (room | professor | batch, day, start/end) lookups without a join
+        indexes = [
+            models.Index(fields=['classroom', 'start_minute_of_week'], name='schedule_room_week_minute_idx'),
+            models.Index(fields=['professor', 'start_minute_of_week'], name='schedule_prof_week_minute_idx'),
+            models.Index(fields=['batch', 'start_minute_of_week'], name='schedule_batch_week_minute_idx'),
+            models.Index(fields=['start_minute_of_week'], name='schedule_week_minute_idx'),
+        ]
 
     def __str__(self):
         return f"{self.course.code} - {self.batch.name} - {self.time_slot}"
+
+    def sync_minutes_of_week(self):
+        """Copy the slot's position in the week; bulk_create callers must call this"""
+        self.start_minute_of_week, self.end_minute_of_week = self.time_slot.minutes_of_week
+
+    def save(self, *args, **kwargs):
+        self.sync_minutes_of_week()
+        super().save(*args, **kwargs)
     
 
     # In your timetable/models.py, add:
@@ -129,6 +185,11 @@ class ClassroomBooking(models.Model):
     class Meta:
         ordering = ['date', 'start_time']
         unique_together = ['classroom', 'date', 'start_time', 'end_time']
+        indexes = [
+            models.Index(fields=['classroom', 'date', 'status'], name='booking_room_date_status_idx'),
+            models.Index(fields=['date', 'status'], name='booking_date_status_idx'),
+            models.Index(fields=['professor', '-date', '-start_time'], name='booking_professor_date_idx'),
+        ]
     
     def __str__(self):
         return f"{self.course_code} - {self.classroom.room_number} on {self.date}"
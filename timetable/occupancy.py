@@ -0,0 +1,103 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
+from django.utils import timezone
+
+from .models import ClassroomBooking, ClassSchedule, day_minute_range
+from .reference import get_reference_data
+
+
+class BookedSession:
+    """Wrap an approved ClassroomBooking so templates can treat it like a ClassSchedule"""
+
+    is_booking = True
+
+    def __init__(self, booking):
+        self.booking = booking
+        self.classroom_id = booking.classroom_id
+        self.course = SimpleNamespace(code=booking.course_code, name=booking.course_name)
+        self.professor = booking.professor
+        self.batch = booking.batch
+        self.time_slot = SimpleNamespace(start_time=booking.start_time, end_time=booking.end_time)
+
+
+def _start_time(session):
+    return session.time_slot.start_time
+
+
+def get_sessions_by_classroom(day, on_date=None):
+    """Return {classroom_id: [sessions sorted by start time]} for one day.
+
+    Regular classes come from ClassSchedule for the weekday, and approved
+    bookings for ``on_date`` are merged in as BookedSession objects.
+    Always costs two queries regardless of the number of classrooms.
+    """
+    sessions_by_room = defaultdict(list)
+
+    day_start, day_end = day_minute_range(day)
+    schedules = ClassSchedule.objects.filter(
+        start_minute_of_week__gte=day_start, start_minute_of_week__lt=day_end
+    ).select_related('course', 'professor', 'time_slot', 'batch')
+    for schedule in schedules:
+        sessions_by_room[schedule.classroom_id].append(schedule)
+
+    if on_date is not None:
+        bookings = ClassroomBooking.objects.filter(
+            date=on_date, status='approved'
+        ).select_related('professor', 'batch')
+        for booking in bookings:
+            sessions_by_room[booking.classroom_id].append(BookedSession(booking))
+
+    for sessions in sessions_by_room.values():
+        sessions.sort(key=_start_time)
+    return sessions_by_room
+
+
+def room_status(sessions, current_time):
+    """Classify one room's sorted sessions as ongoing/scheduled/completed/free.
+
+    Returns a (status, current_class, next_class) tuple.
+    """
+    ongoing = None
+    upcoming = []
+    has_past = False
+
+    for session in sessions:
+        slot = session.time_slot
+        if slot.start_time <= current_time <= slot.end_time:
+            if ongoing is None:
+                ongoing = session
+        elif slot.start_time > current_time:
+            upcoming.append(session)
+        else:
+            has_past = True
+
+    if ongoing is not None:
+        return 'ongoing', ongoing, upcoming[0] if upcoming else None
+    if upcoming:
+        return 'scheduled', upcoming[0], upcoming[1] if len(upcoming) > 1 else None
+    if has_past:
+        return 'completed', None, None
+    return 'free', None, None
+
+
+def get_classroom_occupancy(now=None):
+    """Compute the status of every classroom at ``now`` in a constant number of queries"""
+    now = timezone.localtime(now or timezone.now())
+    current_day = now.strftime('%A').lower()
+    current_time = now.time()
+
+    sessions_by_room = get_sessions_by_classroom(current_day, now.date())
+
+    classroom_data = []
+    for classroom in get_reference_data().classrooms:
+        status, current_class, next_class = room_status(
+            sessions_by_room.get(classroom.id, []), current_time
+        )
+        classroom_data.append({
+            'classroom': classroom,
+            'status': status,
+            'current_class': current_class,
+            'next_class': next_class,
+        })
+    return classroom_data
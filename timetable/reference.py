@@ -0,0 +1,112 @@
+import threading
+from types import MappingProxyType
+
+from .cache import KEY_PREFIX, _bump_version, _get_version
+from .models import Batch, Classroom, Course, TimeSlot
+
+# Bumped (after commit) whenever a Classroom, TimeSlot, Course or Batch row
+# changes; every worker compares its snapshot's version against it.
+VERSION_KEY = f'{KEY_PREFIX}:version:reference'
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+class ReferenceSnapshot:
+    """Immutable copy of the small lookup tables with dicts for every common key.
+
+    The model instances are shared between threads and requests: read
+    them, never modify them.
+    """
+
+    def __init__(self, version, classrooms, time_slots, courses, batches):
+        self.version = version
+        self.classrooms = tuple(sorted(classrooms, key=lambda room: (room.building, room.room_number)))
+        self.classrooms_by_id = MappingProxyType({room.id: room for room in self.classrooms})
+        self.classrooms_by_number = MappingProxyType({room.room_number: room for room in self.classrooms})
+
+        self.time_slots = tuple(sorted(time_slots, key=lambda slot: slot.minutes_of_week))
+        self.time_slots_by_id = MappingProxyType({slot.id: slot for slot in self.time_slots})
+        self.slot_times = tuple(sorted({(slot.start_time, slot.end_time) for slot in self.time_slots}))
+
+        self.courses = tuple(sorted(courses, key=lambda course: course.code))
+        self.courses_by_id = MappingProxyType({course.id: course for course in self.courses})
+        self.courses_by_code = MappingProxyType({course.code: course for course in self.courses})
+
+        self.batches = tuple(batches)  # Batch.Meta.ordering
+        self.batches_by_id = MappingProxyType({batch.id: batch for batch in self.batches})
+        self.batches_by_key = MappingProxyType({
+            (batch.batch_year, batch.branch, batch.section): batch for batch in self.batches
+        })
+
+    @classmethod
+    def load(cls, version):
+        """Read the four tables (four queries)"""
+        return cls(
+            version,
+            Classroom.objects.all(),
+            TimeSlot.objects.all(),
+            Course.objects.all(),
+            Batch.objects.all(),
+        )
+
+    def batch_ids(self, batch_year, branch):
+        """Ids of every section of a year and branch, as a student's timetable needs.
+
+        Profile values are normalised here (``'CS '`` matches ``cs``) so
+        every caller resolves a student to the same batches.
+        """
+        batch_year, branch = batch_year.strip(), branch.strip().lower()
+        return [
+            batch.id for batch in self.batches
+            if batch.batch_year == batch_year and batch.branch == branch
+        ]
+
+    def attach(self, objects, *fields):
+        """Fill the ``fields`` foreign keys of ``objects`` from the snapshot.
+
+        A replacement for select_related on reference tables, e.g.
+        ``attach(bookings, 'classroom', 'batch')``. Keys the snapshot does
+        not know (rows created since it was taken) are left to load lazily.
+        """
+        lookups = {
+            'classroom': self.classrooms_by_id,
+            'time_slot': self.time_slots_by_id,
+            'course': self.courses_by_id,
+            'batch': self.batches_by_id,
+        }
+        for obj in objects:
+            for field in fields:
+                related = lookups[field].get(getattr(obj, f'{field}_id'))
+                if related is not None:
+                    setattr(obj, field, related)
+        return objects
+
+
+def get_reference_data():
+    """The current ReferenceSnapshot, rebuilt only when the shared version moved.
+
+    Costs one cache read per call once warm, and four queries after a
+    change anywhere in the deployment.
+    """
+    global _snapshot
+    version = _get_version(VERSION_KEY)
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+    with _lock:
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = ReferenceSnapshot.load(version)
+        return _snapshot
+
+
+def forget_reference_data():
+    """Drop this process's snapshot; the next get_reference_data() reloads it"""
+    global _snapshot
+    _snapshot = None
+
+
+def invalidate_reference_data():
+    """Make every worker reload its snapshot, e.g. after bulk writes that skip signals"""
+    forget_reference_data()
+    _bump_version(VERSION_KEY)
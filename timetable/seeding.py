@@ -0,0 +1,303 @@
+import random
+import time as _time
+from datetime import time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import StudentProfile, User
+from .availability import minute_range_mask
+from .cache import invalidate_all_timetables
+from .reference import forget_reference_data, invalidate_reference_data
+from .importer import ensure_time_slots
+from .models import Batch, Classroom, ClassroomBooking, ClassSchedule, Course
+
+# Everything generated here carries one of these markers so it can be told
+# apart from real data and removed again with CampusSeeder.reset()
+SEED_BUILDING_PREFIX = 'Seed Block'
+SEED_COURSE_PREFIX = 'SEED'
+SEED_BATCH_PREFIX = 'S'
+SEED_EMAIL_DOMAIN = 'seed.campusconnect.test'
+SEED_PASSWORD = 'seed-password'
+
+TEACHING_DAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']
+TEACHING_HOURS = range(9, 17)  # one-hour lectures starting 09:00 ... 16:00
+COURSES_PER_BATCH = 5
+LECTURES_PER_COURSE = 3
+BOOKING_FIRST_HOUR = 8
+BOOKING_LAST_HOUR = 20
+# Most history is settled; bookings from today on are mostly still pending
+PAST_STATUS_WEIGHTS = {'approved': 75, 'rejected': 12, 'cancelled': 8, 'pending': 5}
+FUTURE_STATUS_WEIGHTS = {'pending': 60, 'approved': 35, 'cancelled': 5}
+INSERT_BATCH_SIZE = 1000
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
+
+
+class CampusSeeder:
+    """Generate a synthetic campus of a given size, deterministically from ``seed``.
+
+    The timetable is built greedily so that no batch, professor or
+    classroom is double-booked, and bookings are placed only into gaps left
+    by regular classes and earlier bookings of the same room and date.
+    Rows are bulk inserted inside one transaction.
+    """
+
+    def __init__(self, seed=0, buildings=4, rooms=100, batches=48, professors=150,
+                 students=5000, bookings_per_day=200, weeks=8, today=None):
+        self.rng = random.Random(seed)
+        self.buildings = buildings
+        self.rooms = rooms
+        self.batches = batches
+        self.professors = professors
+        self.students = students
+        self.bookings_per_day = bookings_per_day
+        self.weeks = weeks
+        self.today = today or timezone.localdate()
+        self.timings = {}
+        self.counts = {}
+
+    @classmethod
+    def reset(cls):
+        """Delete every seeded row; schedules and bookings go with their rooms/batches"""
+        with transaction.atomic():
+            deleted = {
+                'classrooms': Classroom.objects.filter(building__startswith=SEED_BUILDING_PREFIX).delete()[0],
+                'batches': Batch.objects.filter(batch_year__startswith=SEED_BATCH_PREFIX).delete()[0],
+                'courses': Course.objects.filter(code__startswith=SEED_COURSE_PREFIX).delete()[0],
+                'users': User.objects.filter(email__endswith='@' + SEED_EMAIL_DOMAIN).delete()[0],
+            }
+        forget_reference_data()
+        transaction.on_commit(invalidate_all_timetables)
+        transaction.on_commit(invalidate_reference_data)
+        return deleted
+
+    def _timed(self, name, func):
+        started = _time.perf_counter()
+        result = func()
+        self.timings[name] = _time.perf_counter() - started
+        return result
+
+    def run(self):
+        """Write the campus and return {'counts': {...}, 'timings': {...}}"""
+        with transaction.atomic():
+            classrooms = self._timed('classrooms', self.create_classrooms)
+            professors = self._timed('professors', self.create_professors)
+            batches = self._timed('batches', self.create_batches)
+            self._timed('students', lambda: self.create_students(batches))
+            schedules = self._timed('timetable', lambda: self.create_timetable(classrooms, professors, batches))
+            self._timed('bookings', lambda: self.create_bookings(classrooms, professors, batches, schedules))
+        forget_reference_data()
+        transaction.on_commit(invalidate_all_timetables)
+        transaction.on_commit(invalidate_reference_data)
+        return {'counts': self.counts, 'timings': self.timings}
+
+    def create_classrooms(self):
+        per_building = -(-self.rooms // self.buildings)  # ceil division
+        classrooms = []
+        for number in range(self.rooms):
+            building, room = divmod(number, per_building)
+            floor = room // 10 + 1
+            classrooms.append(Classroom(
+                room_number=f'SB{building + 1}-{floor}{room % 10:02d}',
+                building=f'{SEED_BUILDING_PREFIX} {building + 1}',
+                capacity=self.rng.choice([40, 60, 60, 80, 120, 150]),
+            ))
+        Classroom.objects.bulk_create(classrooms, batch_size=INSERT_BATCH_SIZE)
+        self.counts['classrooms'] = len(classrooms)
+        return list(Classroom.objects.filter(building__startswith=SEED_BUILDING_PREFIX).order_by('id'))
+
+    def _bulk_users(self, users):
+        User.objects.bulk_create(users, batch_size=INSERT_BATCH_SIZE)
+        emails = [user.email for user in users]
+        by_email = {}
+        for start in range(0, len(emails), 900):
+            for user in User.objects.filter(email__in=emails[start:start + 900]):
+                by_email[user.email] = user
+        return [by_email[email] for email in emails]
+
+    def create_professors(self):
+        # Hashing is deliberately slow, so every seeded account shares one hash
+        password = make_password(SEED_PASSWORD)
+        professors = self._bulk_users([
+            User(
+                username=f'seed.prof{number:04d}@{SEED_EMAIL_DOMAIN}',
+                email=f'seed.prof{number:04d}@{SEED_EMAIL_DOMAIN}',
+                first_name='Professor',
+                last_name=f'{number:04d}',
+                role='professor',
+                short_name=f'SP{number:04d}',
+                password=password,
+            )
+            for number in range(self.professors)
+        ])
+        self.counts['professors'] = len(professors)
+        return professors
+
+    def create_batches(self):
+        sections = [code for code, _ in Batch.SECTION_CHOICES]
+        branches = [code for code, _ in Batch.BRANCH_CHOICES]
+        per_cohort = len(sections) * len(branches)
+        batches = []
+        for number in range(self.batches):
+            cohort, rest = divmod(number, per_cohort)
+            branch, section = divmod(rest, len(sections))
+            batches.append(Batch(
+                name=f'Seed {branches[branch].upper()} {sections[section]} ({SEED_BATCH_PREFIX}{cohort:02d})',
+                batch_year=f'{SEED_BATCH_PREFIX}{cohort:02d}',
+                branch=branches[branch],
+                section=sections[section],
+            ))
+        Batch.objects.bulk_create(batches, batch_size=INSERT_BATCH_SIZE)
+        self.counts['batches'] = len(batches)
+        return list(Batch.objects.filter(batch_year__startswith=SEED_BATCH_PREFIX).order_by('id'))
+
+    def create_students(self, batches):
+        password = make_password(SEED_PASSWORD)
+        assigned = [batches[number % len(batches)] for number in range(self.students)] if batches else []
+        students = self._bulk_users([
+            User(
+                username=f'seed.student{number:06d}@{SEED_EMAIL_DOMAIN}',
+                email=f'seed.student{number:06d}@{SEED_EMAIL_DOMAIN}',
+                first_name='Student',
+                last_name=f'{number:06d}',
+                role='student',
+                email_verified=True,
+                password=password,
+            )
+            for number in range(len(assigned))
+        ])
+        StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=student,
+                roll_number=f'{number:06d}',
+                batch=batch.batch_year,
+                branch=batch.branch,
+                section=batch.section,
+            )
+            for number, (student, batch) in enumerate(zip(students, assigned))
+        ], batch_size=INSERT_BATCH_SIZE)
+        self.counts['students'] = len(students)
+
+    def create_timetable(self, classrooms, professors, batches):
+        """Place COURSES_PER_BATCH x LECTURES_PER_COURSE lectures per batch without clashes"""
+        slots = [(day, hour) for day in TEACHING_DAYS for hour in TEACHING_HOURS]
+        free_rooms = {slot: list(classrooms) for slot in slots}
+        busy_professors = {slot: set() for slot in slots}
+
+        courses = []
+        planned = []  # (course_index, professor, batch, classroom, (day, hour))
+        for batch in batches:
+            busy_batch = set()
+            for number in range(COURSES_PER_BATCH):
+                if not professors:
+                    break
+                courses.append(Course(
+                    code=f'{SEED_COURSE_PREFIX}{batch.batch_year}{batch.branch}{batch.section}{number}',
+                    name=f'Seed course {number + 1} for {batch.name}',
+                    credits=self.rng.choice([2, 3, 3, 4]),
+                ))
+                professor = self.rng.choice(professors)
+                candidates = slots[:]
+                self.rng.shuffle(candidates)
+                placed = 0
+                for slot in candidates:
+                    if placed == LECTURES_PER_COURSE:
+                        break
+                    if slot in busy_batch or professor.id in busy_professors[slot] or not free_rooms[slot]:
+                        continue
+                    rooms = free_rooms[slot]
+                    classroom = rooms.pop(self.rng.randrange(len(rooms)))
+                    busy_batch.add(slot)
+                    busy_professors[slot].add(professor.id)
+                    planned.append((len(courses) - 1, professor, batch, classroom, slot))
+                    placed += 1
+
+        Course.objects.bulk_create(courses, batch_size=INSERT_BATCH_SIZE)
+        course_ids = dict(
+            Course.objects.filter(code__startswith=SEED_COURSE_PREFIX).values_list('code', 'id')
+        )
+        time_slots = ensure_time_slots(
+            {(day, time(hour), time(hour + 1)) for _, _, _, _, (day, hour) in planned}
+        )
+
+        schedules = []
+        for course_index, professor, batch, classroom, (day, hour) in planned:
+            schedule = ClassSchedule(
+                course_id=course_ids[courses[course_index].code],
+                professor=professor,
+                batch=batch,
+                classroom=classroom,
+                time_slot=time_slots[(day, time(hour), time(hour + 1))],
+            )
+            schedule.sync_minutes_of_week()
+            schedules.append(schedule)
+        ClassSchedule.objects.bulk_create(schedules, batch_size=INSERT_BATCH_SIZE)
+        self.counts['courses'] = len(courses)
+        self.counts['class_schedules'] = len(schedules)
+        return schedules
+
+    def create_bookings(self, classrooms, professors, batches, schedules):
+        """Fill ``weeks`` of history up to today plus the coming week with bookings"""
+        if not classrooms or not professors:
+            self.counts['bookings'] = 0
+            return
+
+        class_masks = {}  # (weekday name, classroom id) -> occupied buckets
+        for schedule in schedules:
+            slot = schedule.time_slot
+            key = (slot.day, schedule.classroom_id)
+            class_masks[key] = class_masks.get(key, 0) | minute_range_mask(
+                _minutes(slot.start_time), _minutes(slot.end_time)
+            )
+
+        time_values = {
+            minute: time(minute // 60, minute % 60)
+            for minute in range(BOOKING_FIRST_HOUR * 60, BOOKING_LAST_HOUR * 60 + 1, 30)
+        }
+        classroom_ids = [classroom.id for classroom in classrooms]
+        professor_ids = [professor.id for professor in professors]
+        batch_ids = [batch.id for batch in batches]
+        titles = ['Extra class', 'Tutorial', 'Quiz', 'Lab session', 'Seminar']
+
+        first_day = self.today - timedelta(weeks=self.weeks)
+        last_day = self.today + timedelta(days=6)
+        starts = range(BOOKING_FIRST_HOUR * 60, (BOOKING_LAST_HOUR - 1) * 60 + 1, 30)
+        bookings = []
+        on_date = first_day
+        while on_date <= last_day:
+            day_name = on_date.strftime('%A').lower()
+            weights = PAST_STATUS_WEIGHTS if on_date < self.today else FUTURE_STATUS_WEIGHTS
+            statuses = self.rng.choices(
+                list(weights), list(weights.values()), k=self.bookings_per_day
+            )
+            room_masks = {}
+            for status in statuses:
+                # A few tries to find a gap; on a saturated day the booking is dropped
+                for _ in range(5):
+                    classroom_id = classroom_ids[self.rng.randrange(len(classroom_ids))]
+                    start = self.rng.choice(starts)
+                    end = min(start + self.rng.choice([60, 60, 90, 120]), BOOKING_LAST_HOUR * 60)
+                    wanted = minute_range_mask(start, end)
+                    occupied = room_masks.get(classroom_id)
+                    if occupied is None:
+                        occupied = class_masks.get((day_name, classroom_id), 0)
+                    if occupied & wanted:
+                        continue
+                    room_masks[classroom_id] = occupied | wanted
+                    batch_id = self.rng.choice(batch_ids) if batch_ids and self.rng.random() < 0.7 else None
+                    bookings.append(ClassroomBooking(
+                        professor_id=self.rng.choice(professor_ids), classroom_id=classroom_id,
+                        date=on_date, start_time=time_values[start], end_time=time_values[end],
+                        course_code=f'{SEED_COURSE_PREFIX}X{self.rng.randrange(1000):03d}',
+                        course_name=self.rng.choice(titles), purpose='Generated by seed_scale',
+                        batch_id=batch_id, status=status,
+                    ))
+                    break
+            on_date += timedelta(days=1)
+
+        ClassroomBooking.objects.bulk_create(bookings, batch_size=INSERT_BATCH_SIZE)
+        self.counts['bookings'] = len(bookings)
@@ -0,0 +1,108 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.models import User
+from .cache import invalidate_batches, invalidate_professors
+from .models import Batch, Classroom, ClassSchedule, Course, TimeSlot
+from .reference import forget_reference_data, invalidate_reference_data
+
+
+def _invalidate_on_commit(batch_ids, professor_ids):
+    # Bump after commit so a concurrent reader can't cache pre-commit rows under the new version
+    transaction.on_commit(partial(invalidate_batches, list(batch_ids)))
+    transaction.on_commit(partial(invalidate_professors, list(professor_ids)))
+
+
+def _invalidate_schedules(schedules):
+    """Invalidate the batch and professor timetables that contain ``schedules``"""
+    pairs = list(schedules.values_list('batch_id', 'professor_id'))
+    _invalidate_on_commit(
+        [batch_id for batch_id, _ in pairs],
+        [professor_id for _, professor_id in pairs],
+    )
+
+
+@receiver(pre_save, sender=ClassSchedule)
+def remember_previous_owners(sender, instance, **kwargs):
+    # A schedule moved to another batch or professor must also drop the old owner's cache
+    instance._previous_owners = None
+    if instance.pk:
+        instance._previous_owners = (
+            ClassSchedule.objects.filter(pk=instance.pk)
+            .values_list('batch_id', 'professor_id')
+            .first()
+        )
+
+
+@receiver(post_save, sender=ClassSchedule)
+@receiver(post_delete, sender=ClassSchedule)
+def invalidate_schedule_owners(sender, instance, **kwargs):
+    batch_ids = [instance.batch_id]
+    professor_ids = [instance.professor_id]
+    previous = getattr(instance, '_previous_owners', None)
+    if previous:
+        batch_ids.append(previous[0])
+        professor_ids.append(previous[1])
+    _invalidate_on_commit(batch_ids, professor_ids)
+
+
+@receiver(post_save, sender=TimeSlot)
+def invalidate_time_slot(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate_schedules(ClassSchedule.objects.filter(time_slot=instance))
+
+
+@receiver(post_save, sender=Classroom)
+def invalidate_classroom(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate_schedules(ClassSchedule.objects.filter(classroom=instance))
+
+
+@receiver(post_save, sender=Course)
+def invalidate_course(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate_schedules(ClassSchedule.objects.filter(course=instance))
+
+
+# The professor fields cache.serialize_schedule copies into cached timetables
+PROFESSOR_NAME_FIELDS = ('short_name', 'first_name', 'last_name')
+
+
+@receiver(pre_save, sender=User)
+def remember_professor_name(sender, instance, update_fields=None, **kwargs):
+    # Logins save only last_login; skip the lookup when no cached field can change
+    instance._previous_name = None
+    if instance.pk and (update_fields is None or set(update_fields) & set(PROFESSOR_NAME_FIELDS)):
+        instance._previous_name = (
+            User.objects.filter(pk=instance.pk).values_list(*PROFESSOR_NAME_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=User)
+def invalidate_professor_name(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_name', None)
+    if previous is not None and previous != tuple(getattr(instance, field) for field in PROFESSOR_NAME_FIELDS):
+        _invalidate_schedules(ClassSchedule.objects.filter(professor=instance))
+
+
+@receiver(post_save, sender=Batch)
+def invalidate_batch(sender, instance, created, **kwargs):
+    if not created:
+        _invalidate_schedules(ClassSchedule.objects.filter(batch=instance))
+
+
+@receiver(post_save, sender=Classroom)
+@receiver(post_delete, sender=Classroom)
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+def invalidate_reference_tables(sender, instance, **kwargs):
+    # This thread sees its own write at once; other workers reload after the commit
+    forget_reference_data()
+    transaction.on_commit(invalidate_reference_data)
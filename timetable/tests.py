@@ -1,3 +1,1108 @@
-from django.test import TestCase
+import csv
+import os
+import re
+import tempfile
+import threading
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from campusConnect.instrumentation import RequestMetricsMiddleware
+from users.models import StudentProfile, User
+from .cache import get_batch_schedules, get_professor_schedules
+from .benchmarks import check_budgets, load_budgets, run_benchmarks, run_concurrency_benchmark
+from .agenda import get_student_agenda
+from .approval import ApprovalQueue, approve_bookings, date_range_from
+from .availability import AvailabilityIndex, minute_range_mask
+from .booking import allocate_booking, find_conflicts, write_transaction
+from .forms import ClassroomBookingForm
+from .grid import WeeklyGrid
+from .importer import FIELDS, ScheduleImporter, apply_diff, diff_schedule, ensure_time_slots, read_rows, row_from_mapping
+from .occupancy import BookedSession, get_classroom_occupancy, get_sessions_by_classroom
+from .models import WEEKDAYS, Batch, Classroom, ClassroomBooking, ClassSchedule, Course, TimeSlot
+from .reference import get_reference_data, invalidate_reference_data
+from .seeding import CampusSeeder
+
+
+def next_weekday(day_index):
+    today = date.today()
+    return today + timedelta(days=(day_index - today.weekday()) % 7 or 7)
+
+
+class BookingAllocatorTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        self.classroom = Classroom.objects.create(room_number='L101')
+        self.monday = next_weekday(0)
+
+    def make_booking(self, start, end, on_date=None):
+        return ClassroomBooking(
+            professor=self.professor,
+            classroom=self.classroom,
+            date=on_date or self.monday,
+            start_time=start,
+            end_time=end,
+            course_name='Extra class',
+            purpose='Revision',
+        )
+
+    def test_overlapping_booking_is_rejected(self):
+        self.assertTrue(allocate_booking(self.make_booking(time(10), time(11))).ok)
+
+        result = allocate_booking(self.make_booking(time(10, 30), time(11, 30)))
+
+        self.assertFalse(result.ok)
+        self.assertEqual([c.kind for c in result.conflicts], ['booking'])
+        self.assertEqual(ClassroomBooking.objects.count(), 1)
+
+    def test_adjacent_booking_is_allowed(self):
+        allocate_booking(self.make_booking(time(10), time(11)))
+
+        self.assertTrue(allocate_booking(self.make_booking(time(11), time(12))).ok)
+
+    def test_regular_class_blocks_booking(self):
+        ClassSchedule.objects.create(
+            course=Course.objects.create(code='CS2002', name='DSA'),
+            professor=self.professor,
+            batch=Batch.objects.create(name='CS A', batch_year='2024', branch='cs', section='A'),
+            classroom=self.classroom,
+            time_slot=TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(11)),
+        )
+
+        result = allocate_booking(self.make_booking(time(10), time(12)))
+
+        self.assertFalse(result.ok)
+        self.assertEqual(result.conflicts[0].as_dict()['kind'], 'class')
+        # The same slot on another weekday is free
+        self.assertTrue(allocate_booking(self.make_booking(time(10), time(12), next_weekday(1))).ok)
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        self.lecture, self.booked, self.free, self.done = [
+            Classroom.objects.create(room_number=number) for number in ('L101', 'L102', 'L103', 'L104')
+        ]
+        self.monday = next_weekday(0)
+        self.schedule = ClassSchedule.objects.create(
+            course=Course.objects.create(code='CS101', name='Programming'), professor=self.professor,
+            batch=Batch.objects.create(name='CSE A'), classroom=self.lecture,
+            time_slot=TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(11)),
+        )
+        self.book(self.booked, time(14), time(15), 'approved')
+        self.book(self.booked, time(10), time(11), 'pending')
+        self.book(self.done, time(8), time(9), 'approved')
+        self.book(self.done, time(16), time(17), 'approved', on_date=self.monday + timedelta(days=7))
+
+    def book(self, classroom, start, end, status, on_date=None):
+        return ClassroomBooking.objects.create(
+            professor=self.professor, classroom=classroom, date=on_date or self.monday, start_time=start,
+            end_time=end, course_name='Extra', purpose='Revision', status=status,
+        )
+
+    def test_sessions_merge_classes_and_approved_bookings(self):
+        with self.assertNumQueries(2):
+            sessions = get_sessions_by_classroom('monday', self.monday)
+
+        self.assertEqual(sessions[self.lecture.id], [self.schedule])
+        self.assertEqual([s.time_slot.start_time for s in sessions[self.booked.id]], [time(14)])
+        self.assertIsInstance(sessions[self.done.id][0], BookedSession)
+        self.assertNotIn(self.free.id, sessions)
+        # Without a date only the regular classes of the weekday are read
+        self.assertEqual(list(get_sessions_by_classroom('monday')), [self.lecture.id])
+        self.assertEqual(dict(get_sessions_by_classroom('tuesday', self.monday + timedelta(days=1))), {})
+
+    def test_each_room_gets_its_status_at_the_given_time(self):
+        get_reference_data()
+        now = timezone.make_aware(datetime.combine(self.monday, time(10, 30)))
+        with self.assertNumQueries(2):
+            occupancy = get_classroom_occupancy(now)
+
+        by_room = {row['classroom'].room_number: row for row in occupancy}
+        self.assertEqual(
+            {number: row['status'] for number, row in by_room.items()},
+            {'L101': 'ongoing', 'L102': 'scheduled', 'L103': 'free', 'L104': 'completed'},
+        )
+        self.assertEqual(by_room['L101']['current_class'], self.schedule)
+        self.assertIsNone(by_room['L101']['next_class'])
+        self.assertEqual(by_room['L102']['current_class'].course.name, 'Extra')
+
+    def test_query_count_does_not_grow_with_rooms(self):
+        get_reference_data()
+        now = timezone.make_aware(datetime.combine(self.monday, time(10, 30)))
+        for number in range(5):
+            room = Classroom.objects.create(room_number=f'L2{number:02d}')
+            self.book(room, time(12), time(13), 'approved')
+        get_reference_data()
+        with self.assertNumQueries(2):
+            self.assertEqual(len(get_classroom_occupancy(now)), 9)
+
+
+class AvailabilityIndexTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        self.room, self.other_room = Classroom.objects.create(room_number='L101'), Classroom.objects.create(room_number='L102')
+        self.monday = next_weekday(0)
+        ClassSchedule.objects.create(
+            course=Course.objects.create(code='CS101', name='Programming'), professor=self.professor,
+            batch=Batch.objects.create(name='CSE A'), classroom=self.room,
+            time_slot=TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10)),
+        )
+        self.short = self.book(time(10), time(10, 3))
+        self.book(time(12), time(13), status='cancelled')
+
+    def book(self, start, end, status='pending'):
+        return ClassroomBooking.objects.create(
+            professor=self.professor, classroom=self.room, date=self.monday, start_time=start,
+            end_time=end, course_name='Extra', purpose='Revision', status=status,
+        )
+
+    def test_masks_round_outward_to_buckets(self):
+        self.assertEqual(minute_range_mask(0, 5), 0b1)
+        self.assertEqual(minute_range_mask(3, 7), 0b11)
+        self.assertEqual(minute_range_mask(5, 10), 0b10)
+        self.assertEqual(minute_range_mask(10, 10), 0)
+        self.assertEqual(minute_range_mask(24 * 60 - 1, 24 * 60 + 30).bit_length(), 24 * 60 // 5)
+
+    def test_build_uses_two_queries(self):
+        with self.assertNumQueries(2):
+            AvailabilityIndex.build(self.monday)
+
+    def test_busy_only_when_intervals_really_overlap(self):
+        index = AvailabilityIndex.build(self.monday)
+
+        # Shares the 10:00-10:05 bucket with the 10:00-10:03 booking but does not overlap it
+        self.assertTrue(index.is_free(self.room.id, time(10, 3), time(11)))
+        self.assertTrue(index.is_busy(self.room.id, time(10, 2), time(10, 30)))
+        self.assertTrue(index.is_busy(self.room.id, time(9, 59), time(10)))
+        self.assertTrue(index.is_free(self.room.id, time(12), time(13)))  # cancelled
+        self.assertTrue(index.is_free(self.room.id, time(8), time(9)))
+        self.assertEqual(
+            index.free_classrooms([self.room.id, self.other_room.id], time(9, 30), time(10, 30)),
+            [self.other_room.id],
+        )
+        self.assertTrue(
+            AvailabilityIndex.build(self.monday, exclude_booking_id=self.short.pk).is_free(self.room.id, time(10), time(11))
+        )
+
+    def test_hourly_grid(self):
+        grid = AvailabilityIndex.build(self.monday).hourly_grid([self.room.id, self.other_room.id], 8, 12)
+        self.assertEqual(grid, [
+            (time(8), [True, True]),
+            (time(9), [False, True]),
+            (time(10), [False, True]),
+            (time(11), [True, True]),
+        ])
+
+    def test_booking_form_accepts_unaligned_adjacent_booking(self):
+        form = ClassroomBookingForm({
+            'classroom': self.room.id, 'date': self.monday, 'start_time': '10:03', 'end_time': '11:00',
+            'course_name': 'Extra', 'purpose': 'Revision',
+        }, professor=self.professor)
+        self.assertTrue(form.is_valid(), form.errors)
+
+        form = ClassroomBookingForm({
+            'classroom': self.room.id, 'date': self.monday, 'start_time': '10:02', 'end_time': '11:00',
+            'course_name': 'Extra', 'purpose': 'Revision',
+        }, professor=self.professor)
+        self.assertFalse(form.is_valid())
+
+
+class MinuteOfWeekTests(TestCase):
+    def setUp(self):
+        professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        course = Course.objects.create(code='CS2002', name='DSA')
+        batch = Batch.objects.create(name='CS A', batch_year='2024', branch='cs', section='A')
+        classroom = Classroom.objects.create(room_number='L101')
+        self.friday = TimeSlot.objects.create(day='friday', start_time=time(9), end_time=time(10))
+        self.monday = TimeSlot.objects.create(day='monday', start_time=time(11), end_time=time(12))
+        for slot in (self.friday, self.monday):
+            ClassSchedule.objects.create(
+                course=course, professor=professor, batch=batch, classroom=classroom, time_slot=slot
+            )
+
+    def test_schedules_follow_weekday_order(self):
+        days = [s.time_slot.day for s in ClassSchedule.objects.select_related('time_slot')]
+
+        self.assertEqual(days, ['monday', 'friday'])
+        schedule = ClassSchedule.objects.get(time_slot=self.monday)
+        self.assertEqual((schedule.start_minute_of_week, schedule.end_minute_of_week), (660, 720))
+
+    def test_moving_a_time_slot_updates_its_schedules(self):
+        self.friday.day = 'tuesday'
+        self.friday.save()
+
+        schedule = ClassSchedule.objects.get(time_slot=self.friday)
+        self.assertEqual(schedule.start_minute_of_week, 24 * 60 + 9 * 60)
+
+
+class WeeklyGridTests(TestCase):
+    HOURLY = [(time(hour), time(hour + 1)) for hour in range(9, 13)]
+
+    def schedule(self, code, day, start, end):
+        # Unsaved rows are enough: the grid only reads course and time_slot
+        return ClassSchedule(
+            course=Course(code=code, name=code), time_slot=TimeSlot(day=day, start_time=start, end_time=end),
+        )
+
+    def codes(self, grid, day, start):
+        return [(entry.schedule.course.code, entry.is_start, entry.span) for entry in grid.cell(day, start)]
+
+    def test_classes_land_in_their_day_and_start_row(self):
+        grid = WeeklyGrid([
+            self.schedule('CS101', 'monday', time(9), time(10)),
+            self.schedule('CS102', 'tuesday', time(11), time(12)),
+        ], self.HOURLY)
+
+        self.assertEqual(grid.boundaries, [time(hour) for hour in range(9, 14)])
+        self.assertEqual(self.codes(grid, 'monday', time(9)), [('CS101', True, 1)])
+        self.assertEqual(self.codes(grid, 'tuesday', time(11)), [('CS102', True, 1)])
+        self.assertEqual(grid.cell('monday', time(11)), [])
+        self.assertEqual(len(grid.rows), 4)
+        self.assertEqual([len(cells) for cells in grid.rows[0]['cells']], [1, 0, 0, 0, 0, 0])
+
+    def test_multi_hour_class_covers_every_row_it_spans(self):
+        grid = WeeklyGrid([self.schedule('CS103L', 'wednesday', time(10), time(13))], self.HOURLY)
+
+        self.assertEqual(self.codes(grid, 'wednesday', time(10)), [('CS103L', True, 3)])
+        self.assertEqual(self.codes(grid, 'wednesday', time(11)), [('CS103L', False, 3)])
+        self.assertEqual(self.codes(grid, 'wednesday', time(12)), [('CS103L', False, 3)])
+        self.assertEqual(grid.cell('wednesday', time(9)), [])
+
+    def test_start_between_slot_boundaries_splits_the_rows(self):
+        grid = WeeklyGrid([
+            self.schedule('CS104', 'thursday', time(9, 30), time(10, 30)),
+            self.schedule('CS105', 'thursday', time(9), time(10)),
+        ], self.HOURLY)
+
+        self.assertEqual(
+            [(row['start_time'], row['end_time']) for row in grid.rows[:4]],
+            [(time(9), time(9, 30)), (time(9, 30), time(10)), (time(10), time(10, 30)), (time(10, 30), time(11))],
+        )
+        self.assertEqual(self.codes(grid, 'thursday', time(9, 30)), [('CS104', True, 2), ('CS105', False, 2)])
+        self.assertEqual(self.codes(grid, 'thursday', time(10)), [('CS104', False, 2)])
+        self.assertEqual(grid.cell('thursday', time(10, 30)), [])
+
+    def test_duplicate_slots_share_a_cell(self):
+        grid = WeeklyGrid([
+            self.schedule('CS101', 'friday', time(9), time(10)),
+            self.schedule('CS102', 'friday', time(9), time(10)),
+        ])
+
+        self.assertEqual(self.codes(grid, 'friday', time(9)), [('CS101', True, 1), ('CS102', True, 1)])
+        self.assertEqual(len(grid.rows), 1)
+
+
+class TimeSlotUniquenessTests(TestCase):
+    def test_duplicate_slot_is_rejected(self):
+        TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10))
+
+    def test_ensure_time_slots_creates_missing_slots_once(self):
+        existing = TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10))
+        keys = [('monday', time(9), time(10)), ('monday', time(10), time(11)), ('tuesday', time(9), time(10))]
+
+        slots = ensure_time_slots(keys + keys)
+        self.assertEqual(slots[keys[0]], existing)
+        self.assertEqual(TimeSlot.objects.count(), 3)
+
+        with self.assertNumQueries(1):
+            again = ensure_time_slots(keys)
+        self.assertEqual({key: slot.pk for key, slot in again.items()}, {key: slot.pk for key, slot in slots.items()})
+
+
+class TimeSlotMergeMigrationTests(TransactionTestCase):
+    before = [('timetable', '0006_schedule_minute_of_week')]
+    after = [('timetable', '0007_dedupe_timeslots')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        self.TimeSlot = apps.get_model('timetable', 'TimeSlot')
+        self.ClassSchedule = apps.get_model('timetable', 'ClassSchedule')
+        self.professor = apps.get_model('users', 'User').objects.create(username='prof')
+        self.course, self.other_course = [
+            apps.get_model('timetable', 'Course').objects.create(code=code, name=code) for code in ('CS101', 'CS102')
+        ]
+        Batch = apps.get_model('timetable', 'Batch')
+        Classroom = apps.get_model('timetable', 'Classroom')
+        self.batches = [Batch.objects.create(name=f'B{number}', section=str(number)) for number in range(3)]
+        self.rooms = [Classroom.objects.create(room_number=f'R{number}') for number in range(2)]
+        self.slots = [
+            self.TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10)) for _ in range(3)
+        ]
+
+    def tearDown(self):
+        self.ClassSchedule.objects.all().delete()
+        self.TimeSlot.objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def schedule(self, slot, room, batch, course=None):
+        return self.ClassSchedule.objects.create(
+            course=course or self.course, professor=self.professor, batch=batch, classroom=room, time_slot=slot,
+        )
+
+    def test_duplicates_merge_and_identical_classes_are_logged(self):
+        kept = self.schedule(self.slots[0], self.rooms[0], self.batches[0])
+        twin = self.schedule(self.slots[1], self.rooms[0], self.batches[0])
+        moved = self.schedule(self.slots[2], self.rooms[1], self.batches[1])
+
+        with self.assertLogs('campusconnect.migrations', 'WARNING') as logs:
+            MigrationExecutor(connection).migrate(self.after)
+
+        self.assertEqual(list(self.TimeSlot.objects.values_list('id', flat=True)), [self.slots[0].id])
+        self.assertEqual(
+            dict(self.ClassSchedule.objects.values_list('id', 'time_slot_id')),
+            {kept.id: self.slots[0].id, moved.id: self.slots[0].id},
+        )
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn(f'schedule={twin.id} ', logs.output[0])
+        self.assertIn(f'same_as={kept.id}', logs.output[0])
+
+    def test_real_clash_stops_the_migration_without_changes(self):
+        self.schedule(self.slots[0], self.rooms[0], self.batches[0])
+        clash = self.schedule(self.slots[1], self.rooms[0], self.batches[2], course=self.other_course)
+
+        with self.assertRaises(RuntimeError) as error:
+            MigrationExecutor(connection).migrate(self.after)
+
+        self.assertIn(f'schedule {clash.id} ', str(error.exception))
+        self.assertEqual(self.TimeSlot.objects.count(), 3)
+        self.assertEqual(self.ClassSchedule.objects.count(), 2)
+
+
+class ImporterTestMixin:
+    def setUp(self):
+        cache.clear()
+        self.cs101 = Course.objects.create(code='CS101', name='Programming')
+        self.cs102 = Course.objects.create(code='CS102', name='Data Structures')
+        self.ab = User.objects.create(username='ab', email='ab@iiitdmj.ac.in', role='professor', short_name='AB')
+        self.cd = User.objects.create(username='cd', email='cd@iiitdmj.ac.in', role='professor', short_name='CD')
+        self.section_a = Batch.objects.create(name='CSE A', batch_year='2023', branch='cs', section='A')
+        self.section_b = Batch.objects.create(name='CSE B', batch_year='2023', branch='cs', section='B')
+        self.l101, self.l102, self.l103 = [
+            Classroom.objects.create(room_number=number) for number in ('L101', 'L102', 'L103')
+        ]
+
+    def schedule(self, start, end, course, professor, batch, classroom, day='monday'):
+        slot, _ = TimeSlot.objects.get_or_create(day=day, start_time=start, end_time=end)
+        return ClassSchedule.objects.create(
+            course=course, professor=professor, batch=batch, classroom=classroom, time_slot=slot,
+        )
+
+    def rows(self, *lines):
+        return [row_from_mapping(dict(zip(FIELDS, line.split(','))), number) for number, line in enumerate(lines, 2)]
+
+    def table(self):
+        return sorted(
+            (s.time_slot.day, f'{s.time_slot.start_time:%H:%M}', s.batch.section, s.course.code,
+             s.professor.short_name, s.classroom.room_number)
+            for s in ClassSchedule.objects.select_related('time_slot', 'batch', 'course', 'professor', 'classroom')
+        )
+
+
+class ScheduleImporterTests(ImporterTestMixin, TestCase):
+    def write_csv(self, *lines):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', newline='', delete=False)
+        self.addCleanup(os.unlink, handle.name)
+        with handle:
+            writer = csv.writer(handle)
+            writer.writerow(FIELDS)
+            writer.writerows(line.split(',') for line in lines)
+        return handle.name
+
+    def test_csv_import_writes_valid_rows_and_reports_the_rest(self):
+        self.schedule(time(14), time(15), self.cs101, self.ab, self.section_b, self.l101)
+        path = self.write_csv(
+            'monday,CS101,2023,cs,A,AB,L101,09:00,10:00',
+            'Monday,CS102,2023,CS,ALL,CD,L102|L103,10:00,11:00',  # one class per section
+            'monday,CS999,2023,cs,A,AB,L101,11:00,12:00',  # unknown course
+            'monday,CS102,2023,cs,A,CD,L101,14:30,15:30',  # room taken by the existing class
+            'monday,CS101,2023,cs,ALL,AB,L102,12:00,13:00',  # two sections, one room
+            'funday,CS101,2023,cs,A,AB,L101,09:00,10:00',
+        )
+
+        importer = ScheduleImporter(read_rows(path))
+        importer.resolve()
+        self.assertFalse(importer.validate())
+        self.assertEqual([error.split(':')[0] for error in importer.errors], [
+            'line 4', 'line 6', 'line 7', 'classroom clash on monday for L101',
+        ])
+        self.assertIn("not found: course 'CS999'", importer.errors[0])
+        self.assertIn('expands to 2 batches but lists 1 classroom(s)', importer.errors[1])
+        self.assertIn('(line 5)', importer.errors[3])
+
+        importer.drop_invalid()
+        self.assertEqual(importer.write(), 3)
+        self.assertEqual(self.table(), [
+            ('monday', '09:00', 'A', 'CS101', 'AB', 'L101'),
+            ('monday', '10:00', 'A', 'CS102', 'CD', 'L102'),
+            ('monday', '10:00', 'B', 'CS102', 'CD', 'L103'),
+            ('monday', '14:00', 'B', 'CS101', 'AB', 'L101'),
+        ])
+
+        # Importing the same file again writes nothing new
+        again = ScheduleImporter(read_rows(path))
+        again.resolve()
+        again.validate()
+        again.drop_invalid()
+        self.assertEqual(again.skipped, 3)
+        self.assertEqual(again.planned, [])
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def run(rows):
+            importer = ScheduleImporter(rows)
+            importer.resolve()
+            self.assertTrue(importer.validate(), importer.errors)
+            importer.write()
+
+        get_reference_data()
+        with CaptureQueriesContext(connection) as small:
+            run(self.rows('monday,CS101,2023,cs,A,AB,L101,09:00,10:00'))
+        get_reference_data()
+        with CaptureQueriesContext(connection) as large:
+            run(self.rows(*(
+                f'{day},CS102,2023,cs,ALL,CD,L102|L103,{hour:02d}:00,{hour:02d}:50'
+                for day in ('tuesday', 'wednesday') for hour in range(8, 18)
+            )))
+        self.assertEqual(ClassSchedule.objects.count(), 41)
+        self.assertEqual(len(large), len(small))
+
+
+class ScheduleSyncTests(ImporterTestMixin, TestCase):
+    def test_sync_inserts_updates_deletes_and_swaps_rooms(self):
+        self.schedule(time(9), time(10), self.cs101, self.ab, self.section_a, self.l101)
+        self.schedule(time(9), time(10), self.cs102, self.cd, self.section_b, self.l102)
+        self.schedule(time(11), time(12), self.cs101, self.ab, self.section_a, self.l101)
+        self.schedule(time(12), time(13), self.cs102, self.cd, self.section_b, self.l103)
+
+        importer = ScheduleImporter(self.rows(
+            'monday,CS101,2023,cs,A,AB,L102,09:00,10:00',  # the two 9:00 classes swap rooms
+            'monday,CS102,2023,cs,B,CD,L101,09:00,10:00',
+            'monday,CS102,2023,cs,B,CD,L103,12:00,13:00',  # unchanged
+            'monday,CS102,2023,cs,A,CD,L103,13:00,14:00',  # new; 11:00 is dropped
+        ))
+        importer.resolve()
+        self.assertTrue(importer.validate(existing=[]))
+        diff = diff_schedule(importer.planned, {'monday'})
+        self.assertEqual(
+            (len(diff.inserts), len(diff.updates), len(diff.deletes), diff.unchanged), (1, 2, 1, 1),
+        )
+
+        apply_diff(diff)
+        self.assertEqual(self.table(), [
+            ('monday', '09:00', 'A', 'CS101', 'AB', 'L102'),
+            ('monday', '09:00', 'B', 'CS102', 'CD', 'L101'),
+            ('monday', '12:00', 'B', 'CS102', 'CD', 'L103'),
+            ('monday', '13:00', 'A', 'CS102', 'CD', 'L103'),
+        ])
+        self.assertFalse(diff_schedule(importer.planned, {'monday'}))
+
+
+class TimetableCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.professor = User.objects.create(
+            username='ab', email='ab@iiitdmj.ac.in', role='professor', short_name='AB', first_name='Asha',
+        )
+        self.course = Course.objects.create(code='CS101', name='Programming')
+        self.batch = Batch.objects.create(name='CSE A', batch_year='2023', branch='cs', section='A')
+        self.room = Classroom.objects.create(room_number='L101')
+        self.slot = TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10))
+        self.schedule = ClassSchedule.objects.create(
+            course=self.course, professor=self.professor, batch=self.batch, classroom=self.room, time_slot=self.slot,
+        )
+
+    def cached(self):
+        """The batch's and the professor's cached schedule; both must stay in step"""
+        batch_rows = get_batch_schedules([self.batch.id])
+        professor_rows = get_professor_schedules(self.professor.id)
+        self.assertEqual(len(batch_rows), 1)
+        self.assertEqual(len(professor_rows), 1)
+        batch_row, professor_row = batch_rows[0], professor_rows[0]
+        self.assertEqual(
+            (batch_row.professor.short_name, batch_row.professor.first_name, batch_row.batch.name,
+             batch_row.course.name, batch_row.classroom.room_number, batch_row.time_slot.start_time),
+            (professor_row.professor.short_name, professor_row.professor.first_name, professor_row.batch.name,
+             professor_row.course.name, professor_row.classroom.room_number, professor_row.time_slot.start_time),
+        )
+        return batch_rows[0]
+
+    def change(self, obj, **values):
+        self.cached()  # warm both caches
+        for field, value in values.items():
+            setattr(obj, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        return self.cached()
+
+    def test_each_model_change_reaches_the_cached_timetable(self):
+        self.assertEqual(self.change(self.course, name='Intro to Programming').course.name, 'Intro to Programming')
+        self.assertEqual(self.change(self.room, room_number='L201').classroom.room_number, 'L201')
+        self.assertEqual(self.change(self.slot, start_time=time(8)).time_slot.start_time, time(8))
+        self.assertEqual(self.change(self.batch, name='CSE Alpha').batch.name, 'CSE Alpha')
+        self.assertEqual(get_professor_schedules(self.professor.id)[0].batch.name, 'CSE Alpha')
+        self.assertEqual(self.change(self.professor, first_name='Ashok').professor.first_name, 'Ashok')
+        self.assertEqual(self.change(self.professor, short_name='AK').professor.short_name, 'AK')
+        other_room = Classroom.objects.create(room_number='L301')
+        self.assertEqual(self.change(self.schedule, classroom=other_room).classroom.room_number, 'L301')
+
+    def test_login_does_not_touch_the_cache(self):
+        self.cached()
+        self.professor.last_login = timezone.now()
+        with self.assertNumQueries(1), self.captureOnCommitCallbacks() as callbacks:
+            self.professor.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+
+
+class StudentAgendaTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        student = User.objects.create_user('23bcs001@iiitdmj.ac.in', '23bcs001@iiitdmj.ac.in', 'pw')
+        self.profile = StudentProfile.objects.create(user=student, batch='2024', branch='CS ', section='A')
+        section_a = Batch.objects.create(name='CSE A', batch_year='2024', branch='cs', section='A')
+        section_b = Batch.objects.create(name='CSE B', batch_year='2024', branch='cs', section='B')
+        seniors = Batch.objects.create(name='CSE 2023', batch_year='2023', branch='cs', section='A')
+        self.room = Classroom.objects.create(room_number='L101')
+        self.schedule('CS101', section_a, 'monday', 9, 10)
+        self.schedule('CS102', section_b, 'monday', 11, 12)
+        self.schedule('CS103', section_a, 'monday', 14, 15)
+        self.schedule('CS104', section_a, 'tuesday', 10, 11)
+        self.schedule('CS201', seniors, 'monday', 12, 13)
+        self.schedule('CS202', seniors, 'tuesday', 9, 10)
+        self.monday = next_weekday(0)
+
+    def schedule(self, code, batch, day, start, end):
+        ClassSchedule.objects.create(
+            course=Course.objects.create(code=code, name=code), professor=self.professor, batch=batch,
+            classroom=self.room, time_slot=TimeSlot.objects.create(day=day, start_time=time(start), end_time=time(end)),
+        )
+
+    def agenda(self, hour, minute=0):
+        agenda = get_student_agenda(
+            self.profile, timezone.make_aware(datetime.combine(self.monday, time(hour, minute)))
+        )
+        return (
+            agenda['ongoing_class'].course.code if agenda['ongoing_class'] else None,
+            [schedule.course.code for schedule in agenda['next_classes']],
+            [schedule.course.code for schedule in agenda['tomorrow_classes']],
+        )
+
+    def test_agenda_splits_every_section_of_the_batch(self):
+        self.assertEqual(self.agenda(9, 30), ('CS101', ['CS102', 'CS103'], ['CS104']))
+        self.assertEqual(self.agenda(12, 30), (None, ['CS103'], ['CS104']))
+
+    def test_early_morning_previews_the_day_from_nine(self):
+        self.assertEqual(self.agenda(6), ('CS101', ['CS102', 'CS103'], ['CS104']))
+
+    def test_evening_falls_back_to_the_whole_day(self):
+        self.assertEqual(self.agenda(18), (None, ['CS101', 'CS102', 'CS103'], ['CS104']))
+
+    def test_cached_agenda_costs_no_queries(self):
+        with self.assertNumQueries(5):  # the reference snapshot, then the batch schedules
+            self.agenda(9, 30)
+        with self.assertNumQueries(0):
+            self.agenda(12)
+
+
+class ReferenceDataTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.room = Classroom.objects.create(room_number='L101', building='Lecture Hall')
+        self.batch = Batch.objects.create(name='CSE A', batch_year='2023', branch='cs', section='A')
+
+    def test_snapshot_is_reused_until_a_reference_row_changes(self):
+        snapshot = get_reference_data()
+        self.assertEqual(snapshot.classrooms_by_number['L101'], self.room)
+        self.assertEqual(snapshot.batches_by_key[('2023', 'cs', 'A')], self.batch)
+        self.assertEqual(snapshot.batch_ids('2023', 'cs'), [self.batch.id])
+        with self.assertNumQueries(0):
+            self.assertIs(get_reference_data(), snapshot)
+
+        Classroom.objects.create(room_number='L102', building='Lecture Hall')
+        self.assertIn('L102', get_reference_data().classrooms_by_number)
+
+    def test_batch_ids_normalise_profile_values(self):
+        snapshot = get_reference_data()
+        self.assertEqual(snapshot.batch_ids('2023', 'CS '), [self.batch.id])
+        self.assertEqual(snapshot.batch_ids(' 2023', 'Cs'), [self.batch.id])
+
+        student = User.objects.create_user('23bcs001@iiitdmj.ac.in', '23bcs001@iiitdmj.ac.in', 'pw')
+        StudentProfile.objects.create(user=student, batch='2023', branch='CS ', section='A')
+        ClassSchedule.objects.create(
+            course=Course.objects.create(code='CS101', name='Programming'),
+            professor=User.objects.create_user('p@iiitdmj.ac.in', 'p@iiitdmj.ac.in', 'pw', role='professor'),
+            batch=self.batch, classroom=self.room,
+            time_slot=TimeSlot.objects.create(day='monday', start_time=time(9), end_time=time(10)),
+        )
+        self.client.force_login(student)
+        self.assertEqual(len(self.client.get(reverse('weekly_timetable')).context['classes']), 1)
+
+    def test_version_bump_reloads_other_workers(self):
+        snapshot = get_reference_data()
+        # Another worker's bulk write: no signal here, only the shared version moves
+        Course.objects.bulk_create([Course(code='CS101', name='Programming')])
+        invalidate_reference_data()
+        with self.assertNumQueries(4):
+            fresh = get_reference_data()
+        self.assertIsNot(fresh, snapshot)
+        self.assertIn('CS101', fresh.courses_by_code)
+
+    def test_attach_replaces_select_related(self):
+        professor = User.objects.create_user('p@iiitdmj.ac.in', 'p@iiitdmj.ac.in', 'pw', role='professor')
+        ClassroomBooking.objects.create(
+            professor=professor, classroom=self.room, batch=self.batch, date=next_weekday(0),
+            start_time=time(10), end_time=time(11), course_name='Extra', purpose='Revision',
+        )
+        references = get_reference_data()
+        bookings = references.attach(list(ClassroomBooking.objects.all()), 'classroom', 'batch')
+        with self.assertNumQueries(0):
+            self.assertEqual(bookings[0].classroom.room_number, 'L101')
+            self.assertEqual(bookings[0].batch.section, 'A')
+
+
+class ApprovalQueueTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        self.room = Classroom.objects.create(room_number='L101')
+        self.monday = next_weekday(0)
+        slot = TimeSlot.objects.create(day='monday', start_time=time(14), end_time=time(15))
+        ClassSchedule.objects.create(
+            course=Course.objects.create(code='CS101', name='Programming'), professor=self.professor,
+            batch=Batch.objects.create(name='CSE A'), classroom=self.room, time_slot=slot,
+        )
+        # Created in this order, so A is first come; bulk_create bypasses the allocator
+        self.a, self.b, self.c, self.d = ClassroomBooking.objects.bulk_create([
+            self.pending(time(9), time(10)),
+            self.pending(time(9, 30), time(10, 30)),
+            self.pending(time(10, 30), time(11)),
+            self.pending(time(14, 30), time(15, 30)),  # overlaps the class
+        ])
+
+    def pending(self, start, end, room=None):
+        return ClassroomBooking(
+            professor=self.professor, classroom=room or self.room, date=self.monday,
+            start_time=start, end_time=end, course_name='Extra', purpose='Revision',
+        )
+
+    def statuses(self):
+        return dict(ClassroomBooking.objects.values_list('pk', 'status'))
+
+    def test_sweep_groups_conflicts_and_proposes_first_come(self):
+        queue = ApprovalQueue.load(self.monday, self.monday)
+        self.assertEqual(
+            [[booking.pk for booking in group.bookings] for group in queue.groups()],
+            [[self.a.pk, self.b.pk], [self.c.pk], [self.d.pk]],
+        )
+        self.assertTrue(queue.is_blocked(self.d))
+        self.assertEqual(queue.proposal(), [self.a.pk, self.c.pk])
+
+    def test_approval_rejects_overlapping_requests_in_one_go(self):
+        decision = approve_bookings([self.b.pk])
+
+        self.assertEqual(decision.approved, [self.b.pk])
+        self.assertEqual(decision.rejected, [self.a.pk])
+        self.assertEqual(self.statuses(), {
+            self.a.pk: 'rejected', self.b.pk: 'approved', self.c.pk: 'pending', self.d.pk: 'pending',
+        })
+
+    def test_conflicting_choices_are_left_pending(self):
+        decision = approve_bookings([self.a.pk, self.b.pk, self.d.pk])
+
+        self.assertEqual(decision.approved, [self.a.pk])
+        self.assertEqual(decision.skipped, [self.b.pk, self.d.pk])
+        self.assertEqual(self.statuses()[self.b.pk], 'pending')
+
+    def test_thousands_of_requests_load_in_three_queries(self):
+        rooms = Classroom.objects.bulk_create([Classroom(room_number=f'R{number}') for number in range(30)])
+        ClassroomBooking.objects.bulk_create([
+            self.pending(time(8 + minute // 60, minute % 60), time(9 + minute // 60, minute % 60), room)
+            for room in rooms for minute in range(0, 600, 6)
+        ])
+        with self.assertNumQueries(3):
+            queue = ApprovalQueue.load(self.monday, self.monday)
+        self.assertEqual(len(queue.pending), 3004)
+
+        decision = approve_bookings(queue.proposal())
+        # Hour-long requests every 6 minutes: every tenth one fits
+        self.assertEqual(len(decision.approved), 30 * 10 + 2)
+        self.assertFalse(ClassroomBooking.objects.filter(status='pending', classroom__in=rooms).exists())
+
+    def test_api_lists_queue_and_approves(self):
+        url = reverse('booking_approval_queue')
+        self.client.force_login(self.professor)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@iiitdmj.ac.in', 'pw'))
+        queue = self.client.get(url, {'start': self.monday.isoformat(), 'end': self.monday.isoformat()}).json()
+        self.assertEqual(queue['proposal'], [self.a.pk, self.c.pk])
+        self.assertEqual([group['contested'] for group in queue['groups']], [True, False, False])
+
+        response = self.client.post(url, {'approve': queue['proposal']}, content_type='application/json')
+        self.assertEqual(response.json()['rejected'], [self.b.pk])
+
+    @mock.patch('timetable.approval.timezone.localdate')
+    def test_default_range_starts_on_the_local_date(self, localdate):
+        localdate.return_value = date(2025, 3, 10)
+        self.assertEqual(date_range_from({}), (date(2025, 3, 10), date(2025, 3, 16)))
+        self.assertEqual(date_range_from({'start': '2025-03-01', 'end': '2025-03-02'}), (date(2025, 3, 1), date(2025, 3, 2)))
+
+    def test_admin_form_cannot_approve_directly(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@iiitdmj.ac.in', 'pw'))
+        page = self.client.get(reverse('admin:timetable_classroombooking_change', args=[self.b.pk]))
+        self.assertNotContains(page, 'name="status"')
+
+    def test_admin_queue_preselects_proposal(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@iiitdmj.ac.in', 'pw'))
+        url = reverse('admin:timetable_classroombooking_approval_queue')
+        page = self.client.get(url, {'start': self.monday.isoformat(), 'end': self.monday.isoformat()})
+        self.assertContains(page, f'value="{self.a.pk}" checked')
+        self.assertNotContains(page, f'value="{self.b.pk}" checked')
+
+        self.client.post(url, {'approve': [self.a.pk, self.c.pk]})
+        self.assertEqual(self.statuses()[self.b.pk], 'rejected')
+
+
+class SeedScaleTests(TestCase):
+    def seed(self):
+        return CampusSeeder(
+            seed=7, rooms=8, batches=6, professors=6, students=12, bookings_per_day=15, weeks=1,
+            today=date(2026, 3, 2),
+        ).run()['counts']
+
+    def test_generated_campus_is_clash_free(self):
+        counts = self.seed()
+
+        self.assertEqual(counts['class_schedules'], ClassSchedule.objects.count())
+        self.assertEqual(counts['bookings'], ClassroomBooking.objects.count())
+        for booking in ClassroomBooking.objects.filter(status__in=['pending', 'approved']):
+            self.assertEqual(find_conflicts(
+                booking.classroom_id, booking.date, booking.start_time, booking.end_time,
+                exclude_booking_id=booking.pk,
+            ), [])
+        for field in ('professor', 'batch'):
+            per_slot = ClassSchedule.objects.values(field, 'time_slot').distinct().count()
+            self.assertEqual(per_slot, counts['class_schedules'])
+
+    def test_same_seed_gives_same_data_and_reset_removes_it(self):
+        def snapshot():
+            return list(ClassroomBooking.objects.order_by('date', 'classroom__room_number', 'start_time')
+                        .values_list('classroom__room_number', 'date', 'start_time', 'status'))
+
+        self.seed()
+        first = snapshot()
+        CampusSeeder.reset()
+        self.assertFalse(Classroom.objects.exists())
+
+        self.seed()
+        self.assertEqual(snapshot(), first)
+
+
+class BenchmarkBudgetTests(TestCase):
+    def test_query_budgets_hold_on_a_small_campus(self):
+        # Query counts do not depend on the size of the data, so the
+        # checked-in budgets apply here; latency is left to benchmark_views
+        scale = dict(rooms=6, batches=4, professors=4, students=8, bookings_per_day=10, weeks=1)
+
+        run = run_benchmarks(scale, iterations=1, warmup=1)
+
+        self.assertEqual(check_budgets(run['results'], load_budgets(), check_latency=False), [])
+        self.assertEqual(set(run['results']), set(load_budgets()['views']))
+
+
+class ConcurrentBookingTests(TransactionTestCase):
+    def test_only_one_of_many_concurrent_overlapping_bookings_wins(self):
+        professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        classroom = Classroom.objects.create(room_number='L101')
+        on_date = next_weekday(0)
+        results = []
+        barrier = threading.Barrier(6)
+
+        def book(minute):
+            barrier.wait()
+            try:
+                booking = ClassroomBooking(
+                    professor=professor, classroom=classroom, date=on_date,
+                    start_time=time(10, minute), end_time=time(11, minute),
+                    course_name='Extra class', purpose='Revision',
+                )
+                results.append(allocate_booking(booking).ok)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(minute,)) for minute in range(0, 30, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), [False] * 5 + [True])
+        self.assertEqual(ClassroomBooking.objects.count(), 1)
+
+
+class SQLiteConcurrencyTests(TransactionTestCase):
+    def test_connections_use_wal_and_wait_for_the_write_lock(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+    def test_only_booking_writes_take_the_write_lock_at_begin(self):
+        with CaptureQueriesContext(connection) as queries:
+            with transaction.atomic():
+                Classroom.objects.count()
+            with write_transaction():
+                Classroom.objects.count()
+                with write_transaction():  # nested: a savepoint, no second BEGIN
+                    Classroom.objects.count()
+
+        begins = [query['sql'] for query in queries if query['sql'].startswith('BEGIN')]
+        self.assertEqual(begins, ['BEGIN', 'BEGIN IMMEDIATE'])
+        self.assertIsNone(connection.transaction_mode)
+
+    def test_reads_keep_flowing_while_bookings_are_written(self):
+        CampusSeeder(seed=3, rooms=6, batches=4, professors=4, students=8,
+                     bookings_per_day=10, weeks=1).run()
+
+        report = run_concurrency_benchmark(readers=2, writers=2, duration=0.5)
+
+        mixed = report['phases']['reads_with_writes']
+        self.assertGreater(mixed['reads']['operations'], 0)
+        self.assertGreater(mixed['writes']['operations'], 0)
+        self.assertEqual(mixed['reads']['locked_errors'] + mixed['writes']['locked_errors'], 0)
+
+
+class QueryPlanTests(TestCase):
+    """Every query behind the hot views must be served by an index.
+
+    Tables listed in FULL_LISTING_TABLES are read in full on purpose: they
+    are the reference tables loaded into the process-wide snapshot
+    (timetable.reference).
+    """
+
+    FULL_LISTING_TABLES = {
+        'timetable_classroom', 'timetable_timeslot', 'timetable_course', 'timetable_batch',
+    }
+    FULL_SCAN = re.compile(r'\bSCAN (\w+)')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor', short_name='PK'
+        )
+        cls.student = User.objects.create_user(
+            '24bcs001@iiitdmj.ac.in', '24bcs001@iiitdmj.ac.in', 'pw', role='student'
+        )
+        StudentProfile.objects.create(user=cls.student, batch='2024', branch='cs', section='A')
+        course = Course.objects.create(code='CS2002', name='DSA')
+        batch = Batch.objects.create(name='CS A', batch_year='2024', branch='cs', section='A')
+        today = timezone.localdate()
+        day = today.strftime('%A').lower()
+        for number in range(3):
+            classroom = Classroom.objects.create(room_number=f'L10{number}')
+            ClassSchedule.objects.create(
+                course=course, professor=cls.professor, batch=batch if number == 0 else
+                Batch.objects.create(name=f'CS {number}', batch_year='2024', branch='cs', section='BC'[number - 1]),
+                classroom=classroom,
+                time_slot=TimeSlot.objects.create(day=day, start_time=time(9 + number), end_time=time(10 + number)),
+            )
+            ClassroomBooking.objects.create(
+                professor=cls.professor, classroom=classroom, date=today, status='approved',
+                start_time=time(15), end_time=time(16), course_name='Extra', purpose='Revision',
+            )
+
+    def assert_indexed(self, user, url):
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT'):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+                scanned = set(self.FULL_SCAN.findall(plan)) - self.FULL_LISTING_TABLES
+                self.assertFalse(scanned, f"Full table scan of {scanned} for {url}:\n{sql}\n{plan}")
+
+    def test_classroom_status(self):
+        self.assert_indexed(self.student, reverse('classroom_status'))
+
+    def test_free_slots(self):
+        self.assert_indexed(self.professor, reverse('free_slots'))
+
+    def test_weekly_timetable_for_student(self):
+        self.assert_indexed(self.student, reverse('weekly_timetable'))
+
+    def test_weekly_timetable_for_professor(self):
+        self.assert_indexed(self.professor, reverse('weekly_timetable'))
+
+    def test_professor_dashboard(self):
+        self.assert_indexed(self.professor, reverse('professor_dashboard'))
+
+    def test_my_bookings(self):
+        self.assert_indexed(self.professor, reverse('my_bookings'))
+
+    def test_student_dashboard(self):
+        self.assert_indexed(self.student, reverse('dashboard'))
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            'prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor'
+        )
+        self.client.force_login(self.professor)
+
+    def test_one_line_per_request_with_query_and_template_totals(self):
+        with self.assertLogs('campusconnect.requests', 'INFO') as logs:
+            self.client.get(reverse('my_bookings'))
+        self.assertEqual(len(logs.records), 1)
+        record = logs.records[0]
+        self.assertEqual(record.view, 'my_bookings')
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.db_queries, 0)
+        self.assertGreater(record.template_ms, 0)
+        self.assertIn('db_queries=', logs.output[0])
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_request_logs_repeated_sql(self):
+        for number in range(4):
+            Classroom.objects.create(room_number=f'R{number}')
+
+        def n_plus_one(request):
+            for room in Classroom.objects.all():
+                list(ClassroomBooking.objects.filter(classroom=room))
+            return HttpResponse()
+
+        with self.assertLogs('campusconnect.requests', 'INFO') as logs:
+            RequestMetricsMiddleware(n_plus_one)(RequestFactory().get('/rooms/'))
+        summary = logs.records[0]
+        self.assertEqual(summary.levelname, 'WARNING')
+        self.assertEqual(summary.db_queries, 5)
+        self.assertEqual(summary.duplicate_queries, 3)
+        repeated = [line for line in logs.output if 'slow_request_repeated' in line]
+        self.assertEqual(len(repeated), 1)
+        self.assertIn('count=4', repeated[0])
+        self.assertIn('timetable_classroombooking', repeated[0])
+
+
+class AdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin@iiitdmj.ac.in', 'admin@iiitdmj.ac.in', 'pw')
+        self.client.force_login(self.admin)
+        self.classroom = Classroom.objects.create(room_number='L101')
+
+    def add_schedules(self, count):
+        """``count`` schedules, each with its own course, professor, batch, room and slot"""
+        offset = ClassSchedule.objects.count()
+        numbers = range(offset, offset + count)
+        courses = Course.objects.bulk_create([Course(code=f'C{n}', name=f'Course {n}') for n in numbers])
+        professors = User.objects.bulk_create([
+            User(username=f'p{n}', email=f'p{n}@iiitdmj.ac.in', role='professor') for n in numbers
+        ])
+        batches = Batch.objects.bulk_create([Batch(name=f'B{n}', batch_year='2023', branch='cs', section=str(n)) for n in numbers])
+        rooms = Classroom.objects.bulk_create([Classroom(room_number=f'R{n}') for n in numbers])
+        slots = TimeSlot.objects.bulk_create([
+            TimeSlot(day=WEEKDAYS[n % 6], start_time=time(n // 6 % 24), end_time=time(n // 6 % 24, 50)) for n in numbers
+        ])
+        schedules = [
+            ClassSchedule(course=course, professor=professor, batch=batch, classroom=room, time_slot=slot)
+            for course, professor, batch, room, slot in zip(courses, professors, batches, rooms, slots)
+        ]
+        for schedule in schedules:
+            schedule.sync_minutes_of_week()
+        ClassSchedule.objects.bulk_create(schedules)
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_schedule_changelist_queries_do_not_grow_with_rows(self):
+        url = reverse('admin:timetable_classschedule_changelist')
+        self.add_schedules(10)
+        ten_rows = self.changelist_queries(url)
+        self.add_schedules(90)
+        self.assertEqual(self.changelist_queries(url), ten_rows)
+
+    def test_change_form_does_not_list_every_related_row(self):
+        self.add_schedules(50)
+        schedule = ClassSchedule.objects.first()
+        page = self.client.get(reverse('admin:timetable_classschedule_change', args=[schedule.pk]))
+        # Autocomplete widgets render only the selected option of each foreign key
+        self.assertEqual(page.content.decode().count('<option value='), 5)
+
+    def test_bulk_approve_and_reject(self):
+        professor = User.objects.create_user('prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor')
+        bookings = ClassroomBooking.objects.bulk_create([
+            ClassroomBooking(
+                professor=professor, classroom=self.classroom, date=next_weekday(0),
+                start_time=time(hour), end_time=time(hour, 50), course_name='Extra', purpose='Revision',
+                status=status,
+            )
+            for hour, status in enumerate(['pending', 'pending', 'cancelled'], start=9)
+        ])
+        url = reverse('admin:timetable_classroombooking_changelist')
+        ids = [booking.pk for booking in bookings]
+
+        self.client.post(url, {'action': 'approve_selected', '_selected_action': ids})
+        self.assertEqual(
+            list(ClassroomBooking.objects.order_by('start_time').values_list('status', flat=True)),
+            ['approved', 'approved', 'cancelled'],
+        )
+
+        self.client.post(url, {'action': 'reject_selected', '_selected_action': ids[:1]})
+        self.assertEqual(ClassroomBooking.objects.get(pk=ids[0]).status, 'rejected')
+
+    def test_bulk_approve_never_double_books_a_room(self):
+        professor = User.objects.create_user('prof@iiitdmj.ac.in', 'prof@iiitdmj.ac.in', 'pw', role='professor')
+        # Overlapping pending requests, e.g. created through the admin
+        first, second = ClassroomBooking.objects.bulk_create([
+            ClassroomBooking(
+                professor=professor, classroom=self.classroom, date=next_weekday(0),
+                start_time=start, end_time=end, course_name='Extra', purpose='Revision',
+            )
+            for start, end in [(time(9), time(10)), (time(9, 30), time(10, 30))]
+        ])
+        url = reverse('admin:timetable_classroombooking_changelist')
+
+        response = self.client.post(
+            url, {'action': 'approve_selected', '_selected_action': [first.pk, second.pk]}, follow=True,
+        )
+        self.assertEqual(
+            dict(ClassroomBooking.objects.values_list('pk', 'status')),
+            {first.pk: 'approved', second.pk: 'pending'},  # selected but overlapping: left for review
+        )
+        self.assertContains(response, 'Approved 1 bookings, rejected 0 conflicting requests, left 1 pending.')
@@ -9,4 +9,5 @@ urlpatterns = [
     path('professor/book/<int:classroom_id>/<str:date_str>/<str:time_str>/', views.book_classroom, name='book_classroom'),
     path('professor/my-bookings/', views.my_bookings, name='my_bookings'),
     path('professor/cancel-booking/<int:booking_id>/', views.cancel_booking, name='cancel_booking'),
+    path('api/bookings/approval-queue/', views.booking_approval_queue, name='booking_approval_queue'),
 ]
\ No newline at end of file
@@ -2,113 +2,65 @@
 # from django.contrib.auth.decorators import login_required
 # from django.utils import timezone
 # from .models import Classroom, ClassSchedule, TimeSlot, Batch
-from users.models import EmailGroup
+from users.models import EmailGroup, StudentProfile
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.utils import timezone
 from datetime import datetime, time, date, timedelta
-from .models import Classroom, ClassroomBooking, ClassSchedule, TimeSlot, Batch
+from .models import Classroom, ClassroomBooking, ClassSchedule, day_minute_range
 from .forms import ClassroomBookingForm
+from .occupancy import get_classroom_occupancy
+from .availability import AvailabilityIndex
+from .grid import WeeklyGrid
+from .cache import get_batch_schedules, get_professor_schedules
+from .booking import allocate_booking
+from .approval import ApprovalQueue, approve_bookings, date_range_from
+from .reference import get_reference_data
 from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+import json
 from django.db.models import Q
 
 @login_required
 def weekly_timetable(request):
     """Show weekly timetable - simplified version without custom filters"""
     user = request.user
+    references = get_reference_data()
     
-    # Get classes based on user role
+    # Get classes based on user role (students and professors read the per-owner cache)
     if user.role == 'student':
         try:
-            student_profile = user.student_profile
+            student_profile = user.studentprofile
+        except StudentProfile.DoesNotExist:
+            classes = []
+        else:
             # Find batches that match the student's batch and branch
-            student_batches = Batch.objects.filter(
-                batch_year=student_profile.batch,
-                branch=student_profile.branch
-            )
-            classes = ClassSchedule.objects.filter(batch__in=student_batches).select_related(
-                'course', 'professor', 'classroom', 'time_slot', 'batch'
-            )
-        except Exception as e:
-            classes = ClassSchedule.objects.none()
+            batch_ids = references.batch_ids(student_profile.batch, student_profile.branch)
+            classes = get_batch_schedules(batch_ids)
     elif user.role == 'professor':
-        classes = ClassSchedule.objects.filter(professor=user).select_related(
-            'course', 'professor', 'classroom', 'time_slot', 'batch'
-        )
+        classes = get_professor_schedules(user.id)
     else:
-        classes = ClassSchedule.objects.all().select_related(
-            'course', 'professor', 'classroom', 'time_slot', 'batch'
+        classes = references.attach(
+            list(ClassSchedule.objects.select_related('professor')),
+            'course', 'classroom', 'time_slot', 'batch',
         )
     
-    # Get all days and time slots
-    days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
-    time_slots = TimeSlot.objects.all().order_by('start_time')
+    # Bucket classes into a day x time grid once, instead of per template cell
+    grid = WeeklyGrid(classes, references.slot_times)
     
     context = {
         'classes': classes,
-        'days': days,
-        'time_slots': time_slots,
+        'days': grid.days,
+        'grid': grid,
     }
     return render(request, 'timetable/weekly_timetable.html', context)
 
 @login_required
 def classroom_status(request):
     """Show classroom status with enhanced current class information"""
-    now = timezone.now()
-    current_time = now.time()
-    current_day = now.strftime('%A').lower()
-    
-    classrooms = Classroom.objects.all().order_by('building', 'room_number')
-    classroom_data = []
-    
-    for classroom in classrooms:
-        status = 'free'
-        current_class = None
-        next_class = None
-        
-        # Check for ongoing classes
-        ongoing_classes = ClassSchedule.objects.filter(
-            classroom=classroom,
-            time_slot__day=current_day,
-            time_slot__start_time__lte=current_time,
-            time_slot__end_time__gte=current_time
-        ).select_related('course', 'professor', 'time_slot', 'batch')
-        
-        if ongoing_classes.exists():
-            current_class = ongoing_classes.first()
-            status = 'ongoing'
-        else:
-            # Check for upcoming classes today
-            upcoming_classes = ClassSchedule.objects.filter(
-                classroom=classroom,
-                time_slot__day=current_day,
-                time_slot__start_time__gt=current_time
-            ).select_related('course', 'professor', 'time_slot', 'batch').order_by('time_slot__start_time')
-            
-            if upcoming_classes.exists():
-                current_class = upcoming_classes.first()
-                status = 'scheduled'
-                # Get the next class after the current scheduled one
-                if upcoming_classes.count() > 1:
-                    next_class = upcoming_classes[1]
-            else:
-                # Check if there were classes today
-                past_classes = ClassSchedule.objects.filter(
-                    classroom=classroom,
-                    time_slot__day=current_day,
-                    time_slot__end_time__lt=current_time
-                )
-                
-                if past_classes.exists():
-                    status = 'completed'
-        
-        classroom_data.append({
-            'classroom': classroom,
-            'status': status,
-            'current_class': current_class,
-            'next_class': next_class,
-        })
+    now = timezone.localtime(timezone.now())
+    classroom_data = get_classroom_occupancy(now)
     
     # Get email groups
     batch_groups = EmailGroup.objects.filter(group_type='batch', is_active=True).order_by('batch')
@@ -137,13 +89,18 @@ def professor_dashboard(request):
         return redirect('home')
     
     # Get professor's upcoming classes
-    upcoming_classes = ClassSchedule.objects.filter(
+    references = get_reference_data()
+    day_start, day_end = day_minute_range(timezone.now().strftime('%A').lower())
+    upcoming_classes = references.attach(list(ClassSchedule.objects.filter(
         professor=request.user,
-        time_slot__day=timezone.now().strftime('%A').lower()
-    ).select_related('course', 'classroom', 'time_slot', 'batch').order_by('time_slot__start_time')
+        start_minute_of_week__gte=day_start,
+        start_minute_of_week__lt=day_end,
+    )), 'course', 'classroom', 'time_slot', 'batch')
     
     # Get professor's bookings
-    bookings = ClassroomBooking.objects.filter(professor=request.user).order_by('-date', '-start_time')[:5]
+    bookings = references.attach(list(
+        ClassroomBooking.objects.filter(professor=request.user).order_by('-date', '-start_time')[:5]
+    ), 'classroom')
     
     context = {
         'upcoming_classes': upcoming_classes,
@@ -169,49 +126,22 @@ def free_slots(request):
     else:
         selected_date = timezone.now().date()
 
-    day_name = selected_date.strftime("%A").lower()
-
-    classrooms = Classroom.objects.all().order_by("building", "room_number")
-    time_slots = [time(h, 0) for h in range(8, 20)]  # 08:00–19:00 every hour
-
-    # Fetch schedules and bookings for that day
-    schedules = ClassSchedule.objects.filter(
-        time_slot__day=day_name
-    ).select_related("classroom", "time_slot")
-
-    bookings = ClassroomBooking.objects.filter(
-        date=selected_date, status__in=["approved", "pending"]
-    ).select_related("classroom")
-
-    # Compute availability
-    availability = {}
-
-    for room in classrooms:
-        availability[room.id] = {}
-        for slot in time_slots:
-            available = True
-
-            # Check scheduled classes
-            for s in schedules:
-                if s.classroom_id == room.id:
-                    if s.time_slot.start_time <= slot < s.time_slot.end_time:
-                        available = False
-                        break
-
-            # Check existing bookings
-            if available:
-                for b in bookings:
-                    if b.classroom_id == room.id:
-                        if b.start_time <= slot < b.end_time:
-                            available = False
-                            break
+    classrooms = list(get_reference_data().classrooms)
 
-            availability[room.id][slot.strftime("%H:%M")] = available
+    # One bitmask per room from the day's schedules and bookings
+    index = AvailabilityIndex.build(selected_date)
+    slot_rows = [
+        {
+            "time": slot_time,
+            "key": slot_time.strftime("%H:%M"),
+            "cells": list(zip(classrooms, flags)),
+        }
+        for slot_time, flags in index.hourly_grid([room.id for room in classrooms])
+    ]
 
     context = {
         "classrooms": classrooms,
-        "time_slots": time_slots,
-        "availability": availability,
+        "slot_rows": slot_rows,
         "selected_date": selected_date,
         "prev_date": selected_date - timedelta(days=1),
         "next_date": selected_date + timedelta(days=1),
@@ -242,9 +172,12 @@ def book_classroom(request, classroom_id, date_str, time_str):
         if form.is_valid():
             booking = form.save(commit=False)
             booking.professor = request.user
-            booking.save()
-            messages.success(request, f"Classroom booking request submitted for {classroom.room_number}!")
-            return redirect('professor_dashboard')
+            # The form check is advisory; the allocator re-checks under a write lock
+            result = allocate_booking(booking)
+            if result.ok:
+                messages.success(request, f"Classroom booking request submitted for {classroom.room_number}!")
+                return redirect('professor_dashboard')
+            form.add_error(None, f"Classroom {booking.classroom.room_number} is no longer free. {result.message()}")
     else:
         initial_data = {
             'classroom': classroom,
@@ -269,7 +202,9 @@ def my_bookings(request):
         messages.error(request, "Access denied. Professor access required.")
         return redirect('home')
     
-    bookings = ClassroomBooking.objects.filter(professor=request.user).order_by('-date', '-start_time')
+    bookings = get_reference_data().attach(list(
+        ClassroomBooking.objects.filter(professor=request.user).order_by('-date', '-start_time')
+    ), 'classroom', 'batch')
     
     context = {
         'bookings': bookings,
@@ -293,4 +228,64 @@ def cancel_booking(request, booking_id):
     context = {
         'booking': booking,
     }
-    return render(request, 'timetable/cancel_booking.html', context)
\ No newline at end of file
+    return render(request, 'timetable/cancel_booking.html', context)
+
+
+def _booking_row(booking, proposed, blocked):
+    return {
+        'id': booking.pk,
+        'classroom': booking.classroom.room_number,
+        'date': booking.date.isoformat(),
+        'start_time': booking.start_time.strftime('%H:%M'),
+        'end_time': booking.end_time.strftime('%H:%M'),
+        'course_code': booking.course_code,
+        'course_name': booking.course_name,
+        'professor': booking.professor.get_full_name() or booking.professor.username,
+        'created_at': booking.created_at.isoformat(),
+        'proposed': proposed,
+        'blocked': blocked,
+    }
+
+
+@require_http_methods(['GET', 'POST'])
+def booking_approval_queue(request):
+    """JSON approval queue for staff who may change bookings.
+
+    GET ?start=&end= lists the pending bookings grouped into conflicts with
+    a first-come proposal; POST {"approve": [ids]} approves those and
+    rejects the pending requests they overlap, in one transaction.
+    """
+    if not request.user.has_perm('timetable.change_classroombooking'):
+        return JsonResponse({'error': 'Permission denied.'}, status=403)
+
+    if request.method == 'POST':
+        try:
+            booking_ids = [int(pk) for pk in json.loads(request.body)['approve']]
+        except (ValueError, KeyError, TypeError):
+            return JsonResponse({'error': 'Expected {"approve": [booking ids]}.'}, status=400)
+        return JsonResponse(approve_bookings(booking_ids).as_dict())
+
+    try:
+        start, end = date_range_from(request.GET)
+    except ValueError:
+        return JsonResponse({'error': 'Dates must be YYYY-MM-DD.'}, status=400)
+    queue = ApprovalQueue.load(start, end, pending=ClassroomBooking.objects.select_related('professor'))
+    get_reference_data().attach(queue.pending, 'classroom')
+    proposal = set(queue.proposal())
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'proposal': sorted(proposal),
+        'groups': [
+            {
+                'classroom': group.bookings[0].classroom.room_number,
+                'date': group.date.isoformat(),
+                'contested': group.contested,
+                'bookings': [
+                    _booking_row(booking, booking.pk in proposal, queue.is_blocked(booking))
+                    for booking in group.bookings
+                ],
+            }
+            for group in queue.groups()
+        ],
+    })
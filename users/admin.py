@@ -1,10 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, StudentEmail, EmailGroup, OTPVerification, StudentProfile, ProfessorEmail
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+from campusConnect.profiling import top_functions
+from .models import User, StudentEmail, EmailGroup, OTPVerification, StudentProfile, ProfessorEmail, OutboxEmail, RequestProfile
 
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'role', 'email_verified', 'is_staff')
     list_filter = ('role', 'is_staff', 'email_verified')
+    show_full_result_count = False
     fieldsets = UserAdmin.fieldsets + (
         ('College Info', {'fields': ('role', 'phone', 'email_verified')}),
     )
@@ -15,13 +22,15 @@ class StudentEmailAdmin(admin.ModelAdmin):
     list_filter = ('batch', 'branch', 'is_registered', 'created_at')
     search_fields = ('email', 'roll_number', 'batch', 'branch')
     readonly_fields = ('batch', 'branch', 'roll_number')
+    show_full_result_count = False
     actions = ['extract_info', 'mark_as_unregistered']
 
     def extract_info(self, request, queryset):
-        for student_email in queryset:
+        student_emails = list(queryset.only('email', 'batch', 'branch', 'roll_number'))
+        for student_email in student_emails:
             student_email.extract_info_from_email()
-            student_email.save()
-        self.message_user(request, f"Extracted info for {queryset.count()} emails.")
+        StudentEmail.objects.bulk_update(student_emails, ['batch', 'branch', 'roll_number'], batch_size=500)
+        self.message_user(request, f"Extracted info for {len(student_emails)} emails.")
     extract_info.short_description = "Extract batch/branch info from emails"
 
     def mark_as_unregistered(self, request, queryset):
@@ -48,12 +57,16 @@ class OTPVerificationAdmin(admin.ModelAdmin):
     list_filter = ('is_used', 'created_at')
     search_fields = ('email', 'otp_code')
     readonly_fields = ('created_at', 'expires_at')
+    show_full_result_count = False
 
 @admin.register(StudentProfile)
 class StudentProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'roll_number', 'batch', 'branch')
     search_fields = ('user__first_name', 'user__last_name', 'roll_number', 'batch', 'branch')
     list_filter = ('batch', 'branch')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    show_full_result_count = False
 
 
 # from django.contrib import admin
@@ -66,4 +79,87 @@ class ProfessorEmailAdmin(admin.ModelAdmin):
     list_filter = ['created_at']
 
 
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'claimed_at', 'claim_token', 'sent_at', 'last_error')
+    show_full_result_count = False
+    actions = ['retry_now']
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='pending', available_at=timezone.now(), claim_token=''
+        )
+        self.message_user(request, f"Queued {updated} emails for another attempt.")
+    retry_now.short_description = "Retry selected emails now"
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Read-only, superuser-only view of profiled requests with a .prof download"""
+    list_display = ('created_at', 'method', 'path', 'status_code', 'duration_ms', 'query_count', 'trigger', 'user')
+    list_filter = ('trigger', 'view_name', 'created_at')
+    search_fields = ('path', 'view_name')
+    list_select_related = ('user',)
+    exclude = ('stats', 'sql_log')
+    show_full_result_count = False
+    readonly_fields = ('download', 'top_functions_table', 'sql_table')
+
+    def has_view_permission(self, request, obj=None):
+        return request.user.is_superuser
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='users_requestprofile_download',
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, pk):
+        if not self.has_view_permission(request):
+            return HttpResponse(status=403)
+        profile = get_object_or_404(RequestProfile, pk=pk)
+        response = HttpResponse(bytes(profile.stats), content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="request-{profile.pk}.prof"'
+        return response
+
+    def download(self, obj):
+        url = reverse('admin:users_requestprofile_download', args=[obj.pk])
+        return format_html('<a href="{}">request-{}.prof</a> (open with snakeviz or pstats)', url, obj.pk)
+    download.short_description = "Profile"
+
+    def top_functions_table(self, obj):
+        rows = format_html_join(
+            '', '<tr><td>{}</td><td>{}</td><td>{}</td><td><code>{}</code></td></tr>',
+            ((row['calls'], row['tottime_ms'], row['cumtime_ms'], row['function'])
+             for row in top_functions(obj.stats)),
+        )
+        return format_html(
+            '<table><thead><tr><th>calls</th><th>own ms</th><th>cumulative ms</th>'
+            '<th>function</th></tr></thead><tbody>{}</tbody></table>', rows,
+        )
+    top_functions_table.short_description = "Top functions (cumulative)"
+
+    def sql_table(self, obj):
+        rows = format_html_join(
+            '', '<tr><td>{}</td><td>{}</td><td><code>{}</code></td></tr>',
+            ((number, entry['ms'], entry['sql']) for number, entry in enumerate(obj.sql_log, 1)),
+        )
+        return format_html(
+            '<table><thead><tr><th>#</th><th>ms</th><th>SQL</th></tr></thead>'
+            '<tbody>{}</tbody></table>', rows,
+        )
+    sql_table.short_description = "SQL log"
+
+
 admin.site.register(User, CustomUserAdmin)
\ No newline at end of file
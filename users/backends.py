@@ -1,26 +1,32 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
+
+def users_by_email(email):
+    """Users whose email matches case-insensitively.
+
+    Filters on Lower(email) plus the non-blank condition so the lookup is
+    served by the user_email_lower_unique partial index (one row at most).
+    """
+    return User.objects.alias(email_lower=Lower('email')).filter(
+        email_lower=email.strip().lower()
+    ).exclude(email='')
+
+
 class EmailBackend(ModelBackend):
-    def authenticate(self, request, username=None, password=None, **kwargs):
-        try:
-            # Try to fetch user by email or username
-            user = User.objects.get(
-                Q(email=username) | Q(username=username)
-            )
-            if user.check_password(password):
-                return user
-        except User.DoesNotExist:
+    """Authenticate with ``email`` and ``password`` in a single user query"""
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if not email or password is None:
+            return None
+        user = users_by_email(email).first()
+        if user is None:
+            # Hash anyway so a missing account takes as long as a wrong password
+            User().set_password(password)
             return None
-        except User.MultipleObjectsReturned:
-            # If multiple users found, get the first one
-            users = User.objects.filter(
-                Q(email=username) | Q(username=username)
-            )
-            for user in users:
-                if user.check_password(password):
-                    return user
-        return None
\ No newline at end of file
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
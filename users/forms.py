@@ -4,10 +4,10 @@ from django.core.exceptions import ValidationError
 from .models import (
     User,
     StudentEmail,
-    OTPVerification,
     StudentProfile,
     ProfessorEmail,
 )
+from . import otp
 
 # ----------------------------
 # EMAIL VERIFICATION FORM
@@ -53,6 +53,7 @@ class OTPVerificationForm(forms.Form):
 
     def __init__(self, *args, **kwargs):
         self.email = kwargs.pop("email", None)
+        self.purpose = kwargs.pop("purpose", otp.PURPOSE_REGISTER)
         super().__init__(*args, **kwargs)
 
     def clean_otp_code(self):
@@ -61,13 +62,10 @@ class OTPVerificationForm(forms.Form):
         if not otp_code or len(otp_code) != 6 or not otp_code.isdigit():
             raise ValidationError("Please enter a valid 6-digit OTP code")
 
-        try:
-            otp = OTPVerification.objects.get(
-                email=self.email, otp_code=otp_code, is_used=False
-            )
-            if not otp.is_valid():
-                raise ValidationError("OTP has expired. Please request a new one.")
-        except OTPVerification.DoesNotExist:
+        status = otp.check_otp(self.email, otp_code, self.purpose)
+        if status == otp.EXPIRED:
+            raise ValidationError("OTP has expired. Please request a new one.")
+        if status != otp.VALID:
             raise ValidationError("Invalid OTP code. Please check and try again.")
 
         return otp_code
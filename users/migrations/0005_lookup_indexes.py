@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_professoremail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='short_name',
+            field=models.CharField(blank=True, db_index=True, max_length=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='emailgroup',
+            index=models.Index(fields=['group_type', 'batch', 'branch'], name='emailgroup_type_batch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otpverification',
+            index=models.Index(fields=['email', 'otp_code', 'is_used'], name='otp_email_code_used_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentemail',
+            index=models.Index(fields=['batch', 'branch'], name='studentemail_batch_branch_idx'),
+        ),
+    ]
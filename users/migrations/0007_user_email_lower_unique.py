@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:15
+
+from collections import defaultdict
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def check_case_duplicates(apps, schema_editor):
+    """Stop before the constraint if emails that differ only in case exist.
+
+    Such rows are separate accounts with their own profiles and bookings,
+    so they are not merged here: the report lists them for an admin to
+    merge or rename before running migrate again.
+    """
+    User = apps.get_model('users', 'User')
+    accounts = defaultdict(list)
+    for user_id, username, email in User.objects.exclude(email='').order_by('id').values_list(
+        'id', 'username', 'email'
+    ):
+        accounts[email.lower()].append(f'{email} (id={user_id}, username={username})')
+    duplicates = {email: rows for email, rows in accounts.items() if len(rows) > 1}
+    if duplicates:
+        report = '\n'.join(f'  {email}: ' + ', '.join(rows) for email, rows in sorted(duplicates.items()))
+        raise RuntimeError(
+            "Cannot make user emails case-insensitively unique; these accounts share an "
+            f"email apart from case:\n{report}\nMerge or rename them, then run migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0006_outboxemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='user_email_lower_unique'),
+        ),
+    ]
@@ -1,11 +1,24 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import timedelta
 import random
 import string
 import re
 
+# e.g. 23bsm037@iiitdmj.ac.in -> year 23, branch sm, roll 037
+STUDENT_EMAIL_PATTERN = re.compile(r'(\d{2})(b)?(cs|ec|me|sm)(\d+)@iiitdmj\.ac\.in')
+
+
+def parse_student_email(email):
+    """Return (batch, branch, roll_number) for a college email, or None"""
+    match = STUDENT_EMAIL_PATTERN.match(email.lower())
+    if not match:
+        return None
+    year, b_prefix, branch_code, roll = match.groups()
+    return f"20{year}", branch_code, roll
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ('student', 'Student'),
@@ -16,7 +29,16 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='student')
     phone = models.CharField(max_length=15, blank=True)
     email_verified = models.BooleanField(default=False)
-    short_name = models.CharField(max_length=10, blank=True, null=True)  # Only for professors
+    short_name = models.CharField(max_length=10, blank=True, null=True, db_index=True)  # Only for professors
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Backs the single-query lookup in users.backends.EmailBackend;
+            # accounts without an email (e.g. createsuperuser) are exempt
+            models.UniqueConstraint(
+                Lower('email'), condition=~models.Q(email=''), name='user_email_lower_unique'
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         # Clear short_name if user is not a professor
@@ -36,6 +58,11 @@ class StudentEmail(models.Model):
     roll_number = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch', 'branch'], name='studentemail_batch_branch_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if self.email and not (self.batch and self.branch):
             self.extract_info_from_email()
@@ -43,14 +70,9 @@ class StudentEmail(models.Model):
 
     def extract_info_from_email(self):
         """Extract batch, branch, and roll number from email pattern like 23bsm037@iiitdmj.ac.in"""
-        pattern = r'(\d{2})(b)?(cs|ec|me|sm)(\d+)@iiitdmj\.ac\.in'
-        match = re.match(pattern, self.email.lower())
-        
-        if match:
-            year, b_prefix, branch_code, roll = match.groups()
-            self.batch = f"20{year}"
-            self.branch = branch_code
-            self.roll_number = roll
+        info = parse_student_email(self.email)
+        if info:
+            self.batch, self.branch, self.roll_number = info
 
     def __str__(self):
         info = []
@@ -81,6 +103,9 @@ class EmailGroup(models.Model):
     
     class Meta:
         ordering = ['group_type', 'batch', 'branch']
+        indexes = [
+            models.Index(fields=['group_type', 'batch', 'branch'], name='emailgroup_type_batch_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} <{self.email}>"
@@ -100,6 +125,11 @@ class OTPVerification(models.Model):
     expires_at = models.DateTimeField()
     is_used = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['email', 'otp_code', 'is_used'], name='otp_email_code_used_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.otp_code:
             self.otp_code = self.generate_otp()
@@ -162,4 +192,69 @@ class ProfessorEmail(models.Model):
     
     class Meta:
         verbose_name = "Professor Email"
-        verbose_name_plural = "Professor Emails"
\ No newline at end of file
+        verbose_name_plural = "Professor Emails"
+
+class OutboxEmail(models.Model):
+    """An email waiting to be delivered by the outbox workers (see users.outbox)"""
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    )
+
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=254, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['available_at']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx'),
+            models.Index(fields=['claim_token'], name='outbox_claim_token_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
+
+    @property
+    def delivery_latency(self):
+        if self.sent_at is None:
+            return None
+        return self.sent_at - self.created_at
+
+
+class RequestProfile(models.Model):
+    """cProfile stats and SQL of one profiled request (see campusConnect.profiling)"""
+    TRIGGER_CHOICES = (
+        ('flag', 'Requested by a superuser'),
+        ('sample', 'Sampled'),
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    view_name = models.CharField(max_length=200, blank=True)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    db_ms = models.FloatField()
+    stats = models.BinaryField()  # marshalled pstats data, the same bytes as a .prof file
+    sql_log = models.JSONField(default=list)  # [{"sql": ..., "ms": ...}] in execution order
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
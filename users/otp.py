@@ -0,0 +1,126 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from .models import OTPVerification
+
+# OTP_MODE = 'database' keeps one OTPVerification row per email.
+# OTP_MODE = 'hmac' derives the code from (email, purpose, time window,
+# SECRET_KEY), so issuing and checking a code never touch the database.
+# The cache holds a per-email issue counter, mixed into the code so a
+# resend replaces the previous code, and the consumed codes, to stop replays.
+DATABASE = 'database'
+HMAC = 'hmac'
+
+PURPOSE_REGISTER = 'register'
+PURPOSE_RESET = 'reset'
+
+OTP_DIGITS = 6
+HMAC_STEP_SECONDS = 300
+HMAC_VALID_WINDOWS = 2  # current window plus the previous one: valid for 5-10 minutes
+
+VALID = 'valid'
+INVALID = 'invalid'
+EXPIRED = 'expired'
+
+
+def otp_mode():
+    return getattr(settings, 'OTP_MODE', DATABASE)
+
+
+def _normalize(email):
+    return email.strip().lower()
+
+
+def _window(now=None):
+    return int((now or time.time()) // HMAC_STEP_SECONDS)
+
+
+def hmac_code(email, purpose, window, generation=0):
+    """The OTP for one email/purpose/time window/issue (HOTP-style dynamic truncation)"""
+    digest = salted_hmac(
+        'users.otp', f'{_normalize(email)}|{purpose}|{window}|{generation}', algorithm='sha256'
+    ).digest()
+    offset = digest[-1] & 0x0F
+    value = int.from_bytes(digest[offset:offset + 4], 'big') & 0x7FFFFFFF
+    return str(value % 10 ** OTP_DIGITS).zfill(OTP_DIGITS)
+
+
+def _generation_key(email, purpose):
+    return f'otp:generation:{purpose}:{_normalize(email)}'
+
+
+def _matching_window(email, purpose, code, now=None):
+    """(window, generation) of ``code`` among the latest issue's valid windows, or None"""
+    generation = cache.get(_generation_key(email, purpose), 0)
+    current = _window(now)
+    for window in range(current, current - HMAC_VALID_WINDOWS, -1):
+        if constant_time_compare(hmac_code(email, purpose, window, generation), code):
+            return window, generation
+    return None
+
+
+def _consumed_key(email, purpose, match):
+    window, generation = match
+    return f'otp:consumed:{purpose}:{_normalize(email)}:{window}:{generation}'
+
+
+def issue_otp(email, purpose=PURPOSE_REGISTER):
+    """Return a fresh code for ``email``; database mode replaces any earlier row"""
+    if otp_mode() == HMAC:
+        # A resend within the same window must not hand out the old (maybe used) code again
+        key = _generation_key(email, purpose)
+        generation = cache.get(key, 0) + 1
+        cache.set(key, generation, HMAC_STEP_SECONDS * (HMAC_VALID_WINDOWS + 1))
+        return hmac_code(email, purpose, _window(), generation)
+
+    OTPVerification.objects.filter(email=email).delete()
+    return OTPVerification.objects.create(email=email).otp_code
+
+
+def check_otp(email, code, purpose=PURPOSE_REGISTER):
+    """Return VALID, INVALID or EXPIRED without consuming the code"""
+    if otp_mode() == HMAC:
+        match = _matching_window(email, purpose, code)
+        if match is None or cache.get(_consumed_key(email, purpose, match)):
+            return INVALID
+        return VALID
+
+    otp = OTPVerification.objects.filter(email=email, otp_code=code, is_used=False).first()
+    if otp is None:
+        return INVALID
+    return VALID if otp.is_valid() else EXPIRED
+
+
+def consume_otp(email, code, purpose=PURPOSE_REGISTER):
+    """Mark ``code`` as used; returns False if it was not valid or already used"""
+    if otp_mode() == HMAC:
+        match = _matching_window(email, purpose, code)
+        if match is None:
+            return False
+        # cache.add is atomic, so only one of two racing submissions wins
+        return cache.add(
+            _consumed_key(email, purpose, match), True,
+            HMAC_STEP_SECONDS * (HMAC_VALID_WINDOWS + 1),
+        )
+
+    return bool(OTPVerification.objects.filter(
+        email=email, otp_code=code, is_used=False
+    ).update(is_used=True))
+
+
+def _session_key(purpose):
+    return f'otp_verified_{purpose}'
+
+
+def mark_verified(session, email, purpose=PURPOSE_REGISTER):
+    session[_session_key(purpose)] = _normalize(email)
+
+
+def is_verified(session, email, purpose=PURPOSE_REGISTER):
+    """Has ``email`` passed the OTP step for ``purpose`` in this session?"""
+    if otp_mode() == HMAC:
+        return session.get(_session_key(purpose)) == _normalize(email)
+    return OTPVerification.objects.filter(email=email, is_used=True).exists()
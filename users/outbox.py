@@ -0,0 +1,198 @@
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from campusConnect.metrics import OUTBOX_EMAILS
+from .models import OutboxEmail
+
+logger = logging.getLogger('campusconnect.outbox')
+
+RETRY_BASE_DELAY = timedelta(seconds=30)  # doubled after every failed attempt
+# A row left in 'sending' this long (worker crashed mid-batch) is claimed again
+SENDING_TIMEOUT = timedelta(minutes=5)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_email(subject, body, to_email, from_email=None):
+    """Store an email in the outbox and wake a worker once the transaction commits"""
+    email = OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        to_email=to_email,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+    )
+    transaction.on_commit(worker_pool.wake)
+    OUTBOX_EMAILS.inc(event='queued')
+    return email
+
+
+def claim_batch(limit):
+    """Mark up to ``limit`` due emails as 'sending' for this worker and return them.
+
+    The conditional UPDATE is what makes a claim exclusive: a row another
+    worker took between the SELECT and the UPDATE no longer matches.
+    """
+    now = timezone.now()
+    due = OutboxEmail.objects.filter(
+        Q(status='pending', available_at__lte=now)
+        | Q(status='sending', claimed_at__lt=now - SENDING_TIMEOUT)
+    ).order_by('available_at')
+    ids = list(due.values_list('id', flat=True)[:limit])
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    OutboxEmail.objects.filter(
+        Q(status='pending') | Q(status='sending', claimed_at__lt=now - SENDING_TIMEOUT),
+        pk__in=ids,
+    ).update(status='sending', claimed_at=now, claim_token=token)
+    return list(OutboxEmail.objects.filter(claim_token=token))
+
+
+def _record_failure(email, error, max_attempts):
+    email.attempts += 1
+    email.last_error = f"{type(error).__name__}: {error}"
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        email.available_at = timezone.now() + RETRY_BASE_DELAY * 2 ** (email.attempts - 1)
+    email.claim_token = ''
+    OUTBOX_EMAILS.inc(event='failed' if email.status == 'failed' else 'retry')
+
+
+def deliver_batch(emails, max_attempts=None):
+    """Send ``emails`` over one mail connection and record the outcome of each.
+
+    Returns (sent, failed). Delivery is at-least-once: a crash after a
+    message went out but before the bulk_update can resend it.
+    """
+    if not emails:
+        return 0, 0
+    max_attempts = max_attempts or _setting('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = failed = 0
+
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as error:
+        logger.warning('outbox_connect_failed count=%d error=%s', len(emails), error)
+        for email in emails:
+            _record_failure(email, error, max_attempts)
+        failed = len(emails)
+    else:
+        try:
+            for email in emails:
+                message = EmailMessage(
+                    email.subject, email.body, email.from_email or None, [email.to_email],
+                    connection=mail_connection,
+                )
+                try:
+                    if not mail_connection.send_messages([message]):
+                        raise RuntimeError('message was not accepted')
+                except Exception as error:
+                    _record_failure(email, error, max_attempts)
+                    failed += 1
+                    logger.warning(
+                        'outbox_send_failed id=%s attempts=%d error=%s',
+                        email.id, email.attempts, email.last_error,
+                    )
+                else:
+                    email.status = 'sent'
+                    email.sent_at = timezone.now()
+                    email.attempts += 1
+                    email.claim_token = ''
+                    sent += 1
+                    OUTBOX_EMAILS.inc(event='sent')
+                    latency_ms = email.delivery_latency.total_seconds() * 1000
+                    logger.info(
+                        'outbox_sent id=%s latency_ms=%d attempts=%d',
+                        email.id, latency_ms, email.attempts,
+                        extra={'latency_ms': latency_ms},
+                    )
+        finally:
+            mail_connection.close()
+
+    OutboxEmail.objects.bulk_update(
+        emails, ['status', 'attempts', 'last_error', 'available_at', 'sent_at', 'claim_token']
+    )
+    return sent, failed
+
+
+def drain_outbox(batch_size=None, max_batches=None):
+    """Deliver due emails batch by batch until none are left; returns (sent, failed)"""
+    batch_size = batch_size or _setting('EMAIL_OUTBOX_BATCH_SIZE', 50)
+    total_sent = total_failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        emails = claim_batch(batch_size)
+        if not emails:
+            break
+        sent, failed = deliver_batch(emails)
+        total_sent += sent
+        total_failed += failed
+        batches += 1
+    return total_sent, total_failed
+
+
+class OutboxWorkerPool:
+    """At most ``max_workers`` background threads draining the outbox.
+
+    wake() is cheap and safe to call on every enqueue: when all workers are
+    busy it only flags that more mail arrived, which a running worker picks
+    up before exiting. Emails waiting on a retry delay are left for the
+    drain_outbox management command.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+        self._executor = None
+        self._slots = None
+        self._more_mail = threading.Event()
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                workers = self.max_workers or _setting('EMAIL_OUTBOX_WORKERS', 2)
+                if workers <= 0:
+                    return False
+                self._slots = threading.BoundedSemaphore(workers)
+                self._executor = ThreadPoolExecutor(workers, thread_name_prefix='outbox')
+        return True
+
+    def wake(self):
+        if not self._start():
+            return False
+        self._more_mail.set()
+        if not self._slots.acquire(blocking=False):
+            return False
+        self._executor.submit(self._run)
+        return True
+
+    def _run(self):
+        try:
+            while self._more_mail.is_set():
+                self._more_mail.clear()
+                drain_outbox()
+        except Exception:
+            logger.exception('outbox_worker_failed')
+        finally:
+            db_connection.close()
+            self._slots.release()
+        # Mail that arrived while this slot was still held would otherwise wait
+        if self._more_mail.is_set():
+            self.wake()
+
+
+worker_pool = OutboxWorkerPool()
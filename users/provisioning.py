@@ -0,0 +1,79 @@
+import time
+
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from .models import StudentEmail, parse_student_email
+
+# Stays below SQLite's bound-parameter limit for the IN (...) lookups
+LOOKUP_CHUNK_SIZE = 900
+INSERT_BATCH_SIZE = 500
+
+EMAIL_DOMAIN = 'iiitdmj.ac.in'
+
+
+def student_email_address(batch, branch, roll):
+    """Build an address like 23bcs101@iiitdmj.ac.in from a 2-digit batch"""
+    return f"{batch}b{branch}{roll:03d}@{EMAIL_DOMAIN}"
+
+
+def candidate_student_emails(batches, branches):
+    """Yield every whitelist address for ``batches`` x {branch: max_roll}"""
+    for batch in batches:
+        for branch, max_roll in branches.items():
+            for roll in range(1, max_roll + 1):
+                yield student_email_address(batch, branch, roll)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_provision_student_emails(emails, chunk_size=LOOKUP_CHUNK_SIZE, batch_size=INSERT_BATCH_SIZE):
+    """Insert the addresses from ``emails`` that are not whitelisted yet.
+
+    Existing addresses are found with one IN query per chunk, compared on
+    Lower(email) so rows stored in mixed case still count, and the rest
+    are written with bulk_create inside a single transaction. batch/branch/
+    roll_number are parsed up front since bulk_create skips save().
+    Returns a report dict with counts and per-phase timings in seconds.
+    """
+    started = time.perf_counter()
+    emails = list(dict.fromkeys(email.strip().lower() for email in emails))
+
+    with transaction.atomic():
+        lookup_started = time.perf_counter()
+        existing = set()
+        for chunk in _chunks(emails, chunk_size):
+            existing.update(
+                StudentEmail.objects.annotate(email_lower=Lower('email'))
+                .filter(email_lower__in=chunk)
+                .values_list('email_lower', flat=True)
+            )
+
+        build_started = time.perf_counter()
+        new_rows = []
+        for email in emails:
+            if email in existing:
+                continue
+            batch, branch, roll_number = parse_student_email(email) or ('', '', '')
+            new_rows.append(StudentEmail(
+                email=email, batch=batch, branch=branch, roll_number=roll_number
+            ))
+
+        insert_started = time.perf_counter()
+        StudentEmail.objects.bulk_create(new_rows, batch_size=batch_size)
+        finished = time.perf_counter()
+
+    return {
+        'total': len(emails),
+        'created': len(new_rows),
+        'existing': len(existing),
+        'timings': {
+            'lookup': build_started - lookup_started,
+            'build': insert_started - build_started,
+            'insert': finished - insert_started,
+            'total': finished - started,
+        },
+    }
@@ -1,3 +1,488 @@
-from django.test import TestCase
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import authenticate
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.conf import settings
+from django.http import HttpResponse
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from campusConnect.log_filters import SamplingFilter
+from campusConnect.metrics import LOGINS, RATE_LIMITS, registry
+from campusConnect.profiling import load_stats, top_functions
+from campusConnect.ratelimit import client_ip, hit
+
+from . import otp
+from .backends import users_by_email
+from .models import OTPVerification, OutboxEmail, RequestProfile, StudentEmail, User
+from .outbox import claim_batch, drain_outbox, enqueue_email
+from .provisioning import bulk_provision_student_emails
+from .views import send_otp_email
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return super().open()
+
+
+class FailingBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('smtp down')
+
+
+class OutboxTests(TestCase):
+    def queue(self, count):
+        for number in range(count):
+            enqueue_email('Your OTP', f'Code {number}', f'student{number}@iiitdmj.ac.in')
+
+    @override_settings(EMAIL_BACKEND='users.tests.CountingBackend')
+    def test_batch_is_sent_over_one_connection(self):
+        CountingBackend.opened = 0
+        self.queue(3)
+
+        self.assertEqual(drain_outbox(batch_size=10), (3, 0))
+
+        self.assertEqual(CountingBackend.opened, 1)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutboxEmail.objects.exclude(status='sent').exists())
+        self.assertIsNotNone(OutboxEmail.objects.first().delivery_latency)
+
+    @override_settings(EMAIL_BACKEND='users.tests.FailingBackend', EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        self.queue(1)
+
+        with self.assertLogs('campusconnect.outbox', 'WARNING'):
+            self.assertEqual(drain_outbox(), (0, 1))
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertGreater(email.available_at, timezone.now())
+        # Not due yet, so nothing is claimed
+        self.assertEqual(drain_outbox(), (0, 0))
+
+        OutboxEmail.objects.update(available_at=timezone.now())
+        with self.assertLogs('campusconnect.outbox', 'WARNING'):
+            drain_outbox()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 2))
+        self.assertIn('smtp down', email.last_error)
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        self.queue(2)
+
+        self.assertEqual(len(claim_batch(10)), 2)
+        self.assertEqual(claim_batch(10), [])
+
+    def test_otp_email_is_queued_not_sent_inline(self):
+        with mock.patch('users.outbox.worker_pool.wake') as wake:
+            with self.captureOnCommitCallbacks(execute=True):
+                send_otp_email('24bcs001@iiitdmj.ac.in')
+
+        wake.assert_called_once()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboxEmail.objects.get().to_email, '24bcs001@iiitdmj.ac.in')
+
+
+@override_settings(OTP_MODE='hmac')
+class HmacOtpTests(TestCase):
+    email = '24bcs001@iiitdmj.ac.in'
+
+    def setUp(self):
+        cache.clear()
+
+    def test_issue_and_consume_without_database_queries(self):
+        with self.assertNumQueries(0):
+            code = otp.issue_otp(self.email)
+            self.assertEqual(otp.check_otp(self.email, code), otp.VALID)
+            self.assertTrue(otp.consume_otp(self.email, code))
+            # Replays are refused
+            self.assertFalse(otp.consume_otp(self.email, code))
+            self.assertEqual(otp.check_otp(self.email, code), otp.INVALID)
+
+    def test_code_is_bound_to_email_purpose_and_time(self):
+        code = otp.issue_otp(self.email)
+
+        self.assertEqual(otp.check_otp('24bcs002@iiitdmj.ac.in', code), otp.INVALID)
+        self.assertEqual(otp.check_otp(self.email, code, otp.PURPOSE_RESET), otp.INVALID)
+        later = time.time() + otp.HMAC_STEP_SECONDS * otp.HMAC_VALID_WINDOWS
+        with mock.patch('users.otp.time.time', return_value=later):
+            self.assertEqual(otp.check_otp(self.email, code), otp.INVALID)
+
+    def test_resend_replaces_the_previous_code(self):
+        first = otp.issue_otp(self.email)
+        self.assertTrue(otp.consume_otp(self.email, first))
+
+        second = otp.issue_otp(self.email)
+        third = otp.issue_otp(self.email)
+        # Same time window, yet the used code and the superseded one are both refused
+        self.assertEqual(otp.check_otp(self.email, first), otp.INVALID)
+        self.assertFalse(otp.consume_otp(self.email, second))
+        self.assertEqual(otp.check_otp(self.email, third), otp.VALID)
+        self.assertTrue(otp.consume_otp(self.email, third))
+
+    def test_registration_step_uses_session_instead_of_rows(self):
+        session = self.client.session
+        session['registration_email'] = self.email
+        session.save()
+
+        response = self.client.post(
+            reverse('otp_verification'), {'otp_code': otp.issue_otp(self.email)}
+        )
+
+        self.assertRedirects(response, reverse('student_registration'))
+        self.assertEqual(self.client.get(reverse('student_registration')).status_code, 200)
+        self.assertFalse(OTPVerification.objects.exists())
+
+
+class DatabaseOtpTests(TestCase):
+    def test_code_is_consumed_once(self):
+        code = otp.issue_otp('24bcs001@iiitdmj.ac.in')
+
+        self.assertEqual(otp.check_otp('24bcs001@iiitdmj.ac.in', code), otp.VALID)
+        self.assertTrue(otp.consume_otp('24bcs001@iiitdmj.ac.in', code))
+        self.assertFalse(otp.consume_otp('24bcs001@iiitdmj.ac.in', code))
+        self.assertTrue(OTPVerification.objects.get().is_used)
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Freeze the limiter's clock mid-window so no test straddles a window boundary
+        clock = mock.patch('campusConnect.ratelimit.time')
+        clock.start().time.return_value = 1_000_050.0
+        self.addCleanup(clock.stop)
+
+    def test_previous_window_still_counts_while_it_overlaps(self):
+        for _ in range(3):
+            self.assertTrue(hit('test', 'client', 3, 60, now=59)[0])
+
+        # 3 * 55/60 of the old window still counts, leaving room for one more
+        self.assertTrue(hit('test', 'client', 3, 60, now=65)[0])
+        allowed, retry_after = hit('test', 'client', 3, 60, now=66)
+        self.assertFalse(allowed)
+        self.assertEqual(retry_after, 54)
+        # Two thirds of the old window has slid out by t=100
+        self.assertTrue(hit('test', 'client', 3, 60, now=100)[0])
+
+    def test_login_is_throttled_per_client_and_email(self):
+        denied_before = RATE_LIMITS.get(limit='login', result='denied')
+        data = {'email': 'nobody@iiitdmj.ac.in', 'password': 'wrong'}
+        for _ in range(10):
+            self.assertEqual(self.client.post(reverse('login'), data).status_code, 200)
+
+        response = self.client.post(reverse('login'), data)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(RATE_LIMITS.get(limit='login', result='denied'), denied_before + 1)
+        # Another address from the same client still gets through
+        other = {'email': 'someone@iiitdmj.ac.in', 'password': 'wrong'}
+        self.assertEqual(self.client.post(reverse('login'), other).status_code, 200)
+
+    def test_failed_logins_from_elsewhere_do_not_lock_the_owner_out(self):
+        User.objects.create_user('victim@iiitdmj.ac.in', 'victim@iiitdmj.ac.in', 'secret', role='student')
+        guess = {'email': 'victim@iiitdmj.ac.in', 'password': 'wrong'}
+        statuses = [
+            self.client.post(reverse('login'), guess, REMOTE_ADDR='198.51.100.9').status_code for _ in range(11)
+        ]
+        self.assertEqual(statuses, [200] * 10 + [429])
+
+        response = self.client.post(
+            reverse('login'), {'email': 'victim@iiitdmj.ac.in', 'password': 'secret'}, REMOTE_ADDR='203.0.113.7',
+        )
+        self.assertEqual(response.status_code, 302)
+
+    @override_settings(RATELIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR', RATELIMIT_TRUSTED_PROXIES=1)
+    def test_forged_forwarded_for_entries_are_ignored(self):
+        def request(forwarded_for):
+            return RequestFactory().post('/', HTTP_X_FORWARDED_FOR=forwarded_for, REMOTE_ADDR='10.0.0.1')
+
+        # The client prepends a fake hop; the proxy appends the real address
+        self.assertEqual(client_ip(request('6.6.6.6, 203.0.113.7')), '203.0.113.7')
+        self.assertEqual(client_ip(request('203.0.113.7')), '203.0.113.7')
+        with override_settings(RATELIMIT_TRUSTED_PROXIES=2):
+            self.assertEqual(client_ip(request('6.6.6.6, 203.0.113.7, 10.0.0.2')), '203.0.113.7')
+            # Too few entries: the request bypassed a proxy
+            self.assertEqual(client_ip(request('203.0.113.7')), '10.0.0.1')
+
+    @override_settings(RATELIMIT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_rotating_a_spoofed_first_hop_does_not_reset_the_limit(self):
+        # A fresh email and forged first hop per attempt: only login_ip (20/5m) applies
+        statuses = [
+            self.client.post(
+                reverse('login'),
+                {'email': f'user{number}@iiitdmj.ac.in', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR=f'198.51.100.{number}, 203.0.113.7',
+            ).status_code
+            for number in range(21)
+        ]
+        self.assertEqual(statuses, [200] * 20 + [429])
+
+
+class EmailCaseMigrationTests(TransactionTestCase):
+    before = [('users', '0006_outboxemail')]
+    after = [('users', '0007_user_email_lower_unique')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.User = executor.loader.project_state(self.before).apps.get_model('users', 'User')
+
+    def tearDown(self):
+        self.User.objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        MigrationExecutor(connection).migrate(self.after)
+
+    def test_mixed_case_duplicates_abort_with_a_report(self):
+        self.User.objects.create(username='a', email='24BCS001@iiitdmj.ac.in')
+        self.User.objects.create(username='b', email='24bcs001@iiitdmj.ac.in')
+        self.User.objects.create(username='c', email='24bcs002@iiitdmj.ac.in')
+
+        with self.assertRaises(RuntimeError) as error:
+            self.migrate()
+        message = str(error.exception)
+        self.assertIn('24BCS001@iiitdmj.ac.in (id=', message)
+        self.assertIn('username=b', message)
+        self.assertNotIn('24bcs002', message)
+
+    def test_distinct_emails_migrate(self):
+        self.User.objects.create(username='a', email='24bcs001@iiitdmj.ac.in')
+        self.User.objects.create(username='root', email='')
+        self.User.objects.create(username='root2', email='')
+
+        self.migrate()
+        constraints = connection.introspection.get_constraints(connection.cursor(), 'users_user')
+        self.assertIn('user_email_lower_unique', constraints)
+
+
+class EmailLoginTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            '24bcs001', '24BCS001@iiitdmj.ac.in', 'secret-pass', role='student'
+        )
+
+    def test_authenticate_is_one_query_in_any_case(self):
+        with self.assertNumQueries(1):
+            user = authenticate(None, email=' 24bcs001@IIITDMJ.ac.in', password='secret-pass')
+        self.assertEqual(user, self.user)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(authenticate(None, email='24bcs001@iiitdmj.ac.in', password='wrong'))
+
+    def test_lookup_uses_lower_email_index(self):
+        sql, params = users_by_email('x@iiitdmj.ac.in').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        self.assertIn('user_email_lower_unique', plan)
+
+    def test_login_request_query_count(self):
+        # 1 user lookup, 1 last_login update, the rest is session storage
+        with self.assertNumQueries(9), CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('login'), {'email': '24bcs001@iiitdmj.ac.in', 'password': 'secret-pass'}
+            )
+
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        user_selects = [
+            q for q in queries.captured_queries
+            if q['sql'].startswith('SELECT') and '"users_user"' in q['sql']
+        ]
+        self.assertEqual(len(user_selects), 1)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        cache.clear()
+        self.staff = User.objects.create_user('ops', 'ops@iiitdmj.ac.in', 'pw', is_staff=True)
+
+    def test_requires_staff_session_or_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(METRICS_TOKEN='s3cret'):
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer s3cret')
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer nope')
+            self.assertEqual(response.status_code, 403)
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+    def test_exposes_login_and_request_metrics(self):
+        self.client.post(reverse('login'), {'email': 'ops@iiitdmj.ac.in', 'password': 'wrong'})
+        self.client.force_login(self.staff)
+        body = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('campusconnect_logins_total{result="failure"} 1', body)
+        self.assertIn(
+            'campusconnect_http_requests_total{view="login",method="POST",status="200"} 1', body
+        )
+        self.assertIn('campusconnect_http_request_duration_seconds_bucket{view="login",le="+Inf"} 1', body)
+        self.assertIn('campusconnect_db_queries_per_request_count{view="login"} 1', body)
+        self.assertIn('# TYPE campusconnect_http_request_duration_seconds histogram', body)
+
+    def test_sums_snapshots_of_all_worker_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            other_worker = {'campusconnect_logins_total': [[['success'], 4]]}
+            Path(directory, '99999-other.json').write_text(json.dumps(other_worker))
+            with override_settings(METRICS_MULTIPROCESS_DIR=directory):
+                LOGINS.inc(result='success')
+                body = registry.exposition()
+        self.assertIn('campusconnect_logins_total{result="success"} 5', body)
+
+
+class SamplingFilterTests(TestCase):
+    def record(self, level):
+        return logging.LogRecord('campusconnect.dashboard', level, __file__, 1, 'message', (), None)
+
+    def test_sampling_drops_debug_and_info(self):
+        sampler = SamplingFilter(rate=0.25)
+        with mock.patch('campusConnect.log_filters.random.random', side_effect=[0.1, 0.5, 0.2, 0.9]):
+            self.assertEqual(
+                [sampler.filter(self.record(level)) for level in (logging.DEBUG, logging.DEBUG, logging.INFO, logging.INFO)],
+                [True, False, True, False],
+            )
+        self.assertFalse(any(SamplingFilter(rate=0).filter(self.record(logging.INFO)) for _ in range(100)))
+        self.assertTrue(all(SamplingFilter().filter(self.record(logging.DEBUG)) for _ in range(100)))
+
+    def test_warnings_and_errors_always_pass(self):
+        sampler = SamplingFilter(rate=0)
+        with mock.patch('campusConnect.log_filters.random.random', return_value=0.99) as draw:
+            for level in (logging.WARNING, logging.ERROR, logging.CRITICAL):
+                self.assertTrue(sampler.filter(self.record(level)))
+        draw.assert_not_called()
+
+
+class ShortCircuitMiddleware:
+    """Answers from process_view, so the view never runs"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        return HttpResponse('from middleware')
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('root', 'root@iiitdmj.ac.in', 'pw')
+
+    def test_superuser_flag_stores_stats_and_sql(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('dashboard') + '?_profile=1')
+
+        profile = RequestProfile.objects.get()
+        self.assertEqual(response['X-Profile-Id'], str(profile.pk))
+        self.assertEqual((profile.trigger, profile.view_name), ('flag', 'dashboard'))
+        self.assertEqual(profile.query_count, len(profile.sql_log))
+        self.assertGreater(load_stats(profile.stats).total_calls, 0)
+        self.assertTrue(any('users/views.py' in row['function'] for row in top_functions(profile.stats)))
+
+    def test_later_middleware_still_handles_the_view(self):
+        self.client.force_login(self.admin)
+        with self.settings(MIDDLEWARE=settings.MIDDLEWARE + ['users.tests.ShortCircuitMiddleware']):
+            response = self.client.get(reverse('dashboard') + '?_profile=1')
+
+        self.assertEqual(response.content, b'from middleware')
+        self.assertEqual(response['X-Profile-Id'], str(RequestProfile.objects.get().pk))
+
+    def test_flag_is_ignored_for_other_users(self):
+        User.objects.create_user('s', 's@iiitdmj.ac.in', 'pw', role='student')
+        self.client.login(username='s', password='pw')
+        response = self.client.get(reverse('dashboard') + '?_profile=1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertFalse(RequestProfile.objects.exists())
+
+    @override_settings(PROFILING_SAMPLE_RATES={'login': 3})
+    def test_samples_one_in_n_requests_of_a_url_name(self):
+        for _ in range(6):
+            self.client.get(reverse('login'))
+        self.client.get(reverse('email_verification'))
+        self.assertEqual(
+            list(RequestProfile.objects.values_list('trigger', 'view_name')),
+            [('sample', 'login')] * 2,
+        )
+
+    def test_admin_renders_table_and_serves_prof_file(self):
+        self.client.force_login(self.admin)
+        profile_id = self.client.get(reverse('dashboard'), HTTP_X_PROFILE='1')['X-Profile-Id']
+
+        page = self.client.get(reverse('admin:users_requestprofile_change', args=[profile_id]))
+        self.assertContains(page, 'Top functions')
+        self.assertContains(page, 'users/views.py')
+
+        download = self.client.get(reverse('admin:users_requestprofile_download', args=[profile_id]))
+        self.assertEqual(download['Content-Disposition'], f'attachment; filename="request-{profile_id}.prof"')
+        self.assertGreater(load_stats(download.content).total_calls, 0)
+
+
+class StudentEmailAdminTests(TestCase):
+    def test_extract_info_updates_rows_in_bulk(self):
+        admin = User.objects.create_superuser('admin@iiitdmj.ac.in', 'admin@iiitdmj.ac.in', 'pw')
+        self.client.force_login(admin)
+        # bulk_create skips save(), so the rows start without extracted info
+        emails = StudentEmail.objects.bulk_create([
+            StudentEmail(email=f'23bcs{number:03d}@iiitdmj.ac.in') for number in range(1, 51)
+        ])
+
+        url = reverse('admin:users_studentemail_changelist')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(url, {'action': 'extract_info', '_selected_action': [e.pk for e in emails]})
+
+        updates = [q for q in queries if q['sql'].startswith('UPDATE "users_studentemail"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(StudentEmail.objects.filter(batch='2023', branch='cs').count(), 50)
+
+
+class ProvisioningTests(TestCase):
+    def test_new_addresses_are_created_with_their_info(self):
+        report = bulk_provision_student_emails([' 23BCS001@iiitdmj.ac.in', '23bcs001@iiitdmj.ac.in', '23bcs002@iiitdmj.ac.in'])
+
+        self.assertEqual((report['total'], report['created'], report['existing']), (2, 2, 0))
+        row = StudentEmail.objects.get(email='23bcs001@iiitdmj.ac.in')
+        self.assertEqual((row.batch, row.branch), ('2023', 'cs'))
+
+    def test_existing_addresses_are_skipped_whatever_their_case(self):
+        StudentEmail.objects.create(email='23bcs001@iiitdmj.ac.in')
+        # Stored before addresses were lowercased on the way in
+        StudentEmail.objects.bulk_create([StudentEmail(email='23BCS002@IIITDMJ.ac.in')])
+
+        report = bulk_provision_student_emails(
+            ['23bcs001@iiitdmj.ac.in', '23bcs002@iiitdmj.ac.in', '23bcs003@iiitdmj.ac.in']
+        )
+
+        self.assertEqual((report['created'], report['existing']), (1, 2))
+        self.assertEqual(StudentEmail.objects.count(), 3)
+
+    def test_lookups_run_one_query_per_chunk(self):
+        StudentEmail.objects.create(email='23bcs004@iiitdmj.ac.in')
+        emails = [f'23bcs{number:03d}@iiitdmj.ac.in' for number in range(1, 11)]
+
+        with CaptureQueriesContext(connection) as queries:
+            report = bulk_provision_student_emails(emails, chunk_size=4, batch_size=100)
+
+        lookups = [q for q in queries if q['sql'].startswith('SELECT')]
+        self.assertEqual(len(lookups), 3)
+        self.assertEqual((report['created'], report['existing']), (9, 1))
+        self.assertEqual(StudentEmail.objects.count(), 10)
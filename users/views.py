@@ -2,22 +2,37 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import login, authenticate, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
 # from django.utils import timezone
-import threading
+import logging
 
-from .models import User, StudentEmail, OTPVerification, StudentProfile, ProfessorEmail
-from .forms import EmailVerificationForm, OTPVerificationForm, StudentRegistrationForm, LoginForm, ForgotPasswordForm, ResetPasswordForm, CustomUserCreationForm
-from datetime import time, timedelta
+from .models import User, StudentEmail, StudentProfile, ProfessorEmail
+from .outbox import enqueue_email
+from . import otp
+from .forms import EmailVerificationForm, OTPVerificationForm, StudentRegistrationForm, ForgotPasswordForm, ResetPasswordForm, CustomUserCreationForm
 from django.utils import timezone
-from timetable.models import ClassSchedule, Batch
+from timetable.agenda import get_student_agenda
 
 # from django.contrib.auth.decorators import login_required, user_passes_test
 # from .models import ProfessorEmail
 from django.core.paginator import Paginator
+from campusConnect.metrics import LOGINS
+from campusConnect.ratelimit import rate_limit
 from django.shortcuts import get_object_or_404
 
+logger = logging.getLogger('campusconnect.users')
+
+# Every OTP email for an address shares one budget, whichever page sent it
+OTP_SEND_RATE = '3/10m'
+OTP_SEND_IP_RATE = '20/h'
+OTP_CHECK_RATE = '10/10m'
+
+
+def is_resend(request):
+    return request.GET.get('resend') == 'true'
+
+
+@rate_limit('otp_send_ip', OTP_SEND_IP_RATE)
+@rate_limit('otp_send', OTP_SEND_RATE, key='post:email')
 def email_verification(request):
     """Step 1: Verify email is in whitelist"""
     if request.user.is_authenticated:
@@ -38,6 +53,8 @@ def email_verification(request):
     
     return render(request, 'users/email_verification.html', {'form': form})
 
+@rate_limit('otp_send', OTP_SEND_RATE, key='session:registration_email', when=is_resend)
+@rate_limit('otp_check', OTP_CHECK_RATE, key='session:registration_email')
 def otp_verification(request):
     """Step 2: Verify OTP"""
     if request.user.is_authenticated:
@@ -52,15 +69,11 @@ def otp_verification(request):
         form = OTPVerificationForm(request.POST, email=email)
         if form.is_valid():
             # Mark OTP as used
-            otp = OTPVerification.objects.get(
-                email=email,
-                otp_code=form.cleaned_data['otp_code']
-            )
-            otp.is_used = True
-            otp.save()
-            
-            messages.success(request, "Email verified successfully!")
-            return redirect('student_registration')
+            if otp.consume_otp(email, form.cleaned_data['otp_code']):
+                otp.mark_verified(request.session, email)
+                messages.success(request, "Email verified successfully!")
+                return redirect('student_registration')
+            form.add_error('otp_code', "This OTP has already been used. Please request a new one.")
     else:
         form = OTPVerificationForm(email=email)
     
@@ -87,7 +100,7 @@ def student_registration(request):
         return redirect('email_verification')
     
     # Ensure OTP verified
-    if not OTPVerification.objects.filter(email=email, is_used=True).exists():
+    if not otp.is_verified(request.session, email):
         messages.error(request, "Please verify your OTP first.")
         return redirect('otp_verification')
     
@@ -147,6 +160,12 @@ def student_registration(request):
     return render(request, 'users/student_registration.html', context)
 
 
+# Guessing is throttled per client and address; the per-account limit is
+# only a backstop against guessing from many addresses, set above what one
+# client can send (20/5m) so nobody can lock a victim out from one machine.
+@rate_limit('login_ip', '20/5m')
+@rate_limit('login', '10/5m', key='ip+post:email')
+@rate_limit('login_account', '100/15m', key='post:email')
 def login_view(request):
     """Unified login for students and professors"""
     if request.user.is_authenticated:
@@ -162,28 +181,24 @@ def login_view(request):
             messages.error(request, "Please provide both email and password.")
             return render(request, 'users/login.html')
 
-        try:
-            # Get user by email
-            user = User.objects.get(email=email)
-            authenticated_user = authenticate(request, username=user.username, password=password)
-
-            if authenticated_user is not None:
-                login(request, authenticated_user)
-                messages.success(request, f"Welcome back, {authenticated_user.get_full_name()}!")
-
-                # ✅ Redirect based on role
-                if authenticated_user.role == 'professor':
-                    return redirect('professor_dashboard')
-                elif authenticated_user.role == 'student':
-                    return redirect('dashboard')
-                else:
-                    return redirect('home')
+        # One indexed lookup on Lower(email) (users.backends.EmailBackend)
+        authenticated_user = authenticate(request, email=email, password=password)
+
+        if authenticated_user is not None:
+            LOGINS.inc(result='success')
+            login(request, authenticated_user)
+            messages.success(request, f"Welcome back, {authenticated_user.get_full_name()}!")
 
+            # ✅ Redirect based on role
+            if authenticated_user.role == 'professor':
+                return redirect('professor_dashboard')
+            elif authenticated_user.role == 'student':
+                return redirect('dashboard')
             else:
-                messages.error(request, "Invalid password.")
+                return redirect('home')
 
-        except User.DoesNotExist:
-            messages.error(request, "No account found with this email address.")
+        LOGINS.inc(result='failure')
+        messages.error(request, "Invalid email or password.")
 
     return render(request, 'users/login.html')
 
@@ -195,10 +210,6 @@ def logout_view(request):
 
 @login_required
 def dashboard(request):
-    from datetime import time, timedelta
-    from django.utils import timezone
-    from timetable.models import ClassSchedule, Batch
-
     user = request.user
     next_classes = []
     ongoing_class = None
@@ -207,64 +218,12 @@ def dashboard(request):
     # ✅ FIXED: correct related name (studentprofile)
     if user.role == 'student' and hasattr(user, 'studentprofile'):
         try:
-            now = timezone.localtime(timezone.now())
-            current_day = now.strftime('%A').lower()
-            current_time = now.time()
-
-            # Simulate 9 AM if it’s too early
-            if current_time < time(7, 0, 0):
-                current_time = time(9, 0, 0)
-
-            student_profile = user.studentprofile
-            student_batches = Batch.objects.filter(
-                batch_year=student_profile.batch,
-                branch__iexact=student_profile.branch.strip().lower()
-            )
-
-            # 🔍 DEBUG — log info
-            print(f"[DEBUG] Student: {user.email}")
-            print(f"[DEBUG] Batch: {student_profile.batch}, Branch: {student_profile.branch}")
-            print(f"[DEBUG] Day: {current_day}, Time: {current_time}")
-            print(f"[DEBUG] Matched Batches: {student_batches.count()}")
-
-            # Ongoing class
-            ongoing_classes = ClassSchedule.objects.filter(
-                batch__in=student_batches,
-                time_slot__day=current_day,
-                time_slot__start_time__lte=current_time,
-                time_slot__end_time__gte=current_time
-            )
-            if ongoing_classes.exists():
-                ongoing_class = ongoing_classes.first()
-
-            # Upcoming classes today
-            today_classes = ClassSchedule.objects.filter(
-                batch__in=student_batches,
-                time_slot__day=current_day,
-                time_slot__start_time__gt=current_time
-            ).order_by('time_slot__start_time')[:5]
-
-            # Fallback: show all today's if nothing upcoming
-            if not today_classes.exists():
-                today_classes = ClassSchedule.objects.filter(
-                    batch__in=student_batches,
-                    time_slot__day=current_day
-                ).order_by('time_slot__start_time')[:5]
-
-            # Tomorrow preview
-            tomorrow = now + timedelta(days=1)
-            tomorrow_day = tomorrow.strftime('%A').lower()
-            tomorrow_classes = ClassSchedule.objects.filter(
-                batch__in=student_batches,
-                time_slot__day=tomorrow_day
-            ).order_by('time_slot__start_time')[:3]
-
-            next_classes = today_classes
-
-            print(f"[DEBUG] Classes Found: {next_classes.count()}")
-
-        except Exception as e:
-            print(f"[ERROR in dashboard]: {e}")
+            agenda = get_student_agenda(user.studentprofile)
+            ongoing_class = agenda['ongoing_class']
+            next_classes = agenda['next_classes']
+            tomorrow_classes = agenda['tomorrow_classes']
+        except Exception:
+            logger.exception('dashboard_agenda_failed user=%s', user.pk)
 
     context = {
         'user': user,
@@ -277,25 +236,8 @@ def dashboard(request):
 
 
 # Email functions
-def send_otp_email(email):
-    """Send OTP to email"""
-    # Delete existing OTPs
-    OTPVerification.objects.filter(email=email).delete()
-
-    # Create a new OTP
-    otp = OTPVerification.objects.create(email=email)
-
-    # Send email asynchronously
-    thread = threading.Thread(target=send_otp_email_async, args=(email, otp.otp_code))
-    thread.start()
-
-    print(f"✅ OTP sent to {email}")
-
-
-def send_otp_email_async(email, otp_code):
-    """Actually send the OTP email"""
-    subject = 'Your CampusConnect Verification OTP'
-    message = f'''
+OTP_EMAIL_SUBJECT = 'Your CampusConnect Verification OTP'
+OTP_EMAIL_BODY = '''
     Hello,
 
     Your OTP for CampusConnect registration is: {otp_code}
@@ -307,15 +249,16 @@ def send_otp_email_async(email, otp_code):
     Best regards,
     CampusConnect Team
     '''
-    
-    send_mail(
-        subject,
-        message,
-        settings.DEFAULT_FROM_EMAIL,
-        [email],
-        fail_silently=False,
-    )
 
+
+def send_otp_email(email, purpose=otp.PURPOSE_REGISTER):
+    """Issue an OTP (see users.otp for the modes) and queue it in the outbox"""
+    otp_code = otp.issue_otp(email, purpose)
+    enqueue_email(OTP_EMAIL_SUBJECT, OTP_EMAIL_BODY.format(otp_code=otp_code), email)
+    logger.info('otp_queued email=%s purpose=%s', email, purpose)
+
+@rate_limit('otp_send_ip', OTP_SEND_IP_RATE)
+@rate_limit('otp_send', OTP_SEND_RATE, key='post:email')
 def forgot_password(request):
     """Step 1: Request password reset by email"""
     if request.user.is_authenticated:
@@ -328,7 +271,7 @@ def forgot_password(request):
             request.session['reset_email'] = email
             
             # Send OTP for password reset
-            send_otp_email(email)
+            send_otp_email(email, otp.PURPOSE_RESET)
             messages.success(request, f"Password reset OTP sent to {email}")
             return redirect('reset_password_otp')
     else:
@@ -336,6 +279,8 @@ def forgot_password(request):
     
     return render(request, 'users/forgot_password.html', {'form': form})
 
+@rate_limit('otp_send', OTP_SEND_RATE, key='session:reset_email', when=is_resend)
+@rate_limit('otp_check', OTP_CHECK_RATE, key='session:reset_email')
 def reset_password_otp(request):
     """Step 2: Verify OTP for password reset"""
     if request.user.is_authenticated:
@@ -347,24 +292,20 @@ def reset_password_otp(request):
         return redirect('forgot_password')
     
     if request.method == 'POST':
-        form = OTPVerificationForm(request.POST, email=email)
+        form = OTPVerificationForm(request.POST, email=email, purpose=otp.PURPOSE_RESET)
         if form.is_valid():
             # Mark OTP as used
-            otp = OTPVerification.objects.get(
-                email=email,
-                otp_code=form.cleaned_data['otp_code']
-            )
-            otp.is_used = True
-            otp.save()
-            
-            messages.success(request, "OTP verified successfully!")
-            return redirect('reset_password')
+            if otp.consume_otp(email, form.cleaned_data['otp_code'], otp.PURPOSE_RESET):
+                otp.mark_verified(request.session, email, otp.PURPOSE_RESET)
+                messages.success(request, "OTP verified successfully!")
+                return redirect('reset_password')
+            form.add_error('otp_code', "This OTP has already been used. Please request a new one.")
     else:
-        form = OTPVerificationForm(email=email)
+        form = OTPVerificationForm(email=email, purpose=otp.PURPOSE_RESET)
     
     # Resend OTP
     if request.GET.get('resend') == 'true':
-        send_otp_email(email)
+        send_otp_email(email, otp.PURPOSE_RESET)
         messages.info(request, "New OTP sent to your email.")
         return redirect('reset_password_otp')
     
@@ -385,7 +326,7 @@ def reset_password(request):
         return redirect('forgot_password')
     
     # Verify that OTP was used
-    if not OTPVerification.objects.filter(email=email, is_used=True).exists():
+    if not otp.is_verified(request.session, email, otp.PURPOSE_RESET):
         messages.error(request, "Please verify your OTP first.")
         return redirect('reset_password_otp')
     